@@ -4,6 +4,8 @@ import paho.mqtt.client as mqtt
 import json
 import time
 
+from rvc.encoder import Encoder
+
 # MQTT Configuration
 broker_ip = "100.110.189.122"  # Replace with your MQTT broker IP
 port = 1883             # Replace with your port (default is 1883)
@@ -11,6 +13,8 @@ username = "rc"  # Replace if authentication is required
 password = "rc"  # Replace if authentication is required
 command_topic = "RVC/AIR_CONDITIONER_COMMAND/1/set"  # Adjust if different
 
+ENCODER = Encoder()
+
 # MQTT Client Setup
 client = mqtt.Client()
 if username and password:
@@ -30,12 +34,13 @@ client.loop_start()  # Start the loop in a separate thread
 
 # Function to generate raw RV-C data
 def generate_rvc_data(instance, mode, fan_speed, ac_output):
-    # Instance (1 byte), Mode (1 byte), Dead Band (2 bytes), Fan Speed (2 bytes), AC Output (2 bytes)
-    # Assuming fan_speed and ac_output are 0-100%, scaled to 0-200 (0x00-0xC8)
-    fan_hex = int(fan_speed * 2)  # Scale 0-100 to 0-200
-    ac_hex = int(ac_output * 2)   # Scale 0-100 to 0-200
-    data = f"01{mode:02x}FFFF{fan_hex:02x}{fan_hex:02x}{ac_hex:02x}{ac_hex:02x}"
-    return data.upper()
+    # Field layout, percent scaling and 0xFF fill come from rvc-spec.yml
+    return ENCODER.encode_hex("AIR_CONDITIONER_COMMAND", {
+        "instance": instance,
+        "operating mode": mode,
+        "fan speed": fan_speed,
+        "air conditioning output level": ac_output,
+    })
 
 # Function to send MQTT command
 def send_command():
@@ -0,0 +1,263 @@
+"""Benchmark the RV-C decode and MQTT handling paths.
+
+Run from the repository root::
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --output new.json --compare bench.json
+
+Each case reports frames per second, p50/p99 latency per frame and the
+memory allocated per frame, and the results are written as JSON so runs
+on different commits can be compared.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from rvc import Decoder
+from rvc.components import load_component_module
+
+from . import fixtures
+
+DEFAULT_FRAMES = 20000
+DEFAULT_REPEAT = 5
+
+
+class Case(NamedTuple):
+    """A benchmark: a per-item function and the items it is applied to."""
+
+    name: str
+    run: Callable[[Any], Any]
+    items: Sequence[Any]
+    note: str = ""
+
+
+def decoder_case(count: int, seed: int) -> Case:
+    """Decode raw frames spread over the whole spec."""
+    decoder = Decoder()
+    frames = fixtures.spec_frames(count, seed)
+    return Case("spec_decoder", lambda frame: decoder.decode(*frame), frames)
+
+
+def _template_renderer() -> Optional[Callable[[str], Callable[..., str]]]:
+    try:
+        from jinja2.sandbox import ImmutableSandboxedEnvironment
+    except ImportError:
+        return None
+    environment = ImmutableSandboxedEnvironment()
+    return lambda source: environment.from_string(source).render
+
+
+def sensor_case(count: int, seed: int) -> Case:
+    """Deliver bridge JSON to every sensor subscribed to its topic.
+
+    Mirrors RvcMqttSensor behind the rvc_mqtt dispatcher: the payload is
+    parsed once per message by decode_payload, then each sensor bound to the topic runs its
+    compiled extractor, or renders its value_template when the template
+    could not be compiled.  Without jinja2 installed, those remaining
+    templates are approximated by a field lookup.
+    """
+    decode = load_component_module("rvc_common", "decode")
+    extractors = load_component_module("rvc_mqtt", "extractors")
+    compile_template = _template_renderer()
+    messages = fixtures.sensor_messages(count, seed)
+
+    def renderer(sensor):
+        extract = extractors.compile_value_template(sensor.value_template)
+        if extract is not None:
+            return lambda value_json, payload: extract(value_json)
+        if compile_template is not None and sensor.value_template:
+            render = compile_template(sensor.value_template)
+            return lambda value_json, payload: render(value_json=value_json, value=payload)
+        field = sensor.field
+        return lambda value_json, payload: value_json.get(field)
+
+    renderers = {
+        topic: [renderer(sensor) for sensor in sensors]
+        for topic, sensors in fixtures.group_by_topic(fixtures.load_sensors()).items()
+    }
+
+    def deliver(message):
+        value_json = decode.decode_payload(message.topic, message.payload)
+        return [
+            render(value_json, message.payload)
+            for render in renderers.get(message.topic, ())
+        ]
+
+    note = "decode_payload once + compiled extractor or value_template per sensor"
+    if compile_template is None:
+        note += " (jinja2 not installed: uncompiled templates approximated)"
+    return Case("mqtt_sensor_json", deliver, messages, note)
+
+
+def light_case(count: int, seed: int) -> Case:
+    """Handle DC_DIMMER_STATUS_3 messages the way RvcLight does."""
+    const = load_component_module("rvc_lights", "const")
+    decode = load_component_module("rvc_common", "decode")
+    status = load_component_module("rvc_lights", "status")
+    frames = fixtures.frames_for("DC_DIMMER_STATUS_3", const.RVC_LIGHTS, count, seed)
+    messages = fixtures.bridge_messages(frames)
+    lights = {instance: (False, 0) for instance in const.RVC_LIGHTS}
+
+    def handle(message):
+        payload = decode.decode_payload(message.topic, message.payload)
+        instance = payload["instance"]
+        state, brightness = lights[instance]
+        lights[instance] = status.apply_status(
+            payload, state, brightness, const.DEFAULT_BRIGHTNESS
+        )
+        return lights[instance]
+
+    return Case("light_status", handle, messages, "decode_payload + apply_status")
+
+
+CASES = {
+    "spec_decoder": decoder_case,
+    "mqtt_sensor_json": sensor_case,
+    "light_status": light_case,
+}
+
+
+def _percentile(sorted_values: List[int], fraction: float) -> int:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def measure(case: Case, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """Time a case and measure its allocations."""
+    run = case.run
+    items = case.items
+    count = len(items)
+    for item in items[: min(count, 1000)]:  # warm caches
+        run(item)
+
+    gc.collect()
+    gc.disable()
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for item in items:
+                run(item)
+            best = min(best, time.perf_counter() - start)
+
+        latencies = []
+        clock = time.perf_counter_ns
+        for item in items:
+            start = clock()
+            run(item)
+            latencies.append(clock() - start)
+    finally:
+        gc.enable()
+    latencies.sort()
+
+    # Keep the outputs alive so what each item produces is counted.
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    before = tracemalloc.take_snapshot()
+    outputs = [run(item) for item in items]
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in diff)
+    size = sum(stat.size_diff for stat in diff)
+    del outputs
+
+    return {
+        "items": count,
+        "fps": round(count / best, 1),
+        "p50_us": round(_percentile(latencies, 0.50) / 1000, 3),
+        "p99_us": round(_percentile(latencies, 0.99) / 1000, 3),
+        "allocated_blocks_per_frame": round(blocks / count, 2),
+        "allocated_bytes_per_frame": round(size / count, 1),
+        "peak_bytes_per_frame": round((peak - baseline) / count, 1),
+        "note": case.note,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=fixtures.REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    names: Sequence[str] = tuple(CASES),
+    frames: int = DEFAULT_FRAMES,
+    seed: int = fixtures.DEFAULT_SEED,
+    repeat: int = DEFAULT_REPEAT,
+) -> Dict[str, Any]:
+    """Run the named cases and return the machine-readable report."""
+    results = {}
+    for name in names:
+        results[name] = measure(CASES[name](frames, seed), repeat)
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "frames": frames,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Return one line per case comparing throughput and p99 latency."""
+    lines = []
+    for name, result in new["results"].items():
+        previous = old.get("results", {}).get(name)
+        if previous is None:
+            continue
+        lines.append(
+            f"{name}: fps {previous['fps']} -> {result['fps']} "
+            f"({result['fps'] / previous['fps'] - 1:+.1%}), "
+            f"p99 {previous['p99_us']} -> {result['p99_us']} us"
+        )
+    return lines
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", help=f"cases to run: {', '.join(CASES)}")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--seed", type=int, default=fixtures.DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="JSON report of an earlier run")
+    args = parser.parse_args(argv)
+    # Fixtures include "n/a" values; keep their warnings out of the timings.
+    logging.basicConfig(level=logging.ERROR)
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    report = run(args.cases or list(CASES), args.frames, args.seed, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    print(text)
+    if args.compare:
+        with open(args.compare) as file:
+            print("\n".join(compare(json.load(file), report)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,6 +22,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components import mqtt
 
+from ..rvc_common.decode import decode_payload
+from ..rvc_common.thermostat import command_payload, command_topic, setpoint_fields
 from .const import (
     DOMAIN,
     AC_STATUS_TOPIC,
@@ -29,6 +31,7 @@ from .const import (
     ATTR_AC_MODE,
     ATTR_AC_FAN_SPEED,
     ATTR_AC_OUTPUT,
+    CONF_THERMOSTAT_INSTANCES,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -47,19 +50,25 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up RV-C climate from config entry."""
+    thermostat_instances = {
+        int(instance): int(zone)
+        for instance, zone in config_entry.data.get(CONF_THERMOSTAT_INSTANCES, {}).items()
+    }
     
     @callback
     def async_device_message_received(msg):
         """Handle new MQTT messages."""
         try:
-            data = json.loads(msg.payload)
+            data = decode_payload(msg.topic, msg.payload)
             instance = data.get(ATTR_INSTANCE)
             
             if instance is not None:
                 entity_id = f"climate_{instance}"
                 if entity_id not in discovered_devices:
                     discovered_devices.add(entity_id)
-                    async_add_entities([RVCClimate(hass, data)])
+                    async_add_entities(
+                        [RVCClimate(hass, data, thermostat_instances.get(int(instance)))]
+                    )
                     
         except ValueError:
             _LOGGER.warning("Invalid JSON payload received")
@@ -73,10 +82,14 @@ async def async_setup_entry(
 class RVCClimate(ClimateEntity):
     """Representation of an RV-C Climate device."""
 
-    def __init__(self, hass: HomeAssistant, config: dict) -> None:
+    def __init__(
+        self, hass: HomeAssistant, config: dict, thermostat_instance: int | None = None
+    ) -> None:
         """Initialize the climate device."""
         self.hass = hass
         self._instance = config[ATTR_INSTANCE]
+        # Setpoints go to the thermostat zone controlling this unit, if configured
+        self._thermostat_instance = thermostat_instance
         self._name = f"HVAC {self._instance}"
         self._unique_id = f"rvc_climate_{self._instance}"
         self._topic = f"{AC_STATUS_TOPIC}/{self._instance}"
@@ -113,7 +126,7 @@ class RVCClimate(ClimateEntity):
         def message_received(msg):
             """Handle new MQTT messages."""
             try:
-                data = json.loads(msg.payload)
+                data = decode_payload(msg.topic, msg.payload)
                 self._update_from_data(data)
                 self.async_write_ha_state()
             except ValueError:
@@ -149,12 +162,28 @@ class RVCClimate(ClimateEntity):
         if temperature is None:
             return
 
-        await async_publish(
-            self.hass,
-            f"RVC/AIR_CONDITIONER_COMMAND/{self._instance}/set",
-            json.dumps({"temperature": temperature}),
-        )
+        # AIR_CONDITIONER_COMMAND has no setpoint; it belongs to THERMOSTAT_COMMAND_1
+        # of the zone mapped to this unit, and is only kept locally without one
+        if self._thermostat_instance is None:
+            _LOGGER.debug(f"No thermostat zone configured for {self._name}; not sending setpoint")
+        else:
+            try:
+                mode = "heat" if self._attr_hvac_mode == HVACMode.HEAT else "cool"
+                payload = command_payload(
+                    self._thermostat_instance,
+                    unit=self.temperature_unit,
+                    **setpoint_fields(mode, temperature),
+                )
+            except ValueError as e:
+                _LOGGER.error(f"Cannot set temperature of {self._name}: {e}")
+                return
+            await async_publish(
+                self.hass,
+                command_topic(self._thermostat_instance),
+                json.dumps(payload),
+            )
         self._attr_target_temperature = temperature
+        self.async_write_ha_state()
 
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Set new fan mode."""
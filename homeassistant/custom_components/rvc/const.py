@@ -8,6 +8,11 @@ TOPIC_PREFIX = "RVC"
 WATERHEATER_STATUS_TOPIC = f"{TOPIC_PREFIX}/WATERHEATER_STATUS"
 AC_STATUS_TOPIC = f"{TOPIC_PREFIX}/AIR_CONDITIONER_STATUS"
 
+# Configuration
+# AIR_CONDITIONER_STATUS instance -> thermostat zone (0 front, 1 mid, 2 rear)
+# that takes its setpoint, e.g. {1: 0}; units without one only get AC commands
+CONF_THERMOSTAT_INSTANCES = "thermostat_instances"
+
 # Device Types
 DEVICE_TYPE_WATER_HEATER = "water_heater"
 DEVICE_TYPE_AC = "climate"
@@ -22,6 +22,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components import mqtt
 
+from ..rvc_common.decode import decode_payload
 from .const import (
     DOMAIN,
     WATERHEATER_STATUS_TOPIC,
@@ -44,7 +45,7 @@ async def async_setup_entry(
     def async_device_message_received(msg):
         """Handle new MQTT messages."""
         try:
-            data = json.loads(msg.payload)
+            data = decode_payload(msg.topic, msg.payload)
             instance = data.get(ATTR_INSTANCE)
             
             if instance is not None:
@@ -103,7 +104,7 @@ class RVCWaterHeater(WaterHeaterEntity):
         def message_received(msg):
             """Handle new MQTT messages."""
             try:
-                data = json.loads(msg.payload)
+                data = decode_payload(msg.topic, msg.payload)
                 self._update_from_data(data)
                 self.async_write_ha_state()
             except ValueError:
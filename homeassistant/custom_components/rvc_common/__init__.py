@@ -0,0 +1,7 @@
+"""Helpers shared by the rvc, rvc_lights and rvc_mqtt integrations.
+
+This package has no ``manifest.json``, so Home Assistant does not load it
+as an integration; the integrations import it relatively, e.g.
+``from ..rvc_common.throttle import WriteThrottle``.  Copy it into
+``custom_components`` alongside them.
+"""
@@ -0,0 +1,77 @@
+"""Binary cache for values built from files, keyed by the file's contents.
+
+Parsing ``rvc-spec.yml`` or the RVC MQTT sensor YAML takes noticeably long
+on Raspberry Pi-class hosts, so the built value is pickled next to the
+file and reused until its contents change.  The cache header records the
+SHA-256 of the file bytes.  The file is read and hashed on every load,
+which costs far less than parsing it, and the cached value is used only
+when the hash matches.  Modification times are not trusted: an edit that
+keeps the size within one mtime tick would otherwise load a stale value,
+while a file that was only touched or copied keeps its cache.
+
+Each caller passes the ``version`` of the value it builds and bumps it
+whenever that value's shape changes, so older caches are rebuilt.
+"""
+import hashlib
+import logging
+import os
+import pickle
+from typing import Any, Callable, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+CACHE_SUFFIX = ".cache"
+
+# (version, sha256 hex digest)
+Header = Tuple[int, str]
+
+
+def _read_cache(cache_path: str, header: Header) -> Optional[Any]:
+    """Return the cached value if it was written with ``header``."""
+    try:
+        with open(cache_path, "rb") as file:
+            if tuple(pickle.load(file)) != header:
+                return None
+            return pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:  # corrupt or incompatible cache, rebuild it
+        _LOGGER.debug(f"Ignoring unreadable cache {cache_path}: {e}")
+        return None
+
+
+def _write_cache(cache_path: str, header: Header, value: Any) -> None:
+    """Atomically write the cache, skipping read-only locations."""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as file:
+            pickle.dump(header, file, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(value, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        _LOGGER.debug(f"Could not write cache {cache_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_cached(
+    path: str,
+    build: Callable[[bytes], Any],
+    cache_path: Optional[str] = None,
+    version: int = 0,
+) -> Any:
+    """Return build(file contents), reusing a pickle keyed by content hash.
+
+    Performs blocking file I/O; Home Assistant must run it in the executor.
+    """
+    cache_path = cache_path or path + CACHE_SUFFIX
+    with open(path, "rb") as file:
+        raw = file.read()
+    header = (version, hashlib.sha256(raw).hexdigest())
+    value = _read_cache(cache_path, header)
+    if value is None:
+        value = build(raw)
+        _write_cache(cache_path, header, value)
+    return value
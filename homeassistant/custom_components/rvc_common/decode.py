@@ -0,0 +1,46 @@
+"""Shared JSON decoding for RV-C MQTT payloads.
+
+Several subscribers often receive the same message: a wildcard discovery
+subscription and the entity's own, or every entity on a topic.
+``decode_payload`` parses a (topic, payload) once per dispatch and hands
+the same value to every subscriber called for it, and uses orjson when it
+is installed (Home Assistant ships it).
+
+Home Assistant calls the subscribers of a message one after another in
+the same event loop iteration, so the memo is cleared at the start of the
+next one.  A value is never shared beyond its dispatch, and outside a
+running loop nothing is remembered.  Subscribers of the same message
+still share it and must not modify it.
+"""
+import asyncio
+import json
+from typing import Any, Dict, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+# the same exceptions either way.
+loads = orjson.loads if orjson is not None else json.loads
+
+_memo: Dict[Tuple[str, Union[str, bytes]], Any] = {}
+
+
+def decode_payload(topic: str, payload: Union[str, bytes]) -> Any:
+    """Parse a JSON payload, once per dispatch of the same topic and payload."""
+    key = (topic, payload)
+    try:
+        return _memo[key]
+    except KeyError:
+        pass
+    value = loads(payload)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return value
+    if not _memo:
+        loop.call_soon(_memo.clear)
+    _memo[key] = value
+    return value
@@ -0,0 +1,104 @@
+"""Command round-trip latency for RV-C devices.
+
+An entity calls ``start`` with a predicate when it sends a command, and
+``observe`` with its new state for every status frame.  The first frame
+whose state satisfies the predicate ends the round trip; its latency goes
+into a fixed-bucket histogram.  A command that is not confirmed within the
+timeout counts as a timeout, and a newer command replaces a pending one.
+The results are exposed as entity attributes, which shows which modules
+or bridge hops are slow.
+"""
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Upper bounds of the histogram buckets in milliseconds; one more bucket
+# counts everything slower.
+BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000)
+# Seconds after which an unconfirmed command counts as a timeout.
+DEFAULT_TIMEOUT = 5.0
+
+
+class LatencyTracker:
+    """Correlate one device's commands with the status frames confirming them."""
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty tracker."""
+        self._timeout = timeout
+        self._clock = clock
+        self._target: Optional[Callable[[Any], bool]] = None
+        self._sent_at = 0.0
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+        self.confirmed = 0
+        self.timeouts = 0
+        self.last_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+        self._total_ms = 0.0
+
+    @property
+    def pending(self) -> bool:
+        """Return True while a command waits for its confirmation."""
+        self._expire(self._clock())
+        return self._target is not None
+
+    def start(self, target: Callable[[Any], bool]) -> None:
+        """Record a command; ``target(state)`` says whether a state confirms it."""
+        now = self._clock()
+        self._expire(now)
+        self._target = target
+        self._sent_at = now
+
+    def observe(self, state: Any) -> Optional[float]:
+        """Check a status update; returns the latency in ms if it confirms."""
+        if self._target is None:
+            return None
+        now = self._clock()
+        self._expire(now)
+        if self._target is None or not self._target(state):
+            return None
+        self._target = None
+        latency_ms = (now - self._sent_at) * 1000
+        self._record(latency_ms)
+        return latency_ms
+
+    def cancel(self) -> None:
+        """Forget the pending command without counting it."""
+        self._target = None
+
+    def _expire(self, now: float) -> None:
+        if self._target is not None and now - self._sent_at > self._timeout:
+            self._target = None
+            self.timeouts += 1
+
+    def _record(self, latency_ms: float) -> None:
+        bucket = 0
+        while bucket < len(BUCKETS_MS) and latency_ms > BUCKETS_MS[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+        self.confirmed += 1
+        self._total_ms += latency_ms
+        self.last_ms = latency_ms
+        if self.max_ms is None or latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+    def attributes(self) -> Dict[str, Any]:
+        """Return the statistics as entity attributes."""
+        self._expire(self._clock())
+        labels = [f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return {
+            "command_latency_last_ms": _round(self.last_ms),
+            "command_latency_mean_ms": _round(
+                self._total_ms / self.confirmed if self.confirmed else None
+            ),
+            "command_latency_max_ms": _round(self.max_ms),
+            "command_confirmations": self.confirmed,
+            "command_timeouts": self.timeouts,
+            "command_latency_histogram": dict(zip(labels, self.histogram)),
+        }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
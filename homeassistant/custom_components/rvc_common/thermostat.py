@@ -0,0 +1,204 @@
+"""THERMOSTAT_COMMAND_1 (1FEF9) encoding with precomputed setpoint tables.
+
+RV-C carries thermostat setpoints as uint16 at 0.03125 degC per bit with
+a -273 offset.  Every value a thermostat accepts is precomputed into
+lookup tables, in tenths of a degree Fahrenheit and Celsius, so encoding
+a setpoint is one rounding and one index instead of a float conversion
+per call.  Bus values in that range decode back through a table as well,
+and every tenth round-trips exactly.
+
+``encode_command`` builds the 8-byte data field::
+
+    encode_command(0, mode="cool", fan_mode="auto", cool=75).hex().upper()
+    # -> "00C1FFFFFF1C25FF"
+
+Byte 0 is the instance, byte 1 the operating mode (bits 0-3), fan mode
+(bits 4-5) and schedule mode (bits 6-7), byte 2 the fan speed at 0.5 %
+per bit and bytes 3-4 and 5-6 the heat and cool setpoints, little endian.
+Fields left as None are sent as "not available" (all ones), which a
+thermostat treats as "unchanged", so a setpoint-only command does not
+also switch the mode.
+
+Decoded Fahrenheit values are computed from the raw value, so they can be
+a tenth more precise than the bridge's "F" fields, which it derives from
+the Celsius value after rounding.
+
+The scripts and ``python -m rvc.thermostat_cli`` use this module too,
+through ``rvc.thermostat``.
+"""
+import struct
+from typing import Any, Dict, Mapping, Optional, Union
+
+NAME = "THERMOSTAT_COMMAND_1"
+DGN = 0x1FEF9
+DGN_HEX = "1FEF9"
+TOPIC_PREFIX = f"RVC/{NAME}"
+
+RESOLUTION = 0.03125
+OFFSET = -273
+NOT_AVAILABLE = 0xFFFF
+
+# Setpoint range covered by the tables; others are rejected.
+MIN_F, MAX_F = 40.0, 100.0
+MIN_C, MAX_C = 4.0, 38.0
+
+OPERATING_MODES = {"off": 0, "cool": 1, "heat": 2, "auto": 3, "fan only": 4}
+FAN_MODES = {"auto": 0, "on": 1}
+SCHEDULE_MODES = {"disabled": 0, "enabled": 1}
+
+_FRAME = struct.Struct("<BBBHHB")
+
+
+def _to_raw(celsius: float) -> int:
+    return round((celsius - OFFSET) / RESOLUTION)
+
+
+def _to_celsius(raw: int) -> float:
+    return raw * RESOLUTION + OFFSET
+
+
+def _to_fahrenheit(celsius: float) -> float:
+    return celsius * 9 / 5 + 32
+
+
+def _tenths(low: float, high: float) -> range:
+    return range(round(low * 10), round(high * 10) + 1)
+
+
+# Setpoint in tenths of a degree minus the range start -> raw value.
+_ENCODE = {
+    "F": (round(MIN_F * 10), tuple(_to_raw((t / 10 - 32) * 5 / 9) for t in _tenths(MIN_F, MAX_F))),
+    "C": (round(MIN_C * 10), tuple(_to_raw(t / 10) for t in _tenths(MIN_C, MAX_C))),
+}
+_RAW_MIN = min(table[0] for _, table in _ENCODE.values())
+_RAW_MAX = max(table[-1] for _, table in _ENCODE.values())
+# Raw value minus _RAW_MIN -> setpoint rounded to a tenth.
+_DECODE = {
+    "F": tuple(round(_to_fahrenheit(_to_celsius(raw)), 1) for raw in range(_RAW_MIN, _RAW_MAX + 1)),
+    "C": tuple(round(_to_celsius(raw), 1) for raw in range(_RAW_MIN, _RAW_MAX + 1)),
+}
+
+
+def _unit(unit: str) -> str:
+    """Normalize "F", "°F", "c" and the like to "F" or "C"."""
+    normalized = unit.lstrip("°").upper()
+    if normalized not in _ENCODE:
+        raise ValueError(f"Unknown temperature unit: {unit!r}")
+    return normalized
+
+
+def encode_setpoint(temperature: float, unit: str = "F") -> int:
+    """Return the raw uint16 for a setpoint, to the nearest tenth of a degree."""
+    unit = _unit(unit)
+    start, table = _ENCODE[unit]
+    index = round(temperature * 10) - start
+    if not 0 <= index < len(table):
+        low, high = (MIN_F, MAX_F) if unit == "F" else (MIN_C, MAX_C)
+        raise ValueError(f"Setpoint {temperature}°{unit} outside {low}-{high}°{unit}")
+    return table[index]
+
+
+def decode_setpoint(raw: int, unit: str = "F") -> Optional[float]:
+    """Return the setpoint for a raw uint16, or None if not available."""
+    unit = _unit(unit)
+    if raw == NOT_AVAILABLE:
+        return None
+    if _RAW_MIN <= raw <= _RAW_MAX:
+        return _DECODE[unit][raw - _RAW_MIN]
+    celsius = _to_celsius(raw)
+    return round(celsius if unit == "C" else _to_fahrenheit(celsius), 1)
+
+
+def _code(values: Mapping[str, int], value: Optional[str], mask: int, name: str) -> int:
+    if value is None:
+        return mask
+    code = values.get(value)
+    if code is None:
+        raise ValueError(f"Unknown {name}: {value!r}")
+    return code
+
+
+def encode_command(
+    instance: int,
+    mode: Optional[str] = None,
+    fan_mode: Optional[str] = None,
+    schedule_mode: Optional[str] = None,
+    fan_speed: Optional[float] = None,
+    heat: Optional[float] = None,
+    cool: Optional[float] = None,
+    unit: str = "F",
+) -> bytes:
+    """Build the 8-byte THERMOSTAT_COMMAND_1 data field."""
+    if not 0 <= instance <= 0xFE:
+        raise ValueError(f"Instance {instance} out of range")
+    if fan_speed is None:
+        speed = 0xFF
+    elif 0 <= fan_speed <= 100:
+        speed = round(fan_speed * 2)
+    else:
+        raise ValueError(f"Fan speed {fan_speed} outside 0-100 %")
+    modes = (
+        _code(OPERATING_MODES, mode, 0x0F, "operating mode")
+        | _code(FAN_MODES, fan_mode, 0x03, "fan mode") << 4
+        | _code(SCHEDULE_MODES, schedule_mode, 0x03, "schedule mode") << 6
+    )
+    return _FRAME.pack(
+        instance,
+        modes,
+        speed,
+        NOT_AVAILABLE if heat is None else encode_setpoint(heat, unit),
+        NOT_AVAILABLE if cool is None else encode_setpoint(cool, unit),
+        0xFF,
+    )
+
+
+def setpoint_fields(mode: Optional[str], temperature: float) -> Dict[str, float]:
+    """Return the setpoint argument of ``encode_command`` for an operating mode.
+
+    Heating sets the heat setpoint and every other mode the cool setpoint.
+    The other one is left "not available", so the thermostat keeps its
+    own value and, in auto mode, the gap between the two.
+    """
+    return {"heat": temperature} if mode == "heat" else {"cool": temperature}
+
+
+def _definition(values: Mapping[str, int], code: int, mask: int) -> Optional[str]:
+    if code == mask:
+        return None
+    return next((text for text, value in values.items() if value == code), "undefined")
+
+
+def decode_command(data: Union[bytes, str]) -> Dict[str, Any]:
+    """Decode a data field into the fields it sets; unset fields are left out."""
+    if isinstance(data, str):
+        data = bytes.fromhex(data)
+    if len(data) != _FRAME.size:
+        raise ValueError(f"Expected {_FRAME.size} bytes, got {len(data)}")
+    instance, modes, speed, heat, cool, _ = _FRAME.unpack(data)
+    fields: Dict[str, Any] = {
+        "instance": instance,
+        "operating mode definition": _definition(OPERATING_MODES, modes & 0x0F, 0x0F),
+        "fan mode definition": _definition(FAN_MODES, modes >> 4 & 0x03, 0x03),
+        "schedule mode definition": _definition(SCHEDULE_MODES, modes >> 6, 0x03),
+        "fan speed": None if speed == 0xFF else (speed // 2 if speed % 2 == 0 else speed / 2),
+    }
+    for name, raw in (("heat", heat), ("cool", cool)):
+        fields[f"setpoint temp {name}"] = decode_setpoint(raw, "C")
+        fields[f"setpoint temp {name} F"] = decode_setpoint(raw, "F")
+    return {name: value for name, value in fields.items() if value is not None}
+
+
+def command_topic(instance: int) -> str:
+    """Return the MQTT topic the bridge takes thermostat commands on."""
+    return f"{TOPIC_PREFIX}/{instance}"
+
+
+def command_payload(instance: int, **fields: Any) -> Dict[str, Any]:
+    """Return the bridge's JSON command: name, dgn, data and the fields it sets.
+
+    Keyword arguments are those of ``encode_command``.
+    """
+    data = encode_command(instance, **fields)
+    payload: Dict[str, Any] = {"name": NAME, "dgn": DGN_HEX, "data": data.hex().upper()}
+    payload.update(decode_command(data))
+    return payload
@@ -0,0 +1,55 @@
+"""Coalesce entity state writes to a minimum publish interval.
+
+Chatty RV-C status DGNs would otherwise drive a state machine event, a
+websocket push and a recorder row per bus frame.  An entity asks for a
+write on every message; the throttle writes at most once per interval,
+always with the entity's latest state, and writes immediately for
+transitions that must not wait (on/off, availability).
+"""
+import asyncio
+import time
+from typing import Callable, Optional
+
+DEFAULT_MIN_PUBLISH_INTERVAL = 1.0
+
+
+class WriteThrottle:
+    """Rate-limit calls to a write function, keeping the last request."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        write: Callable[[], None],
+        interval: float = DEFAULT_MIN_PUBLISH_INTERVAL,
+    ) -> None:
+        """Initialize the throttle around ``write``, usually async_write_ha_state."""
+        self._loop = loop
+        self._write = write
+        self._interval = interval
+        self._last_write = -float("inf")
+        self._pending: Optional[asyncio.TimerHandle] = None
+
+    def request(self, immediate: bool = False) -> None:
+        """Write now if allowed, else once the interval has passed."""
+        if immediate or self._interval <= 0:
+            self.flush()
+            return
+        if self._pending is not None:
+            return  # the scheduled write will pick up the latest state
+        wait = self._last_write + self._interval - time.monotonic()
+        if wait <= 0:
+            self.flush()
+        else:
+            self._pending = self._loop.call_later(wait, self.flush)
+
+    def flush(self) -> None:
+        """Write now and drop any scheduled write."""
+        self.cancel()
+        self._last_write = time.monotonic()
+        self._write()
+
+    def cancel(self) -> None:
+        """Drop a scheduled write, e.g. when the entity is removed."""
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
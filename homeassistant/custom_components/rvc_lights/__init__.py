@@ -8,8 +8,16 @@ from homeassistant.core import HomeAssistant
 import homeassistant.helpers.config_validation as cv
 from homeassistant.const import CONF_DEVICES, Platform
 
-from .const import DOMAIN, CONF_ENABLE_AUTO_DISCOVERY
+from ..rvc_common.throttle import DEFAULT_MIN_PUBLISH_INTERVAL
+from .confirm import DEFAULT_CONFIRM_TIMEOUT
+from .const import (
+    DOMAIN,
+    CONF_CONFIRM_TIMEOUT,
+    CONF_ENABLE_AUTO_DISCOVERY,
+    CONF_MIN_PUBLISH_INTERVAL,
+)
 from .discovery import async_start_discovery
+from .router import async_get_router, async_stop_router
 from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
@@ -17,6 +25,12 @@ _LOGGER = logging.getLogger(__name__)
 CONFIG_SCHEMA = vol.Schema(
     {DOMAIN: vol.Schema({
         vol.Optional(CONF_ENABLE_AUTO_DISCOVERY, default=True): cv.boolean,
+        vol.Optional(
+            CONF_MIN_PUBLISH_INTERVAL, default=DEFAULT_MIN_PUBLISH_INTERVAL
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(
+            CONF_CONFIRM_TIMEOUT, default=DEFAULT_CONFIRM_TIMEOUT
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
     })}, 
     extra=vol.ALLOW_EXTRA
 )
@@ -47,6 +61,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     if "setup_complete" not in hass.data[DOMAIN]:
         _LOGGER.debug("Performing one-time setup for RVC Lights")
         
+        # One wildcard subscription feeds both discovery and the lights
+        await async_get_router(hass).async_start()
+        
         enable_auto_discovery = entry.data.get(CONF_ENABLE_AUTO_DISCOVERY, True)
         
         if enable_auto_discovery:
@@ -66,4 +83,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
 
+        # The last entry takes the shared subscription with it; setting up
+        # again starts a new router and reinstalls discovery on it
+        if not any(key != "setup_complete" for key in hass.data[DOMAIN]):
+            async_stop_router(hass)
+            hass.data[DOMAIN].pop("setup_complete", None)
+
     return unload_ok
@@ -0,0 +1,230 @@
+"""Batch light commands into one bridge message.
+
+The Node-RED bridge listening on ``node-red/rvc/commands`` takes
+"instance command brightness" and, with this batching, several of them
+separated by ';'.  Scenes and "all off" automations turn off dozens of
+lights at once; instead of one MQTT publish per light, ``CommandBatcher``
+collects the commands issued within a short window and publishes them as
+one payload, so the whole scene reaches the bridge in one round trip.
+
+Each light also sends through a ``LightCommandQueue``: dragging a slider
+issues a stream of brightness commands, and while one is being sent the
+later ones collapse into the newest, so the dimmer gets the first and the
+final level rather than every step in between.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Instance that addresses every dimmer; combined with a group bitmap.
+ALL_INSTANCES = 255
+# Seconds commands are collected before they are published together.
+BATCH_WINDOW = 0.01
+# Commands per bridge message.
+MAX_BATCH = 64
+# Seconds a light waits after a brightness command before sending the next.
+DEBOUNCE_WINDOW = 0.2
+COMMAND_SEPARATOR = ";"
+
+T = TypeVar("T")
+
+
+class Command(NamedTuple):
+    """One DC_DIMMER_COMMAND_2 for the bridge."""
+
+    instance: int
+    command: int
+    level: int
+    group: Optional[int] = None
+
+
+def format_command(command: Command) -> str:
+    """Format a command the way the bridge parses it."""
+    text = f"{command.instance} {command.command} {command.level}"
+    if command.group is not None:
+        text += f" {command.group}"
+    return text
+
+
+def pack_commands(commands: Iterable[Command]) -> str:
+    """Pack commands into one bridge payload."""
+    return COMMAND_SEPARATOR.join(format_command(command) for command in commands)
+
+
+class CommandBatcher:
+    """Collect commands for a short window and publish them together."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        publish: Callable[[str], Awaitable[None]],
+        window: float = BATCH_WINDOW,
+        max_batch: int = MAX_BATCH,
+    ) -> None:
+        """Initialize the batcher around ``publish(payload)``."""
+        self._loop = loop
+        self._publish = publish
+        self._window = window
+        self._max_batch = max_batch
+        self._pending: List[Tuple[Command, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def async_send(self, command: Command) -> None:
+        """Queue a command; returns once the payload carrying it is published."""
+        future = self._loop.create_future()
+        self._pending.append((command, future))
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = self._loop.call_later(self._window, self._flush)
+        await future
+
+    async def async_send_many(self, commands: Iterable[Command]) -> None:
+        """Queue several commands and wait for all of them."""
+        await asyncio.gather(*(self.async_send(command) for command in commands))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._loop.create_task(self._publish_batch(batch))
+
+    async def _publish_batch(self, batch: List[Tuple[Command, asyncio.Future]]) -> None:
+        payload = pack_commands(command for command, _ in batch)
+        try:
+            await self._publish(payload)
+        except Exception as e:
+            _LOGGER.error(f"Failed to publish {len(batch)} light commands: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        _LOGGER.debug(f"Published {len(batch)} light commands: {payload}")
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+
+class _Slot:
+    """A queued command and every caller waiting for it."""
+
+    __slots__ = ("command", "coalesce", "futures")
+
+    def __init__(self, command: Command, coalesce: bool, future: asyncio.Future) -> None:
+        self.command = command
+        self.coalesce = coalesce
+        self.futures = [future]
+
+
+class LightCommandQueue:
+    """Send one light's commands in order, collapsing brightness streams.
+
+    A command queued with ``coalesce=True`` replaces a coalescible command
+    still waiting at the tail of the queue, so only the newest level is
+    sent; callers of the replaced command return once it is delivered.
+    Any other command is queued behind it, so on/off never overtakes a
+    brightness change or the reverse.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        send: Callable[[Command], Awaitable[None]],
+        window: float = DEBOUNCE_WINDOW,
+    ) -> None:
+        """Initialize the queue around ``send``, usually CommandBatcher.async_send."""
+        self._loop = loop
+        self._send = send
+        self._window = window
+        self._slots: "deque[_Slot]" = deque()
+        self._sending: Optional[_Slot] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def async_send(self, command: Command, coalesce: bool = False) -> None:
+        """Queue a command; returns once it, or a newer level replacing it, is sent."""
+        future = self._loop.create_future()
+        tail = self._slots[-1] if self._slots else None
+        if coalesce and tail is not None and tail.coalesce:
+            tail.command = command
+            tail.futures.append(future)
+        else:
+            self._slots.append(_Slot(command, coalesce, future))
+        if self._worker is None:
+            self._worker = self._loop.create_task(self._run())
+        await future
+
+    def cancel(self) -> None:
+        """Stop sending, e.g. when the light is removed."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        slots = list(self._slots)
+        if self._sending is not None:
+            slots.append(self._sending)
+        self._slots.clear()
+        self._sending = None
+        for slot in slots:
+            for future in slot.futures:
+                future.cancel()
+
+    async def _run(self) -> None:
+        try:
+            while self._slots:
+                slot = self._sending = self._slots.popleft()
+                try:
+                    await self._send(slot.command)
+                except Exception as e:
+                    for future in slot.futures:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for future in slot.futures:
+                        if not future.done():
+                            future.set_result(None)
+                self._sending = None
+                if slot.coalesce and self._window > 0:
+                    # Give the rest of a slider drag time to collapse.
+                    await asyncio.sleep(self._window)
+        finally:
+            self._worker = None
+
+
+async def async_fan_out(
+    targets: Iterable[T],
+    send: Callable[[T], Awaitable[None]],
+    limit: int = MAX_BATCH,
+) -> Dict[T, Exception]:
+    """Run ``send`` for every target concurrently, at most ``limit`` at once.
+
+    Returns the targets that failed with their exceptions; one failure
+    does not stop the others.  The default limit lets a full batch build
+    up in the CommandBatcher.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(target: T) -> None:
+        async with semaphore:
+            await send(target)
+
+    targets = list(targets)
+    results = await asyncio.gather(*(run(target) for target in targets), return_exceptions=True)
+    return {
+        target: result
+        for target, result in zip(targets, results)
+        if isinstance(result, Exception)
+    }
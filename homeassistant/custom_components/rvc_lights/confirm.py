@@ -0,0 +1,60 @@
+"""Optimistic light state that must be confirmed by the bus.
+
+A light in confirm mode shows the commanded state as soon as the command
+is sent and marks it pending.  Status frames that confirm it end the wait;
+frames that do not (stale levels, a dimmer still ramping) are remembered
+but not shown.  If nothing confirms the command before the deadline the
+light falls back to what the bus last reported and ``on_timeout`` runs.
+"""
+import asyncio
+from typing import Any, Callable, Optional
+
+# Seconds a commanded state is shown without confirmation; 0 disables.
+DEFAULT_CONFIRM_TIMEOUT = 5.0
+
+
+class PendingCommand:
+    """Track the one commanded state a light is waiting to see confirmed."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        timeout: float,
+        on_timeout: Callable[[], None],
+    ) -> None:
+        """Initialize; ``on_timeout`` runs when a deadline passes unconfirmed."""
+        self._loop = loop
+        self._timeout = timeout
+        self._on_timeout = on_timeout
+        self._matches: Optional[Callable[[Any], bool]] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def active(self) -> bool:
+        """Return True while a commanded state awaits confirmation."""
+        return self._matches is not None
+
+    def begin(self, matches: Callable[[Any], bool]) -> None:
+        """Wait for a reported state satisfying ``matches``, replacing any earlier wait."""
+        self.cancel()
+        self._matches = matches
+        self._timer = self._loop.call_later(self._timeout, self._expired)
+
+    def confirm(self, reported: Any) -> bool:
+        """Return True, ending the wait, if the reported state confirms it."""
+        if self._matches is None or not self._matches(reported):
+            return False
+        self.cancel()
+        return True
+
+    def cancel(self) -> None:
+        """Stop waiting without running ``on_timeout``."""
+        self._matches = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _expired(self) -> None:
+        self._timer = None
+        self._matches = None
+        self._on_timeout()
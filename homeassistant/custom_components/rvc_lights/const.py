@@ -9,6 +9,11 @@ CONF_MQTT_USERNAME = "mqtt_username"
 CONF_MQTT_PASSWORD = "mqtt_password"
 CONF_MQTT_CLIENT_ID = "mqtt_client_id"
 CONF_ENABLE_AUTO_DISCOVERY = "enable_auto_discovery"
+CONF_MIN_PUBLISH_INTERVAL = "min_publish_interval"
+CONF_CONFIRM_TIMEOUT = "confirm_timeout"
+
+# Fired when a light's commanded state is not confirmed by the bus in time
+EVENT_COMMAND_UNCONFIRMED = "rvc_lights_command_unconfirmed"
 
 # RVC specific constants
 RVC_COMMAND_TOPIC_PREFIX = "RVC/DC_DIMMER_COMMAND_2"
@@ -4,33 +4,40 @@ import logging
 import re
 from typing import Any, Callable, Dict, List, Optional
 
-from homeassistant.components import mqtt
 from homeassistant.core import callback, HomeAssistant
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import DiscoveryInfoType
 
+from ..rvc_common.decode import decode_payload
 from .const import (
     DOMAIN,
     RVC_STATUS_TOPIC_PREFIX,
     RVC_LIGHTS,
 )
+from .router import async_get_router
 
 _LOGGER = logging.getLogger(__name__)
 
 DISCOVERY_SIGNAL = f"{DOMAIN}_discovery"
 STATUS_TOPIC_PATTERN = re.compile(f"{RVC_STATUS_TOPIC_PREFIX}/([0-9]+)")
+PREDEFINED_TOPICS = frozenset(f"{RVC_STATUS_TOPIC_PREFIX}/{instance}" for instance in RVC_LIGHTS)
 
 async def async_start_discovery(hass: HomeAssistant) -> None:
     """Start RVC light discovery."""
     
-    # Dictionary to track discovered instances to prevent duplicates
-    discovered_instances = {}
+    # Instances already handed to the light platform, to prevent duplicates
+    discovered_instances = set()
     
     @callback
     def async_device_message_received(msg):
-        """Process the received message."""
+        """Process a message on a topic no light is registered for yet."""
         topic = msg.topic
         
+        # Predefined lights are always set up by the platform; skip them
+        # without parsing anything until their entities take over the topic
+        if topic in PREDEFINED_TOPICS:
+            return
+        
         # Extract instance number from topic
         match = STATUS_TOPIC_PATTERN.match(topic)
         if not match:
@@ -43,21 +50,14 @@ async def async_start_discovery(hass: HomeAssistant) -> None:
             return
         
         try:
-            payload = json.loads(msg.payload)
+            payload = decode_payload(topic, msg.payload)
             if "name" in payload and payload["name"] == "DC_DIMMER_STATUS_3":
-                # Check if this is a predefined light we already know about
-                if instance in RVC_LIGHTS:
-                    _LOGGER.info(f"Discovered predefined RVC light: {RVC_LIGHTS[instance]} (instance {instance})")
-                    name = RVC_LIGHTS[instance]
-                else:
-                    _LOGGER.info(f"Discovered new RVC light with instance: {instance}")
-                    name = f"RVC Light {instance}"
-                
-                discovered_instances[instance] = True
+                _LOGGER.info(f"Discovered new RVC light with instance: {instance}")
+                discovered_instances.add(instance)
                 
                 # Prepare discovery info
                 discovery_info = {
-                    "name": name,
+                    "name": f"RVC Light {instance}",
                     "unique_id": f"rvc_light_{instance}",
                     "instance": instance,
                     "optimistic": False,
@@ -74,10 +74,6 @@ async def async_start_discovery(hass: HomeAssistant) -> None:
         except Exception as e:
             _LOGGER.error(f"Error processing discovery message: {e}")
     
-    # Subscribe to all DC_DIMMER_STATUS_3 topics
-    status_topic_filter = f"{RVC_STATUS_TOPIC_PREFIX}/+"
-    await mqtt.async_subscribe(
-        hass, status_topic_filter, async_device_message_received, 1
-    )
-    
-    _LOGGER.info(f"Subscribed to {status_topic_filter} for RVC light discovery")
+    # Messages for lights that exist go straight to their entities
+    async_get_router(hass).async_set_fallback(async_device_message_received)
+    _LOGGER.info("RVC light discovery listening for unknown dimmer instances")
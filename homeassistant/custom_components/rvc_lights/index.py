@@ -0,0 +1,80 @@
+"""In-memory index from RvcLight entity ids to RV-C instances.
+
+Services used to look every target up in the entity registry and then in
+the state machine for an ``instance`` attribute the lights never set.
+Each light now records its entity_id and unique_id here when it is added
+and drops them when it is removed, so services resolve any number of
+targets with dictionary lookups.
+
+A light also records how it sends a command, so service commands for its
+instance go through its own command queue, confirmation and latency
+tracking like the ones it issues itself.
+"""
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .commands import Command
+
+DATA_INDEX = "rvc_lights_index"
+
+
+class InstanceIndex:
+    """Map entity_id and unique_id to the light's instance."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._instances: Dict[str, int] = {}
+        self._senders: Dict[int, Callable[[Command], Awaitable[None]]] = {}
+
+    def add(
+        self,
+        entity_id: str,
+        unique_id: Optional[str],
+        instance: int,
+        send: Optional[Callable[[Command], Awaitable[None]]] = None,
+    ) -> Callable[[], None]:
+        """Index a light and its ``send``; returns the function that removes it again."""
+        keys = [key for key in (entity_id, unique_id) if key]
+        for key in keys:
+            self._instances[key] = instance
+        if send is not None:
+            self._senders[instance] = send
+
+        def remove() -> None:
+            for key in keys:
+                if self._instances.get(key) == instance:
+                    del self._instances[key]
+            if send is not None and self._senders.get(instance) is send:
+                del self._senders[instance]
+
+        return remove
+
+    def get(self, entity_id: str) -> Optional[int]:
+        """Return the instance of an entity_id or unique_id."""
+        return self._instances.get(entity_id)
+
+    def sender(self, instance: int) -> Optional[Callable[[Command], Awaitable[None]]]:
+        """Return how the light with ``instance`` sends a command, if it is indexed."""
+        return self._senders.get(instance)
+
+    def resolve(self, entity_ids: Iterable[str]) -> Tuple[List[int], List[str]]:
+        """Return the instances of the known targets and the unknown ids.
+
+        Instances are de-duplicated, keeping the order of the targets.
+        """
+        instances: Dict[int, None] = {}
+        missing = []
+        for entity_id in entity_ids:
+            instance = self._instances.get(entity_id)
+            if instance is None:
+                missing.append(entity_id)
+            else:
+                instances[instance] = None
+        return list(instances), missing
+
+
+def async_get_instance_index(hass) -> InstanceIndex:
+    """Return the index shared by the lights and the services."""
+    index = hass.data.get(DATA_INDEX)
+    if index is None:
+        index = hass.data[DATA_INDEX] = InstanceIndex()
+    return index
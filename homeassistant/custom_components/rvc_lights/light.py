@@ -1,11 +1,10 @@
 """Light platform for RVC Lights integration."""
 import json
 import logging
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 
 import voluptuous as vol
 
-from homeassistant.components import mqtt
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
     ATTR_EFFECT,
@@ -27,11 +26,13 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 
+from ..rvc_common.decode import decode_payload
+from ..rvc_common.latency import LatencyTracker
+from ..rvc_common.throttle import DEFAULT_MIN_PUBLISH_INTERVAL, WriteThrottle
 from .const import (
     DOMAIN,
     RVC_COMMAND_TOPIC_PREFIX,
     RVC_STATUS_TOPIC_PREFIX,
-    RVC_DIRECT_COMMAND_TOPIC,
     RVC_CMD_ON,
     RVC_CMD_OFF,
     RVC_CMD_TOGGLE,
@@ -40,13 +41,20 @@ from .const import (
     RVC_CMD_STOP,
     DEFAULT_BRIGHTNESS,
     DEFAULT_DELAY_DURATION,
-    STATE_KEY,
-    LOAD_STATUS_KEY,
     RVC_LIGHTS,
     CONF_ENABLE_AUTO_DISCOVERY,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_CONFIRM_TIMEOUT,
+    EVENT_COMMAND_UNCONFIRMED,
 )
 
+from .commands import Command, LightCommandQueue
+from .confirm import DEFAULT_CONFIRM_TIMEOUT, PendingCommand
 from .discovery import DISCOVERY_SIGNAL
+from .index import async_get_instance_index
+from .publisher import async_get_command_batcher
+from .router import async_get_router
+from .status import apply_status
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -66,6 +74,10 @@ async def async_setup_entry(
     # Get component config from the entry
     component_config = config_entry.data
     enable_auto_discovery = component_config.get(CONF_ENABLE_AUTO_DISCOVERY, True)
+    min_publish_interval = component_config.get(
+        CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL
+    )
+    confirm_timeout = component_config.get(CONF_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT)
     
     lights_to_add = []
     
@@ -81,6 +93,8 @@ async def async_setup_entry(
             instance,
             False,  # optimistic
             DEFAULT_BRIGHTNESS,
+            min_publish_interval,
+            confirm_timeout,
         )
         
         lights_to_add.append(light)
@@ -114,6 +128,8 @@ async def async_setup_entry(
                 instance,
                 discovery_info.get(CONF_OPTIMISTIC, False),
                 discovery_info.get("default_brightness", DEFAULT_BRIGHTNESS),
+                min_publish_interval,
+                confirm_timeout,
             )
             
             async_add_entities([light])
@@ -142,6 +158,8 @@ class RvcLight(LightEntity):
         instance: int,
         optimistic: bool,
         default_brightness: int,
+        min_publish_interval: float = DEFAULT_MIN_PUBLISH_INTERVAL,
+        confirm_timeout: float = DEFAULT_CONFIRM_TIMEOUT,
     ) -> None:
         """Initialize an RVC Light."""
         self._attr_name = name
@@ -150,8 +168,17 @@ class RvcLight(LightEntity):
         self._optimistic = optimistic
         self._default_brightness = min(max(default_brightness, 1), 100)
         
+        # Shown state, and the state the last status message reported
         self._state = False
         self._brightness = 0
+        self._reported = (False, 0)
+        # Non-optimistic lights show commands at once until the bus confirms them
+        self._confirm_timeout = 0 if optimistic else confirm_timeout
+        self._pending: Optional[PendingCommand] = None
+        self._min_publish_interval = min_publish_interval
+        self._throttle: Optional[WriteThrottle] = None
+        self._commands: Optional[LightCommandQueue] = None
+        self._latency = LatencyTracker()
         
         self._command_topic = f"{RVC_COMMAND_TOPIC_PREFIX}/{instance}"
         self._status_topic = f"{RVC_STATUS_TOPIC_PREFIX}/{instance}"
@@ -162,6 +189,26 @@ class RvcLight(LightEntity):
 
     async def async_added_to_hass(self) -> None:
         """Subscribe to MQTT events."""
+        self._throttle = WriteThrottle(
+            self.hass.loop, self.async_write_ha_state, self._min_publish_interval
+        )
+        self.async_on_remove(self._throttle.cancel)
+        # Commands go out in order through the batcher shared by all lights
+        self._commands = LightCommandQueue(
+            self.hass.loop, async_get_command_batcher(self.hass).async_send
+        )
+        self.async_on_remove(self._commands.cancel)
+        if self._confirm_timeout > 0:
+            self._pending = PendingCommand(
+                self.hass.loop, self._confirm_timeout, self._async_confirmation_timeout
+            )
+            self.async_on_remove(self._pending.cancel)
+        # Services resolve their targets through this index
+        self.async_on_remove(
+            async_get_instance_index(self.hass).add(
+                self.entity_id, self.unique_id, self._instance, self.async_send_service_command
+            )
+        )
         
         @callback
         def message_received(msg):
@@ -171,40 +218,26 @@ class RvcLight(LightEntity):
                 _LOGGER.debug(f"Received message on {msg.topic}: {msg.payload}")
                 
                 # Parse the payload
-                payload = json.loads(msg.payload)
+                payload = decode_payload(msg.topic, msg.payload)
                 
                 # Log the parsed payload
                 _LOGGER.debug(f"Parsed payload for {self._attr_name}: {payload}")
                 
-                # Get brightness from operating status (brightness)
-                if STATE_KEY in payload:
-                    # Parse brightness value, ensuring it's an integer
-                    try:
-                        brightness = int(payload[STATE_KEY])
-                        self._brightness = min(max(brightness, 0), 100)
-                        self._state = self._brightness > 0
-                        _LOGGER.debug(f"Updated {self._attr_name} brightness to {self._brightness}, state: {self._state}")
-                    except (ValueError, TypeError):
-                        _LOGGER.warning(f"Invalid brightness value in payload: {payload[STATE_KEY]}")
+                self._reported = apply_status(
+                    payload, *self._reported, self._default_brightness
+                )
+                self._latency.observe(self._reported)
+                
+                # Keep showing a commanded state until a status confirms it
+                if self._pending is not None and self._pending.active:
+                    if not self._pending.confirm(self._reported):
+                        return
                 
-                # Check load status
-                if LOAD_STATUS_KEY in payload:
-                    load_status = payload[LOAD_STATUS_KEY]
-                    # Check if active/inactive text or binary value
-                    if isinstance(load_status, str):
-                        if load_status.lower() in ("active", "on", "01", "1", "true"):
-                            self._state = True
-                        elif load_status.lower() in ("inactive", "off", "00", "0", "false"):
-                            self._state = False
-                    _LOGGER.debug(f"Updated {self._attr_name} load status to {load_status}, state: {self._state}")
-                    
-                    # If just turned on but no brightness, use default
-                    if self._state and self._brightness == 0:
-                        self._brightness = self._default_brightness
-                        _LOGGER.debug(f"Set default brightness to {self._brightness} for {self._attr_name}")
+                was_on = self._state
+                self._state, self._brightness = self._reported
                 
-                # Update Home Assistant state
-                self.async_write_ha_state()
+                # On/off is shown at once; brightness updates are coalesced
+                self._throttle.request(immediate=self._state != was_on)
                 _LOGGER.debug(f"Updated HA state for {self._attr_name}: state={self._state}, brightness={self._brightness}")
                 
             except json.JSONDecodeError as ex:
@@ -212,9 +245,97 @@ class RvcLight(LightEntity):
             except Exception as ex:
                 _LOGGER.error(f"Error handling MQTT message for {self._attr_name}: {ex}")
         
-        await mqtt.async_subscribe(
-            self.hass, self._status_topic, message_received, 1
+        # Status messages arrive through the integration's wildcard subscription
+        self.async_on_remove(
+            async_get_router(self.hass).async_register(self._status_topic, message_received)
+        )
+
+    def _confirmation_for(self, command: int, level: int) -> Optional[Callable[[Any], bool]]:
+        """Return what a (state, brightness) status must show to confirm a command."""
+        if command == RVC_CMD_ON:
+            return lambda status: status[0] and abs(status[1] - level) <= 1
+        if command == RVC_CMD_OFF:
+            return lambda status: not status[0]
+        if command == RVC_CMD_TOGGLE:
+            was_on = self._state
+            return lambda status: status[0] != was_on
+        return None  # ramps have no single target state
+
+    async def _async_send_command(
+        self, command: int, level: int, commanded: Optional[Tuple[bool, int]] = None
+    ) -> None:
+        """Queue a command; "on" levels collapse to the newest while queued.
+
+        ``commanded`` is the (state, brightness) the command should lead to;
+        optimistic lights show it once sent, confirming lights show it at
+        once and wait for the bus to confirm it.
+        """
+        target = self._confirmation_for(command, level)
+        if target is not None:
+            self._latency.start(target)
+        
+        confirming = self._pending is not None and target is not None and commanded is not None
+        if confirming:
+            self._pending.begin(target)
+            self._state, self._brightness = commanded
+            self._throttle.flush()
+        
+        try:
+            await self._commands.async_send(
+                Command(self._instance, command, level), coalesce=command == RVC_CMD_ON
+            )
+        except Exception:
+            if confirming:
+                # Never sent, so nothing will confirm it
+                self._pending.cancel()
+                self._state, self._brightness = self._reported
+                self._throttle.flush()
+            raise
+        
+        # Update state if optimistic
+        if self._optimistic and commanded is not None:
+            self._state, self._brightness = commanded
+            self.async_write_ha_state()
+
+    def _commanded_for(self, command: int, level: int) -> Optional[Tuple[bool, int]]:
+        """Return the (state, brightness) a command leads to, if it has one."""
+        if command == RVC_CMD_ON:
+            return (True, level)
+        if command == RVC_CMD_OFF:
+            return (False, 0)
+        if command == RVC_CMD_TOGGLE:
+            if self._state:
+                return (False, self._brightness)
+            return (True, self._brightness or self._default_brightness)
+        return None
+
+    async def async_send_service_command(self, command: Command) -> None:
+        """Send a command from the integration's services like one of our own."""
+        await self._async_send_command(
+            command.command, command.level, self._commanded_for(command.command, command.level)
+        )
+
+    @callback
+    def _async_confirmation_timeout(self) -> None:
+        """Fall back to the reported state when a command goes unconfirmed."""
+        commanded = (self._state, self._brightness)
+        self._state, self._brightness = self._reported
+        _LOGGER.warning(
+            f"{self._attr_name} (instance {self._instance}) did not confirm "
+            f"{commanded} within {self._confirm_timeout}s; showing reported {self._reported}"
+        )
+        self.hass.bus.async_fire(
+            EVENT_COMMAND_UNCONFIRMED,
+            {
+                "entity_id": self.entity_id,
+                "instance": self._instance,
+                "commanded_state": commanded[0],
+                "commanded_brightness": commanded[1],
+                "reported_state": self._reported[0],
+                "reported_brightness": self._reported[1],
+            },
         )
+        self._throttle.flush()
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the light on."""
@@ -226,35 +347,16 @@ class RvcLight(LightEntity):
         else:
             rvc_brightness = self._default_brightness
         
-        # Use direct command format for simplified control    
-        simple_payload = f"{self._instance} {RVC_CMD_ON} {rvc_brightness}"
-        
-        # Publish to direct command topic
-        await mqtt.async_publish(
-            self.hass, RVC_DIRECT_COMMAND_TOPIC, simple_payload, 0, False
-        )
-        
-        # Update state if optimistic
-        if self._optimistic:
-            self._state = True
-            self._brightness = rvc_brightness
-            self.async_write_ha_state()
+        await self._async_send_command(RVC_CMD_ON, rvc_brightness, (True, rvc_brightness))
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the light off."""
-        # Use direct command format for simplified control
-        simple_payload = f"{self._instance} {RVC_CMD_OFF} 0"
-        
-        # Publish to direct command topic
-        await mqtt.async_publish(
-            self.hass, RVC_DIRECT_COMMAND_TOPIC, simple_payload, 0, False
-        )
-        
-        # Update state if optimistic
-        if self._optimistic:
-            self._state = False
-            self._brightness = 0
-            self.async_write_ha_state()
+        await self._async_send_command(RVC_CMD_OFF, 0, (False, 0))
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return command round-trip statistics."""
+        return self._latency.attributes()
 
     @property
     def is_on(self) -> bool:
@@ -271,47 +373,18 @@ class RvcLight(LightEntity):
         
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the light on/off."""
-        # Use direct command format for simplified control
-        simple_payload = f"{self._instance} {RVC_CMD_TOGGLE} 100"
-        
-        # Publish to direct command topic
-        await mqtt.async_publish(
-            self.hass, RVC_DIRECT_COMMAND_TOPIC, simple_payload, 0, False
+        await self._async_send_command(
+            RVC_CMD_TOGGLE, 100, self._commanded_for(RVC_CMD_TOGGLE, 100)
         )
-        
-        # Update state if optimistic
-        if self._optimistic:
-            self._state = not self._state
-            if self._state and self._brightness == 0:
-                self._brightness = self._default_brightness
-            self.async_write_ha_state()
     
     async def async_ramp_up(self, **kwargs: Any) -> None:
         """Start ramping up brightness."""
-        # Use direct command format for simplified control
-        simple_payload = f"{self._instance} {RVC_CMD_RAMP_UP} 100"
-        
-        # Publish to direct command topic
-        await mqtt.async_publish(
-            self.hass, RVC_DIRECT_COMMAND_TOPIC, simple_payload, 0, False
-        )
+        await self._async_send_command(RVC_CMD_RAMP_UP, 100)
     
     async def async_ramp_down(self, **kwargs: Any) -> None:
         """Start ramping down brightness."""
-        # Use direct command format for simplified control
-        simple_payload = f"{self._instance} {RVC_CMD_RAMP_DOWN} 100"
-        
-        # Publish to direct command topic
-        await mqtt.async_publish(
-            self.hass, RVC_DIRECT_COMMAND_TOPIC, simple_payload, 0, False
-        )
+        await self._async_send_command(RVC_CMD_RAMP_DOWN, 100)
     
     async def async_stop_ramp(self, **kwargs: Any) -> None:
         """Stop any ongoing ramping."""
-        # Use direct command format for simplified control
-        simple_payload = f"{self._instance} {RVC_CMD_STOP} 0"
-        
-        # Publish to direct command topic
-        await mqtt.async_publish(
-            self.hass, RVC_DIRECT_COMMAND_TOPIC, simple_payload, 0, False
-        )
+        await self._async_send_command(RVC_CMD_STOP, 0)
@@ -0,0 +1,21 @@
+"""Shared light command batcher for the RVC Lights integration."""
+from homeassistant.components import mqtt
+from homeassistant.core import HomeAssistant, callback
+
+from .commands import CommandBatcher
+from .const import RVC_DIRECT_COMMAND_TOPIC
+
+DATA_BATCHER = "rvc_lights_batcher"
+
+
+@callback
+def async_get_command_batcher(hass: HomeAssistant) -> CommandBatcher:
+    """Return the batcher every light and service publishes through."""
+    batcher = hass.data.get(DATA_BATCHER)
+    if batcher is None:
+
+        async def async_publish(payload: str) -> None:
+            await mqtt.async_publish(hass, RVC_DIRECT_COMMAND_TOPIC, payload, 0, False)
+
+        batcher = hass.data[DATA_BATCHER] = CommandBatcher(hass.loop, async_publish)
+    return batcher
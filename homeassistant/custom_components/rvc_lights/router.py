@@ -0,0 +1,90 @@
+"""Route DC_DIMMER_STATUS_3 messages from one wildcard subscription.
+
+Every light used to hold its own subscription to its status topic while
+discovery held a wildcard subscription to all of them, so each status
+message was delivered twice.  The router subscribes once to
+``RVC/DC_DIMMER_STATUS_3/+`` and looks the topic up in a dict: messages
+for a registered light go to that light only, anything else goes to the
+fallback handler that discovery installs.
+"""
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from homeassistant.components import mqtt
+from homeassistant.core import HomeAssistant, callback
+
+from .const import RVC_STATUS_TOPIC_PREFIX
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_ROUTER = "rvc_lights_router"
+STATUS_TOPIC_FILTER = f"{RVC_STATUS_TOPIC_PREFIX}/+"
+
+MessageHandler = Callable[[Any], None]
+
+
+class DimmerStatusRouter:
+    """Deliver dimmer status messages by topic."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the router."""
+        self.hass = hass
+        self._handlers: Dict[str, MessageHandler] = {}
+        self._fallback: Optional[MessageHandler] = None
+        self._unsubscribe: Optional[Callable[[], None]] = None
+
+    async def async_start(self) -> None:
+        """Subscribe to every dimmer status topic."""
+        if self._unsubscribe is not None:
+            return
+        self._unsubscribe = await mqtt.async_subscribe(
+            self.hass, STATUS_TOPIC_FILTER, self._message_received, 1
+        )
+        _LOGGER.info(f"Subscribed to {STATUS_TOPIC_FILTER} for RVC lights")
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop the subscription."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    @callback
+    def async_register(self, topic: str, handler: MessageHandler) -> Callable[[], None]:
+        """Send messages on ``topic`` to ``handler``; returns the unregister function."""
+        self._handlers[topic] = handler
+
+        @callback
+        def async_unregister() -> None:
+            if self._handlers.get(topic) is handler:
+                del self._handlers[topic]
+
+        return async_unregister
+
+    @callback
+    def async_set_fallback(self, handler: Optional[MessageHandler]) -> None:
+        """Set the handler for topics no light is registered for."""
+        self._fallback = handler
+
+    @callback
+    def _message_received(self, msg) -> None:
+        handler = self._handlers.get(msg.topic, self._fallback)
+        if handler is not None:
+            handler(msg)
+
+
+@callback
+def async_get_router(hass: HomeAssistant) -> DimmerStatusRouter:
+    """Return the router shared by discovery and the light platform."""
+    router = hass.data.get(DATA_ROUTER)
+    if router is None:
+        router = hass.data[DATA_ROUTER] = DimmerStatusRouter(hass)
+    return router
+
+
+@callback
+def async_stop_router(hass: HomeAssistant) -> None:
+    """Unsubscribe and forget the router, so the next setup starts a new one."""
+    router = hass.data.pop(DATA_ROUTER, None)
+    if router is not None:
+        router.async_stop()
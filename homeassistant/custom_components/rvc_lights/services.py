@@ -1,18 +1,18 @@
 """Services for RVC Lights."""
 import json
 import logging
+from typing import List
+
 import voluptuous as vol
 
-from homeassistant.components import mqtt
 from homeassistant.const import ATTR_ENTITY_ID, CONF_DEVICE_ID
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers import entity_registry
 from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
 
 from .const import (
     DOMAIN,
     RVC_COMMAND_TOPIC_PREFIX,
-    RVC_DIRECT_COMMAND_TOPIC,
     RVC_CMD_ON,
     RVC_CMD_OFF,
     RVC_CMD_TOGGLE,
@@ -21,6 +21,9 @@ from .const import (
     RVC_CMD_STOP,
     DEFAULT_DELAY_DURATION,
 )
+from .commands import ALL_INSTANCES, Command, async_fan_out
+from .index import async_get_instance_index
+from .publisher import async_get_command_batcher
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +33,7 @@ SERVICE_RAMP_UP = "ramp_up"
 SERVICE_RAMP_DOWN = "ramp_down"
 SERVICE_STOP_RAMP = "stop_ramp"
 SERVICE_SEND_COMMAND = "send_command"
+SERVICE_BATCH_COMMAND = "batch_command"
 
 # Service schemas
 SCHEMA_ENTITY_SERVICE = vol.Schema({
@@ -59,45 +63,74 @@ SCHEMA_SEND_COMMAND = vol.Schema({
     ),
 })
 
+SCHEMA_BATCH_ITEM = vol.Schema({
+    vol.Required("instance"): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+    vol.Required("command"): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+    vol.Optional("brightness_level", default=0): vol.All(
+        vol.Coerce(int), vol.Range(min=0, max=100)
+    ),
+})
+
+
+def _require_command_for_targets(data: dict) -> dict:
+    """entity_id and group targets share the top-level command."""
+    if (ATTR_ENTITY_ID in data or "group" in data) and "command" not in data:
+        raise vol.Invalid("command is required with entity_id or group")
+    return data
+
+
+SCHEMA_BATCH_COMMAND = vol.All(
+    vol.Schema({
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional("group"): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+        vol.Optional("command"): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+        vol.Optional("brightness_level", default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=100)
+        ),
+        vol.Optional("commands", default=[]): [SCHEMA_BATCH_ITEM],
+    }),
+    cv.has_at_least_one_key(ATTR_ENTITY_ID, "group", "commands"),
+    _require_command_for_targets,
+)
+
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up RVC Light services."""
     
-    async def async_get_instance_from_entity_id(entity_id: str) -> int:
-        """Get the RVC instance ID from an entity ID."""
-        entity_reg = entity_registry.async_get(hass)
-        entity_entry = entity_reg.async_get(entity_id)
-        
-        if not entity_entry or not entity_entry.platform == DOMAIN:
-            return None
-            
-        # Get light entity and extract instance ID
-        state = hass.states.get(entity_id)
-        if not state:
-            return None
-            
-        # The instance should be accessible via the light's attributes
-        if "instance" in state.attributes:
-            return state.attributes["instance"]
-            
-        return None
+    index = async_get_instance_index(hass)
+    
+    def resolve_targets(entity_ids: List[str]) -> List[int]:
+        """Return the instances of the target entities, logging unknown ones."""
+        instances, missing = index.resolve(entity_ids)
+        for entity_id in missing:
+            _LOGGER.error(f"Could not find instance for entity {entity_id}")
+        return instances
+    
+    async def async_send(command: Command) -> None:
+        """Send through the light's own queue, or the batcher if it has no entity."""
+        send = index.sender(command.instance)
+        if send is None:
+            send = async_get_command_batcher(hass).async_send
+        await send(command)
+    
+    async def async_send_commands(commands: List[Command], description: str) -> None:
+        """Send commands concurrently and report every failure together."""
+        failures = await async_fan_out(commands, async_send)
+        if failures:
+            summary = ", ".join(
+                f"instance {command.instance} ({error})" for command, error in failures.items()
+            )
+            raise HomeAssistantError(
+                f"Failed to send {description} to {len(failures)} of {len(commands)} lights: {summary}"
+            )
+        _LOGGER.debug(f"Sent {description} to {len(commands)} lights")
     
     async def async_handle_toggle_service(call: ServiceCall) -> None:
         """Handle the toggle service call."""
         entity_ids = call.data.get(ATTR_ENTITY_ID, [])
-        
-        for entity_id in entity_ids:
-            instance = await async_get_instance_from_entity_id(entity_id)
-            if not instance:
-                _LOGGER.error(f"Could not find instance for entity {entity_id}")
-                continue
-                
-            # Send toggle command using direct format
-            simple_payload = f"{instance} {RVC_CMD_TOGGLE} 100"
-            
-            await mqtt.async_publish(
-                hass, RVC_DIRECT_COMMAND_TOPIC, simple_payload, 0, False
-            )
-            _LOGGER.debug(f"Sent toggle command for instance {instance}")
+        commands = [
+            Command(instance, RVC_CMD_TOGGLE, 100) for instance in resolve_targets(entity_ids)
+        ]
+        await async_send_commands(commands, "toggle command")
     
     async def async_handle_ramp_service(call: ServiceCall, ramp_up: bool) -> None:
         """Handle the ramp up/down service call."""
@@ -107,19 +140,10 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         command = RVC_CMD_RAMP_UP if ramp_up else RVC_CMD_RAMP_DOWN
         command_name = "ramp up" if ramp_up else "ramp down"
         
-        for entity_id in entity_ids:
-            instance = await async_get_instance_from_entity_id(entity_id)
-            if not instance:
-                _LOGGER.error(f"Could not find instance for entity {entity_id}")
-                continue
-                
-            # Send ramp command using direct format
-            simple_payload = f"{instance} {command} {brightness}"
-            
-            await mqtt.async_publish(
-                hass, RVC_DIRECT_COMMAND_TOPIC, simple_payload, 0, False
-            )
-            _LOGGER.debug(f"Sent {command_name} command for instance {instance}: {brightness}%")
+        commands = [
+            Command(instance, command, brightness) for instance in resolve_targets(entity_ids)
+        ]
+        await async_send_commands(commands, f"{command_name} command ({brightness}%)")
     
     async def async_handle_ramp_up_service(call: ServiceCall) -> None:
         """Handle the ramp up service call."""
@@ -132,20 +156,10 @@ async def async_setup_services(hass: HomeAssistant) -> None:
     async def async_handle_stop_ramp_service(call: ServiceCall) -> None:
         """Handle the stop ramp service call."""
         entity_ids = call.data.get(ATTR_ENTITY_ID, [])
-        
-        for entity_id in entity_ids:
-            instance = await async_get_instance_from_entity_id(entity_id)
-            if not instance:
-                _LOGGER.error(f"Could not find instance for entity {entity_id}")
-                continue
-                
-            # Send stop command using direct format
-            simple_payload = f"{instance} {RVC_CMD_STOP} 0"
-            
-            await mqtt.async_publish(
-                hass, RVC_DIRECT_COMMAND_TOPIC, simple_payload, 0, False
-            )
-            _LOGGER.debug(f"Sent stop ramp command for instance {instance}")
+        commands = [
+            Command(instance, RVC_CMD_STOP, 0) for instance in resolve_targets(entity_ids)
+        ]
+        await async_send_commands(commands, "stop ramp command")
     
     async def async_handle_send_command(call: ServiceCall) -> None:
         """Handle the send custom command service call."""
@@ -154,19 +168,28 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         brightness = call.data.get("brightness_level", 0)
         # Note: delay parameter is no longer used with direct commands
         
-        for entity_id in entity_ids:
-            instance = await async_get_instance_from_entity_id(entity_id)
-            if not instance:
-                _LOGGER.error(f"Could not find instance for entity {entity_id}")
-                continue
-                
-            # Send custom command using direct format
-            simple_payload = f"{instance} {command} {brightness}"
-            
-            await mqtt.async_publish(
-                hass, RVC_DIRECT_COMMAND_TOPIC, simple_payload, 0, False
-            )
-            _LOGGER.debug(f"Sent custom command {command} for instance {instance} with brightness {brightness}")
+        commands = [
+            Command(instance, command, brightness) for instance in resolve_targets(entity_ids)
+        ]
+        await async_send_commands(commands, f"custom command {command} ({brightness}%)")
+    
+    async def async_handle_batch_command(call: ServiceCall) -> None:
+        """Send many light commands to the bridge in one message."""
+        commands = [
+            Command(item["instance"], item["command"], item["brightness_level"])
+            for item in call.data["commands"]
+        ]
+        command = call.data.get("command")
+        brightness = call.data["brightness_level"]
+        
+        # A whole group is one command to every instance, filtered by group
+        if "group" in call.data:
+            commands.append(Command(ALL_INSTANCES, command, brightness, call.data["group"]))
+        
+        for instance in resolve_targets(call.data.get(ATTR_ENTITY_ID, [])):
+            commands.append(Command(instance, command, brightness))
+        
+        await async_send_commands(commands, "batched commands")
     
     # Register services
     hass.services.async_register(
@@ -188,3 +211,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
     hass.services.async_register(
         DOMAIN, SERVICE_SEND_COMMAND, async_handle_send_command, SCHEMA_SEND_COMMAND
     )
+    
+    hass.services.async_register(
+        DOMAIN, SERVICE_BATCH_COMMAND, async_handle_batch_command, SCHEMA_BATCH_COMMAND
+    )
@@ -0,0 +1,37 @@
+"""Apply DC_DIMMER_STATUS_3 payloads to RVC light state."""
+import logging
+from typing import Any, Dict, Tuple
+
+from .const import LOAD_STATUS_KEY, STATE_KEY
+
+_LOGGER = logging.getLogger(__name__)
+
+LOAD_STATUS_ON = frozenset(("active", "on", "01", "1", "true"))
+LOAD_STATUS_OFF = frozenset(("inactive", "off", "00", "0", "false"))
+
+
+def apply_status(
+    payload: Dict[str, Any], state: bool, brightness: int, default_brightness: int
+) -> Tuple[bool, int]:
+    """Return the (state, brightness 0-100) a status payload leaves a light in."""
+    if STATE_KEY in payload:
+        try:
+            brightness = min(max(int(payload[STATE_KEY]), 0), 100)
+            state = brightness > 0
+        except (ValueError, TypeError):
+            _LOGGER.warning(f"Invalid brightness value in payload: {payload[STATE_KEY]}")
+
+    load_status = payload.get(LOAD_STATUS_KEY)
+    if load_status is not None:
+        if isinstance(load_status, str):
+            load_status = load_status.lower()
+            if load_status in LOAD_STATUS_ON:
+                state = True
+            elif load_status in LOAD_STATUS_OFF:
+                state = False
+
+        # If just turned on but no brightness, use default
+        if state and brightness == 0:
+            brightness = default_brightness
+
+    return state, brightness
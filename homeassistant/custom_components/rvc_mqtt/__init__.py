@@ -4,17 +4,27 @@ This component allows for YAML configuration of MQTT sensors for RVC devices.
 import asyncio
 import logging
 import os
-import yaml
 
 from homeassistant.config_entries import ConfigEntry, SOURCE_IMPORT
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.discovery import async_load_platform
 
+from ..rvc_common.cache import load_cached
+from .descriptors import CACHE_VERSION, build_descriptors
+
 DOMAIN = "rvc_mqtt"
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["sensor", "climate"]
 
+# Files whose sensors and climate devices are set up, in order.
+CONFIG_FILES = (
+    "rvc_sensors.yaml",
+    "circulation_pump_sensors.yaml",
+    "thermostat_sensors.yaml",
+    "climate.yaml",
+)
+
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the RVC MQTT component from YAML."""
     if DOMAIN in config:
@@ -31,33 +41,27 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up RVC MQTT from a config entry."""
     
-    # Load sensor configurations asynchronously
-    sensor_config = await async_load_rvc_yaml(hass, "rvc_sensors.yaml")
-    
-    additional_sensor_configs = [
-        "circulation_pump_sensors.yaml",
-        "thermostat_sensors.yaml"
-    ]
+    # Load all configuration files concurrently
+    loaded = await asyncio.gather(
+        *[async_load_rvc_yaml(hass, config_file) for config_file in CONFIG_FILES]
+    )
     
-    for config_file in additional_sensor_configs:
-        additional_config = await async_load_rvc_yaml(hass, config_file)
-        if additional_config and 'sensor' in additional_config:
-            if 'sensor' not in sensor_config:
-                sensor_config['sensor'] = []
-            sensor_config["sensor"].extend(additional_config["sensor"])
-
-    # Load climate configuration asynchronously
-    climate_config = await async_load_rvc_yaml(hass, "climate.yaml")
+    sensor_config = {"sensor": [], "templates": {}}
+    climate_config = {"climate": []}
+    for descriptors in loaded:
+        sensor_config["sensor"].extend(descriptors.get("sensor", []))
+        sensor_config["templates"].update(descriptors.get("templates", {}))
+        climate_config["climate"].extend(descriptors.get("climate", []))
     
     # Set up sensor platform if there's a configuration
-    if sensor_config and sensor_config.get("sensor"):
+    if sensor_config["sensor"]:
         _LOGGER.info(f"Setting up {len(sensor_config['sensor'])} RVC MQTT sensors")
         hass.async_create_task(
             async_load_platform(hass, 'sensor', DOMAIN, sensor_config, {})
         )
     
     # Set up climate platform if there's a configuration
-    if climate_config and climate_config.get("climate"):
+    if climate_config["climate"]:
         _LOGGER.info(f"Setting up {len(climate_config['climate'])} RVC MQTT climate controls")
         hass.async_create_task(
             async_load_platform(hass, 'climate', DOMAIN, climate_config, {})
@@ -66,7 +70,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 async def async_load_rvc_yaml(hass: HomeAssistant, filename: str) -> dict:
-    """Load a YAML file asynchronously from the custom component's directory."""
+    """Load the validated descriptors of a YAML file in the component's directory.
+
+    The descriptors are served from a binary cache next to the file until
+    the YAML changes, so restarts skip parsing and validation entirely.
+    """
     config_path = os.path.join(hass.config.config_dir, "custom_components", DOMAIN, filename)
     
     def load_yaml_sync():
@@ -75,8 +83,7 @@ async def async_load_rvc_yaml(hass: HomeAssistant, filename: str) -> dict:
             _LOGGER.warning(f"Configuration file not found: {config_path}")
             return {}
         try:
-            with open(config_path, 'r') as file:
-                return yaml.safe_load(file) or {}
+            return load_cached(config_path, build_descriptors, version=CACHE_VERSION)
         except Exception as e:
             _LOGGER.error(f"Error loading YAML file {config_path}: {e}")
             return {}
@@ -27,11 +27,19 @@ from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
+from ..rvc_common.decode import decode_payload
+from ..rvc_common.latency import LatencyTracker
+from ..rvc_common.thermostat import command_payload, command_topic, setpoint_fields
+from ..rvc_common.throttle import DEFAULT_MIN_PUBLISH_INTERVAL, WriteThrottle
+from .coalesce import CommandCoalescer
+
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_NAME = "RVC AC Control"
 CONF_TOPIC = "topic"
 CONF_INSTANCE = "instance"
+CONF_MIN_PUBLISH_INTERVAL = "min_publish_interval"
+CONF_THERMOSTAT_INSTANCE = "thermostat_instance"
 
 # Operating mode mappings
 MODE_MAPPING = {
@@ -63,6 +71,10 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
     vol.Required(CONF_INSTANCE): cv.positive_int,
     vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
     vol.Optional(CONF_UNIQUE_ID): cv.string,
+    vol.Optional(
+        CONF_MIN_PUBLISH_INTERVAL, default=DEFAULT_MIN_PUBLISH_INTERVAL
+    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(CONF_THERMOSTAT_INSTANCE): vol.All(vol.Coerce(int), vol.Range(min=0, max=254)),
 })
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
@@ -80,11 +92,17 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         instance = device_config.get(CONF_INSTANCE)
         name = device_config.get(CONF_NAME, DEFAULT_NAME)
         unique_id = device_config.get(CONF_UNIQUE_ID)
+        min_publish_interval = device_config.get(
+            CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL
+        )
+        thermostat_instance = device_config.get(CONF_THERMOSTAT_INSTANCE)
         
         _LOGGER.info(f"Setting up climate device: {name}, instance: {instance}, topic: {topic}")
         
         climate_devices.append(
-            RvcMqttClimate(hass, name, topic, instance, unique_id)
+            RvcMqttClimate(
+                hass, name, topic, instance, unique_id, min_publish_interval, thermostat_instance
+            )
         )
     
     if climate_devices:
@@ -93,7 +111,16 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
 class RvcMqttClimate(ClimateEntity):
     """Representation of an RVC MQTT climate device."""
 
-    def __init__(self, hass, name, topic, instance, unique_id):
+    def __init__(
+        self,
+        hass,
+        name,
+        topic,
+        instance,
+        unique_id,
+        min_publish_interval=DEFAULT_MIN_PUBLISH_INTERVAL,
+        thermostat_instance=None,
+    ):
         """Initialize the climate device."""
         self.hass = hass
         self._name = name
@@ -103,6 +130,9 @@ class RvcMqttClimate(ClimateEntity):
         # According to RVC-spec.yml, AIR_CONDITIONER_COMMAND has DGN 1FFE0
         self._command_topic = f"RVC/AIR_CONDITIONER_COMMAND/{instance}/set"
         self._status_topic = f"RVC/AIR_CONDITIONER_STATUS/{instance}"
+        # Setpoints go to the thermostat zone controlling this unit, if configured
+        self._thermostat_instance = thermostat_instance
+        self._sent_setpoint = None
         
         # Set initial state
         self._hvac_mode = HVACMode.OFF
@@ -111,6 +141,9 @@ class RvcMqttClimate(ClimateEntity):
         self._target_temperature = 22
         self._unit = hass.config.units is METRIC_SYSTEM and UnitOfTemperature.CELSIUS or UnitOfTemperature.FAHRENHEIT
         self._available = False
+        self._throttle = WriteThrottle(hass.loop, self.async_write_ha_state, min_publish_interval)
+        self._latency = LatencyTracker()
+        self._commands = CommandCoalescer(hass.loop, self._send_command)
         self._attr_supported_features = (
             ClimateEntityFeature.TARGET_TEMPERATURE |
             ClimateEntityFeature.FAN_MODE
@@ -142,8 +175,9 @@ class RvcMqttClimate(ClimateEntity):
         def message_received(msg):
             """Handle new MQTT messages."""
             try:
-                data = json.loads(msg.payload)
+                data = decode_payload(msg.topic, msg.payload)
                 _LOGGER.debug("Received AC status: %s", data)
+                previous = (self._available, self._hvac_mode)
 
                 if "operating mode" in data:
                     mode_value = data["operating mode"]
@@ -167,18 +201,24 @@ class RvcMqttClimate(ClimateEntity):
                 # The actual temperature would come from a separate thermostat sensor
                 # This just serves as a placeholder for now
                 self._available = True
-                self.async_write_ha_state()
+                self._latency.observe((self._hvac_mode, self._fan_mode))
+                # Mode and availability changes are shown at once; the rest is coalesced
+                self._throttle.request(immediate=(self._available, self._hvac_mode) != previous)
             
             except Exception as e:
                 _LOGGER.error("Error processing MQTT message: %s", e)
 
         # Subscribe to status updates
-        await mqtt.async_subscribe(
-            self.hass,
-            self._status_topic,
-            message_received,
-            1
+        self.async_on_remove(
+            await mqtt.async_subscribe(
+                self.hass,
+                self._status_topic,
+                message_received,
+                1
+            )
         )
+        self.async_on_remove(self._throttle.cancel)
+        self.async_on_remove(self._commands.cancel)
 
     @property
     def name(self):
@@ -210,6 +250,11 @@ class RvcMqttClimate(ClimateEntity):
         """Return the fan setting."""
         return self._fan_mode
 
+    @property
+    def extra_state_attributes(self):
+        """Return command round-trip statistics."""
+        return self._latency.attributes()
+
     @property
     def available(self):
         """Return if the device is available."""
@@ -219,25 +264,30 @@ class RvcMqttClimate(ClimateEntity):
         """Set new target temperature."""
         if ATTR_TEMPERATURE in kwargs:
             self._target_temperature = kwargs.get(ATTR_TEMPERATURE)
-            await self._send_command()
+            self._commands.request()
             self.async_write_ha_state()
 
     async def async_set_fan_mode(self, fan_mode):
         """Set new fan mode."""
         if fan_mode in self._attr_fan_modes:
             self._fan_mode = fan_mode
-            await self._send_command()
+            self._commands.request()
             self.async_write_ha_state()
 
     async def async_set_hvac_mode(self, hvac_mode):
         """Set new hvac mode."""
         if hvac_mode in self._attr_hvac_modes:
             self._hvac_mode = hvac_mode
-            await self._send_command()
+            self._commands.request()
             self.async_write_ha_state()
 
     async def _send_command(self):
-        """Send command to the AC unit."""
+        """Send one command with the current mode, fan and temperature.
+
+        Called by the coalescer, so set_* calls made within its window
+        share a single publish.  AIR_CONDITIONER_COMMAND has no setpoint;
+        a changed target temperature goes to the configured thermostat.
+        """
         # Map HA modes to RVC modes
         rvc_mode = 0  # Default to automatic/off
         if self._hvac_mode == HVACMode.OFF:
@@ -260,6 +310,10 @@ class RvcMqttClimate(ClimateEntity):
         elif self._fan_mode == FAN_HIGH:
             fan_speed = 3
 
+        # Confirmed once the status reports the mode this command selects
+        expected = (REVERSE_MODE_MAPPING[rvc_mode], self._fan_mode)
+        self._latency.start(lambda status: status == expected)
+
         # Create payload matching RVC-spec.yml for AIR_CONDITIONER_COMMAND (1FFE0)
         payload = {
             "instance": self._instance,
@@ -272,13 +326,8 @@ class RvcMqttClimate(ClimateEntity):
             "dgn": "1FFE0"  # Correct DGN from RVC-spec.yml
         }
 
-        # Enhanced logging for command tracking
-        _LOGGER.debug("Sending AC command: %s", payload)
-        _LOGGER.warning(f"TEST: Sending AC command to {self._command_topic}: {json.dumps(payload)}")
-        _LOGGER.warning(f"TEST: Current AC state before command - Mode: {self._hvac_mode}, Fan: {self._fan_mode}, Target Temp: {self._target_temperature}")
-        
+        _LOGGER.debug(f"Sending AC command to {self._command_topic}: {payload}")
         try:
-            # Send the command
             await mqtt.async_publish(
                 self.hass,
                 self._command_topic,
@@ -286,17 +335,28 @@ class RvcMqttClimate(ClimateEntity):
                 0,
                 False
             )
-            _LOGGER.warning(f"TEST: Command successfully published to {self._command_topic}")
-            
-            # Also try with alternate topic format as a fallback
-            alt_topic = f"RVC/AIR_CONDITIONER_COMMAND_2/{self._instance}/set"
-            await mqtt.async_publish(
-                self.hass,
-                alt_topic,
-                json.dumps(payload),
-                0,
-                False
-            )
-            _LOGGER.warning(f"TEST: Also published to alternate topic: {alt_topic}")
         except Exception as e:
-            _LOGGER.error(f"TEST: Failed to publish AC command: {str(e)}")
+            self._latency.cancel()
+            _LOGGER.error(f"Failed to publish AC command: {e}")
+
+        setpoint = setpoint_fields(
+            "heat" if self._hvac_mode == HVACMode.HEAT else "cool", self._target_temperature
+        )
+        if self._thermostat_instance is not None and setpoint != self._sent_setpoint:
+            await self._send_setpoint(setpoint)
+
+    async def _send_setpoint(self, setpoint):
+        """Send the target temperature as the setpoint of the active mode."""
+        try:
+            payload = command_payload(self._thermostat_instance, unit=self._unit, **setpoint)
+        except ValueError as e:
+            _LOGGER.error(f"Cannot send setpoint for {self._name}: {e}")
+            return
+        topic = command_topic(self._thermostat_instance)
+        _LOGGER.debug(f"Sending thermostat setpoint to {topic}: {payload}")
+        try:
+            await mqtt.async_publish(self.hass, topic, json.dumps(payload), 0, False)
+        except Exception as e:
+            _LOGGER.error(f"Failed to publish thermostat setpoint: {e}")
+            return
+        self._sent_setpoint = setpoint
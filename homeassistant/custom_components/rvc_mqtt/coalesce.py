@@ -0,0 +1,75 @@
+"""Merge bursts of device commands into one.
+
+Setting a climate device's mode, fan and temperature (a scene does all
+three) used to publish a full AIR_CONDITIONER_COMMAND per attribute.  An
+entity now updates its state and calls ``request``; the coalescer waits a
+short window and then calls ``send`` once, which builds the command from
+the entity's state at that moment and so carries every change made in
+the window.  Requests arriving while a command is being sent start a new
+window after it, so commands are never sent concurrently.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds changes are collected before one command is sent.
+DEFAULT_COMMAND_WINDOW = 0.25
+
+
+class CommandCoalescer:
+    """Send at most one command per window, built from the latest state."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        send: Callable[[], Awaitable[None]],
+        window: float = DEFAULT_COMMAND_WINDOW,
+    ) -> None:
+        """Initialize the coalescer around ``send``, which publishes the current state."""
+        self._loop = loop
+        self._send = send
+        self._window = window
+        self._dirty = False
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> bool:
+        """Return True while a requested command has not been sent."""
+        return self._dirty
+
+    def request(self) -> None:
+        """Ask for a command carrying the current state."""
+        self._dirty = True
+        if self._timer is None and self._task is None:
+            self._timer = self._loop.call_later(self._window, self._start)
+
+    def cancel(self) -> None:
+        """Drop unsent changes and stop sending, e.g. when the entity is removed."""
+        self._dirty = False
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _start(self) -> None:
+        self._timer = None
+        self._task = self._loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        try:
+            while self._dirty:
+                self._dirty = False
+                try:
+                    await self._send()
+                except Exception as e:
+                    _LOGGER.error(f"Failed to send coalesced command: {e}")
+                if self._dirty:
+                    # Changes made during the send get a window of their own.
+                    await asyncio.sleep(self._window)
+        finally:
+            self._task = None
@@ -0,0 +1,74 @@
+"""Change-only state writes for RVC MQTT sensors.
+
+Most RV-C status DGNs are broadcast periodically whether or not anything
+changed, and the sensors are configured with ``force_update``, so every
+frame used to become a state write and a recorder row.  Each sensor asks
+its ``ChangeFilter`` whether a new value is worth writing: only values
+that moved beyond the deadband pass, plus one every ``heartbeat`` seconds
+so expire_after and history keep seeing updates.
+"""
+import time
+from typing import Any, NamedTuple, Optional
+
+# Unchanged values are still written this often (seconds); 0 writes every message.
+DEFAULT_HEARTBEAT = 300
+
+
+class Deadband(NamedTuple):
+    """How far a numeric value must move before it is written.
+
+    A change passes only when it exceeds every limit that is set; leaving
+    both at zero passes any change at all.
+    """
+
+    absolute: float = 0.0
+    percent: float = 0.0
+
+    def exceeded(self, last: Any, value: Any) -> bool:
+        """Return True if value moved further than the deadband from last.
+
+        Rendered templates are strings, so values are compared as numbers
+        when both convert; anything else changes whenever it differs.
+        """
+        if value == last:
+            return False
+        try:
+            last_number = float(last)
+            number = float(value)
+        except (TypeError, ValueError):
+            return True
+        delta = abs(number - last_number)
+        if self.absolute and delta <= self.absolute:
+            return False
+        if self.percent and delta <= abs(last_number) * self.percent / 100:
+            return False
+        return delta > 0
+
+
+class ChangeFilter:
+    """Pass changes beyond a deadband, and the last value once per heartbeat."""
+
+    def __init__(self, deadband: Deadband = Deadband(), heartbeat: float = DEFAULT_HEARTBEAT) -> None:
+        """Initialize the filter; nothing has been written yet."""
+        self._deadband = deadband
+        self._heartbeat = heartbeat
+        self._written: Any = None
+        self._last_write: Optional[float] = None
+
+    def should_write(self, value: Any, force: bool = False, now: Optional[float] = None) -> bool:
+        """Return True, and remember value, if it should be written now.
+
+        ``force`` writes regardless, e.g. when the entity comes back online.
+        """
+        if now is None:
+            now = time.monotonic()
+        if (
+            force
+            or self._last_write is None
+            or now - self._last_write >= self._heartbeat
+            or self._deadband.exceeded(self._written, value)
+        ):
+            self._written = value
+            self._last_write = now
+            return True
+        return False
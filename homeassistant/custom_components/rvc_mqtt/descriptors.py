@@ -0,0 +1,126 @@
+"""Validated, precompiled descriptors for the RVC MQTT YAML files.
+
+Setup used to parse every YAML file, then prepare each sensor from the
+raw dictionaries.  ``build_descriptors`` turns one file into validated
+sensor and climate configurations (defaults filled in) plus the parsed
+value templates.  The result is plain data, so ``rvc_common.cache.load_cached`` can
+keep it on disk and a restart with unchanged files skips YAML parsing,
+validation and template parsing entirely.
+"""
+import logging
+from typing import Any, Dict, List
+
+import voluptuous as vol
+import yaml
+
+from ..rvc_common.throttle import DEFAULT_MIN_PUBLISH_INTERVAL
+from .deadband import DEFAULT_HEARTBEAT
+from .extractors import parse_value_template
+
+_LOGGER = logging.getLogger(__name__)
+
+# Version of the cached descriptors; bump whenever their shape changes.
+CACHE_VERSION = 3
+
+
+def _ensure_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _icon(value: Any) -> str:
+    value = str(value)
+    if ":" not in value:
+        raise vol.Invalid('Icons should be specified in the form "prefix:name"')
+    return value
+
+
+DEVICE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("identifiers"): vol.All(_ensure_list, [str]),
+        vol.Optional("name"): str,
+        vol.Optional("manufacturer"): str,
+        vol.Optional("model"): str,
+    }
+)
+
+# Keys Home Assistant's own MQTT sensor accepts (json_attributes_*, ...)
+# are allowed in the files but not used here, so they are dropped.
+SENSOR_SCHEMA = vol.Schema(
+    {
+        vol.Required("platform"): str,
+        vol.Required("state_topic"): str,
+        vol.Required("name"): str,
+        vol.Required("unique_id"): str,
+        vol.Optional("device_class"): str,
+        vol.Optional("state_class"): str,
+        vol.Optional("unit_of_measurement"): str,
+        vol.Optional("value_template"): str,
+        vol.Optional("icon"): _icon,
+        vol.Optional("qos", default=0): vol.All(vol.Coerce(int), vol.In([0, 1, 2])),
+        vol.Optional("expire_after"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional("force_update", default=False): vol.Boolean(),
+        vol.Optional("deadband", default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("deadband_percent", default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("heartbeat", default=DEFAULT_HEARTBEAT): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(
+            "min_publish_interval", default=DEFAULT_MIN_PUBLISH_INTERVAL
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("availability_topic"): str,
+        vol.Optional("payload_available", default="online"): str,
+        vol.Optional("payload_not_available", default="offline"): str,
+        vol.Optional("device"): DEVICE_SCHEMA,
+    },
+    extra=vol.REMOVE_EXTRA,
+)
+
+CLIMATE_SCHEMA = vol.Schema(
+    {
+        vol.Required("topic"): str,
+        vol.Required("instance"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional("name"): str,
+        vol.Optional("unique_id"): str,
+        vol.Optional(
+            "min_publish_interval", default=DEFAULT_MIN_PUBLISH_INTERVAL
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("thermostat_instance"): vol.All(vol.Coerce(int), vol.Range(min=0, max=254)),
+        vol.Optional("device"): DEVICE_SCHEMA,
+    },
+    extra=vol.REMOVE_EXTRA,
+)
+
+PLATFORM_SCHEMAS = {"sensor": SENSOR_SCHEMA, "climate": CLIMATE_SCHEMA}
+
+
+def _validate(platform: str, entries: Any) -> List[Dict[str, Any]]:
+    """Validate each entry on its own so one bad entry does not drop the file."""
+    schema = PLATFORM_SCHEMAS[platform]
+    valid = []
+    for entry in _ensure_list(entries):
+        try:
+            valid.append(schema(entry))
+        except vol.Invalid as e:
+            name = entry.get("name") if isinstance(entry, dict) else entry
+            _LOGGER.error(f"Invalid {platform} configuration for {name}: {e}")
+    return valid
+
+
+def build_descriptors(raw: bytes) -> Dict[str, Any]:
+    """Parse and validate one YAML file.
+
+    Returns a dict holding the validated entries per platform ("sensor",
+    "climate") and "templates", the parsed plan of each sensor's
+    value_template keyed by its source (None when it needs Jinja).
+    """
+    config = yaml.safe_load(raw) or {}
+    descriptors: Dict[str, Any] = {}
+    for platform in PLATFORM_SCHEMAS:
+        if platform in config:
+            descriptors[platform] = _validate(platform, config[platform])
+    descriptors["templates"] = {
+        sensor["value_template"]: parse_value_template(sensor["value_template"])
+        for sensor in descriptors.get("sensor", [])
+        if sensor.get("value_template")
+    }
+    return descriptors
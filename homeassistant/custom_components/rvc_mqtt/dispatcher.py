@@ -0,0 +1,112 @@
+"""Shared MQTT topic dispatcher for RVC MQTT entities.
+
+Many sensors read different fields of the same RV-C status topic.  Instead
+of one MQTT subscription per sensor, the dispatcher subscribes once per
+unique topic, parses the JSON payload once and hands the result to every
+entity bound to that topic.
+"""
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from homeassistant.components import mqtt
+from homeassistant.core import HomeAssistant, callback
+
+from ..rvc_common.decode import decode_payload
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DISPATCHER = "rvc_mqtt_dispatcher"
+
+# Called with the MQTT message and its parsed JSON (None if not JSON).
+MessageCallback = Callable[[Any, Optional[Any]], None]
+
+
+class _TopicSubscription:
+    """The entities bound to one topic and the MQTT subscription feeding them."""
+
+    __slots__ = ("callbacks", "unsubscribe")
+
+    def __init__(self) -> None:
+        self.callbacks: List[MessageCallback] = []
+        self.unsubscribe: Optional[Callable[[], None]] = None
+
+
+class RvcTopicDispatcher:
+    """Subscribe once per topic and fan parsed payloads out to entities."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._topics: Dict[str, _TopicSubscription] = {}
+
+    async def async_subscribe(
+        self, topic: str, message_callback: MessageCallback, qos: int = 0
+    ) -> Callable[[], None]:
+        """Bind a callback to a topic; returns a function that unbinds it."""
+        subscription = self._topics.get(topic)
+        if subscription is None:
+            # Registered before awaiting so concurrent binds share it.
+            subscription = _TopicSubscription()
+            self._topics[topic] = subscription
+            subscription.callbacks.append(message_callback)
+            try:
+                unsubscribe = await mqtt.async_subscribe(
+                    self.hass, topic, self._make_handler(subscription), qos
+                )
+            except Exception:
+                # Forget the topic so the next bind subscribes again.
+                if self._topics.get(topic) is subscription:
+                    del self._topics[topic]
+                raise
+            if self._topics.get(topic) is subscription:
+                subscription.unsubscribe = unsubscribe
+            else:
+                # Every entity unbound while the subscription was pending.
+                unsubscribe()
+            _LOGGER.debug(f"Subscribed to {topic}")
+        else:
+            subscription.callbacks.append(message_callback)
+
+        @callback
+        def async_unbind() -> None:
+            """Remove the callback and drop the topic once nobody uses it."""
+            if message_callback in subscription.callbacks:
+                subscription.callbacks.remove(message_callback)
+            if not subscription.callbacks and self._topics.get(topic) is subscription:
+                del self._topics[topic]
+                if subscription.unsubscribe is not None:
+                    subscription.unsubscribe()
+                    subscription.unsubscribe = None
+
+        return async_unbind
+
+    @staticmethod
+    def _make_handler(subscription: _TopicSubscription) -> Callable[[Any], None]:
+        @callback
+        def message_received(msg) -> None:
+            """Parse the payload once and deliver it to every bound entity."""
+            try:
+                value_json = decode_payload(msg.topic, msg.payload)
+            except (ValueError, TypeError):
+                value_json = None
+            for message_callback in list(subscription.callbacks):
+                try:
+                    message_callback(msg, value_json)
+                except Exception as e:
+                    _LOGGER.error(f"Error dispatching message on {msg.topic}: {e}")
+
+        return message_received
+
+    @property
+    def topic_count(self) -> int:
+        """Return the number of MQTT subscriptions held."""
+        return len(self._topics)
+
+
+@callback
+def async_get_dispatcher(hass: HomeAssistant) -> RvcTopicDispatcher:
+    """Return the dispatcher shared by all RVC MQTT platforms."""
+    dispatcher = hass.data.get(DATA_DISPATCHER)
+    if dispatcher is None:
+        dispatcher = hass.data[DATA_DISPATCHER] = RvcTopicDispatcher(hass)
+    return dispatcher
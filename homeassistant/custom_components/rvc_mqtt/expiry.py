@@ -0,0 +1,103 @@
+"""Shared expire_after tracking for RVC MQTT sensors.
+
+Re-arming a per-sensor timer on every message keeps the event loop's timer
+heap churning.  Instead each sensor gets a slot in a compact array of
+last-seen times; a message is a single store, and one coarse periodic tick
+scans the array and expires every stale sensor in bulk.
+"""
+import asyncio
+import logging
+import math
+import time
+from array import array
+from typing import Callable, List, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_EXPIRY = "rvc_mqtt_expiry"
+# Seconds between scans; expiry fires up to this much after expire_after.
+DEFAULT_TICK = 5.0
+
+_NEVER = math.inf
+
+
+class ExpiryManager:
+    """Track last-seen times per slot and expire stale slots on a tick."""
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, tick: float = DEFAULT_TICK
+    ) -> None:
+        """Initialize the manager; the tick runs only while slots exist."""
+        self._loop = loop
+        self._tick = tick
+        self._last_seen = array("d")
+        self._expire_after = array("d")
+        self._callbacks: List[Optional[Callable[[], None]]] = []
+        self._free: List[int] = []
+        self._active = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def register(self, expire_after: float, on_expire: Callable[[], None]) -> int:
+        """Add a slot; ``on_expire`` runs once when it has gone stale.
+
+        A slot does not expire until it has been touched at least once.
+        """
+        if self._free:
+            slot = self._free.pop()
+            self._last_seen[slot] = _NEVER
+            self._expire_after[slot] = expire_after
+            self._callbacks[slot] = on_expire
+        else:
+            slot = len(self._callbacks)
+            self._last_seen.append(_NEVER)
+            self._expire_after.append(expire_after)
+            self._callbacks.append(on_expire)
+        self._active += 1
+        if self._timer is None:
+            self._timer = self._loop.call_later(self._tick, self._scan)
+        return slot
+
+    def unregister(self, slot: int) -> None:
+        """Release a slot."""
+        if self._callbacks[slot] is None:
+            return
+        self._callbacks[slot] = None
+        self._last_seen[slot] = _NEVER
+        self._free.append(slot)
+        self._active -= 1
+        if not self._active and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def touch(self, slot: int) -> None:
+        """Record that the slot received a message now."""
+        self._last_seen[slot] = time.monotonic()
+
+    def _scan(self) -> None:
+        """Expire every slot that has been silent for its expire_after."""
+        self._timer = self._loop.call_later(self._tick, self._scan)
+        now = time.monotonic()
+        last_seen = self._last_seen
+        expire_after = self._expire_after
+        expired = [
+            slot
+            for slot in range(len(last_seen))
+            if now - last_seen[slot] >= expire_after[slot]
+        ]
+        for slot in expired:
+            last_seen[slot] = _NEVER
+            on_expire = self._callbacks[slot]
+            if on_expire is None:
+                continue
+            try:
+                on_expire()
+            except Exception as e:
+                _LOGGER.error(f"Error expiring sensor in slot {slot}: {e}")
+
+
+def async_get_expiry_manager(hass) -> ExpiryManager:
+    """Return the expiry manager shared by all RVC MQTT sensors."""
+    manager = hass.data.get(DATA_EXPIRY)
+    if manager is None:
+        manager = hass.data[DATA_EXPIRY] = ExpiryManager(hass.loop)
+    return manager
@@ -0,0 +1,160 @@
+"""Compile common RVC value templates into direct field lookups.
+
+Nearly every sensor template in the RVC YAML files has the shape::
+
+    {% if value_json is defined and value_json is mapping and 'x' in value_json %}
+      {{ value_json['x'] }}
+    {% else %}
+      unknown
+    {% endif %}
+
+Rendering that through Jinja on every message is far more work than the
+dictionary lookup it amounts to.  ``compile_value_template`` recognises
+these templates (and the "Label: {{ value_json['x'] }} | ..." summaries)
+and returns a function producing the same string Home Assistant would
+render.  Anything else returns None and keeps using the real template.
+
+``parse_value_template`` does the parsing alone and returns a picklable
+``TemplatePlan``, so the descriptor cache can store it across restarts.
+"""
+import re
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, Union
+
+# Called with the parsed payload (None if it was not JSON).
+Extractor = Callable[[Optional[Any]], str]
+
+_IF_ELSE = re.compile(
+    r"^\s*\{%-?\s*if\s+(?P<condition>.+?)\s*-?%\}"
+    r"(?P<body>.*?)"
+    r"\{%-?\s*else\s*-?%\}(?P<default>.*?)\{%-?\s*endif\s*-?%\}\s*$",
+    re.DOTALL,
+)
+_CONDITION_TERM = re.compile(
+    r"^(?:value_json is defined|value_json is mapping|'(?P<key>[^'\\]*)' in value_json)$"
+)
+_FIELD = re.compile(r"\{\{\s*value_json\['([^'\\]*)'\]\s*\}\}")
+_TEMPLATE_SYNTAX = ("{{", "}}", "{%", "%}", "{#", "#}")
+
+# A compiled body: literal text and field keys, in order.
+Segment = Tuple[bool, str]
+
+
+class TemplatePlan(NamedTuple):
+    """A parsed if/else value template."""
+
+    mapping: bool  # the condition requires value_json to be a mapping
+    keys: Tuple[str, ...]  # keys the condition requires
+    segments: Tuple[Segment, ...]  # the body to render
+    default: str  # the stripped else branch
+
+
+def _is_literal(text: str) -> bool:
+    return not any(token in text for token in _TEMPLATE_SYNTAX)
+
+
+def _parse_condition(condition: str) -> Optional[Tuple[bool, Tuple[str, ...]]]:
+    """Return (requires mapping, required keys) or None if not recognised."""
+    terms = [term.strip() for term in condition.split(" and ")]
+    if not terms or terms[0] != "value_json is defined":
+        return None
+    mapping = False
+    keys: List[str] = []
+    for term in terms[1:]:
+        match = _CONDITION_TERM.match(term)
+        if match is None:
+            return None
+        if match.group("key") is not None:
+            if not mapping:
+                return None  # 'x' in value_json means something else for lists
+            keys.append(match.group("key"))
+        elif term == "value_json is mapping":
+            mapping = True
+        else:
+            return None
+    return mapping, tuple(keys)
+
+
+def _parse_body(body: str) -> Optional[List[Segment]]:
+    """Split a body into literal text and ``{{ value_json['x'] }}`` fields."""
+    segments: List[Segment] = []
+    position = 0
+    for match in _FIELD.finditer(body):
+        literal = body[position : match.start()]
+        if not _is_literal(literal):
+            return None
+        if literal:
+            segments.append((False, literal))
+        segments.append((True, match.group(1)))
+        position = match.end()
+    literal = body[position:]
+    if not _is_literal(literal):
+        return None
+    if literal:
+        segments.append((False, literal))
+    return segments
+
+
+def _render(value: Any) -> str:
+    """Render a value the way ``{{ value }}`` does."""
+    return value if isinstance(value, str) else str(value)
+
+
+def parse_value_template(source: Union[str, None]) -> Optional[TemplatePlan]:
+    """Return the plan of a template the extractors can handle, or None."""
+    if not source:
+        return None
+    match = _IF_ELSE.match(source)
+    if match is None:
+        return None
+    condition = _parse_condition(match.group("condition"))
+    # Home Assistant strips the rendered result, so edge whitespace is moot.
+    segments = _parse_body(match.group("body").strip())
+    default = match.group("default")
+    if condition is None or segments is None or not _is_literal(default):
+        return None
+    mapping, keys = condition
+    return TemplatePlan(mapping, keys, tuple(segments), default.strip())
+
+
+def build_extractor(plan: TemplatePlan) -> Extractor:
+    """Return the function rendering a parsed template."""
+    mapping, keys, segments, default = plan
+
+    fields = [text for is_field, text in segments if is_field]
+    if len(segments) == 1 and fields:
+        # The common case: a single field and nothing else.
+        key = fields[0]
+        if mapping and keys == (key,):
+
+            def extract_field(value_json: Optional[Any]) -> str:
+                if isinstance(value_json, dict) and key in value_json:
+                    return _render(value_json[key]).strip()
+                return default
+
+            return extract_field
+
+    def extract(value_json: Optional[Any]) -> str:
+        if value_json is None:
+            return default
+        is_dict = isinstance(value_json, dict)
+        if mapping and not is_dict:
+            return default
+        for key in keys:
+            if key not in value_json:
+                return default
+        parts = []
+        for is_field, text in segments:
+            if not is_field:
+                parts.append(text)
+            elif is_dict and text in value_json:
+                parts.append(_render(value_json[text]))
+            # A missing key renders as an empty string.
+        return "".join(parts).strip()
+
+    return extract
+
+
+def compile_value_template(source: Union[str, None]) -> Optional[Extractor]:
+    """Return an extractor equivalent to the template, or None."""
+    plan = parse_value_template(source)
+    return None if plan is None else build_extractor(plan)
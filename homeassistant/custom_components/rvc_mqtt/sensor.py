@@ -4,16 +4,10 @@ For more details about this platform, please refer to the documentation at
 https://github.com/username/rvc-ha
 """
 import logging
-import json
-from datetime import timedelta
 from typing import Any, Dict, List, Optional, Union
 
-from homeassistant.helpers.event import async_track_point_in_time
-import homeassistant.util.dt as dt_util
-
 import voluptuous as vol
 
-from homeassistant.components import mqtt
 from homeassistant.components.mqtt.sensor import MqttSensor
 from homeassistant.components.sensor import (
     PLATFORM_SCHEMA,
@@ -34,37 +28,24 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
+from ..rvc_common.throttle import DEFAULT_MIN_PUBLISH_INTERVAL, WriteThrottle
 from . import DOMAIN
+from .deadband import DEFAULT_HEARTBEAT, ChangeFilter, Deadband
+from .descriptors import SENSOR_SCHEMA
+from .dispatcher import async_get_dispatcher
+from .expiry import async_get_expiry_manager
+from .extractors import build_extractor, parse_value_template
 
 _LOGGER = logging.getLogger(__name__)
 
-# Configuration validation schemas
-MQTT_SENSOR_SCHEMA = vol.Schema(
+# Configuration validation schemas; files loaded by __init__ are validated
+# with SENSOR_SCHEMA when their descriptors are built.
+MQTT_SENSOR_SCHEMA = SENSOR_SCHEMA.extend(
     {
-        vol.Required("platform"): cv.string,
-        vol.Required("state_topic"): cv.string,
-        vol.Required("name"): cv.string,
-        vol.Required("unique_id"): cv.string,
-        vol.Optional("device_class"): cv.string,
-        vol.Optional("state_class"): cv.string,
-        vol.Optional("unit_of_measurement"): cv.string,
         vol.Optional("value_template"): cv.template,
         vol.Optional("icon"): cv.icon,
-        vol.Optional("qos", default=0): vol.All(vol.Coerce(int), vol.In([0, 1, 2])),
-        vol.Optional("expire_after"): vol.All(vol.Coerce(int), vol.Range(min=1)),
-        vol.Optional("force_update", default=False): cv.boolean,
-        vol.Optional("availability_topic"): cv.string,
-        vol.Optional("payload_available", default="online"): cv.string,
-        vol.Optional("payload_not_available", default="offline"): cv.string,
-        vol.Optional("device"): vol.Schema(
-            {
-                vol.Optional("identifiers"): vol.All(cv.ensure_list, [cv.string]),
-                vol.Optional("name"): cv.string,
-                vol.Optional("manufacturer"): cv.string,
-                vol.Optional("model"): cv.string,
-            }
-        ),
-    }
+    },
+    extra=vol.PREVENT_EXTRA,
 )
 
 PLATFORM_SCHEMA = vol.Schema(
@@ -84,10 +65,12 @@ async def async_setup_platform(
     _LOGGER.info(f"Setting up RVC MQTT sensors")
     
     sensors = []
+    templates = {}
     
     # If we have discovery info, use it (from the __init__.py)
     if discovery_info is not None and "sensor" in discovery_info:
         conf = discovery_info.get("sensor", [])
+        templates = discovery_info.get("templates", {})
         _LOGGER.info(f"Setting up {len(conf)} sensors from discovery info")
     else:
         # Otherwise try to get it from config
@@ -107,9 +90,14 @@ async def async_setup_platform(
         force_update = sensor_conf.get(CONF_FORCE_UPDATE, False)
         qos = sensor_conf.get("qos", 0)
         expire_after = sensor_conf.get("expire_after")
+        deadband = sensor_conf.get("deadband", 0)
+        deadband_percent = sensor_conf.get("deadband_percent", 0)
+        heartbeat = sensor_conf.get("heartbeat", DEFAULT_HEARTBEAT)
+        min_publish_interval = sensor_conf.get("min_publish_interval", DEFAULT_MIN_PUBLISH_INTERVAL)
         
         # Process value template
         value_template = sensor_conf.get("value_template")
+        template_plan = templates.get(value_template) if isinstance(value_template, str) else None
         if value_template is not None:
             if isinstance(value_template, str):
                 # Convert string to Template object
@@ -150,9 +138,14 @@ async def async_setup_platform(
             state_class=state_class,
             unit_of_measurement=unit,
             value_template=value_template,
+            template_plan=template_plan,
             force_update=force_update,
             qos=qos,
             expire_after=expire_after,
+            deadband=deadband,
+            deadband_percent=deadband_percent,
+            heartbeat=heartbeat,
+            min_publish_interval=min_publish_interval,
             availability_topic=availability_topic,
             payload_available=payload_available,
             payload_not_available=payload_not_available,
@@ -187,9 +180,14 @@ class RvcMqttSensor(SensorEntity):
         state_class=None,
         unit_of_measurement=None,
         value_template=None,
+        template_plan=None,
         force_update=False,
         qos=0,
         expire_after=None,
+        deadband=0,
+        deadband_percent=0,
+        heartbeat=DEFAULT_HEARTBEAT,
+        min_publish_interval=DEFAULT_MIN_PUBLISH_INTERVAL,
         availability_topic=None,
         payload_available="online",
         payload_not_available="offline",
@@ -222,8 +220,17 @@ class RvcMqttSensor(SensorEntity):
         # Set unit of measurement
         self._attr_native_unit_of_measurement = unit_of_measurement
         
-        # Set up template
+        # Set up template, skipping Jinja for templates that are plain lookups
         self._template = value_template
+        if template_plan is None:
+            template_plan = parse_value_template(
+                getattr(value_template, "template", value_template)
+            )
+        self._extractor = build_extractor(template_plan) if template_plan else None
+        if value_template is not None and self._extractor is None:
+            _LOGGER.debug(f"Rendering full template for {name}")
+        # A broken template fails on every message; report it only once
+        self._template_error_logged = False
         
         # Set up availability
         self._attr_available = True
@@ -243,19 +250,25 @@ class RvcMqttSensor(SensorEntity):
         # MQTT subscription setup
         self._qos = qos
         self._expire_after = expire_after
-        self._expiration_trigger = None
+        self._expiry_slot = None
         self._topic = state_topic
         self._attr_should_poll = False
         
+        # Change-only state writes
+        self._changes = ChangeFilter(Deadband(deadband, deadband_percent), heartbeat)
+        self._min_publish_interval = min_publish_interval
+        self._throttle = None
+        
         # Subscribe to state topic
         self._mqtt_subscription = None
+        self._availability_subscription = None
 
     async def async_added_to_hass(self):
         """Subscribe to MQTT events."""
         
         @callback
-        def message_received(msg):
-            """Handle received MQTT message."""
+        def message_received(msg, value_json):
+            """Handle a received MQTT message, already JSON-parsed by the dispatcher."""
             try:
                 payload = msg.payload
                 _LOGGER.debug(f"Received MQTT message on {self._topic}: {payload}")
@@ -263,68 +276,85 @@ class RvcMqttSensor(SensorEntity):
                 # Try to process the payload
                 if self._template:
                     try:
-                        # Use async_render to account for potential complex templates
-                        rendered_value = self._template.async_render_with_possible_json_value(
-                            payload, ""
-                        )
+                        if self._extractor is not None:
+                            # Plain field lookup compiled from the template
+                            rendered_value = self._extractor(value_json)
+                        else:
+                            # Same variables async_render_with_possible_json_value
+                            # provides, without parsing the payload again
+                            variables = {"value": payload}
+                            if value_json is not None:
+                                variables["value_json"] = value_json
+                            rendered_value = self._template.async_render(
+                                variables, parse_result=False
+                            )
                         _LOGGER.debug(f"Template rendered value for {self._attr_name}: {rendered_value}")
                         
                         # Only update state if the template rendered to a non-empty value
                         if rendered_value not in (None, "", "None"):
                             self._state = rendered_value
                     except Exception as template_error:
-                        _LOGGER.error(f"Error rendering template for {self._attr_name}: {template_error}")
-                else:
-                    # If there's no template, try to handle different payload types appropriately
-                    try:
-                        # Try to parse as JSON if it's a valid JSON string
-                        payload_dict = json.loads(payload)
-                        # If it's a dictionary, we can't use it directly as a state
-                        if isinstance(payload_dict, dict):
-                            _LOGGER.warning(
-                                f"Received JSON object for {self._attr_name} but no template to extract a value"
-                            )
+                        if self._template_error_logged:
+                            _LOGGER.debug(f"Error rendering template for {self._attr_name}: {template_error}")
                         else:
-                            self._state = payload_dict
-                    except (json.JSONDecodeError, ValueError):
+                            self._template_error_logged = True
+                            _LOGGER.error(f"Error rendering template for {self._attr_name}: {template_error}")
+                else:
+                    # If there's no template, handle the different payload types
+                    if value_json is None:
                         # Not JSON or not valid JSON, use as a string
                         self._state = payload
+                    elif isinstance(value_json, dict):
+                        # If it's a dictionary, we can't use it directly as a state
+                        _LOGGER.warning(
+                            f"Received JSON object for {self._attr_name} but no template to extract a value"
+                        )
+                    else:
+                        self._state = value_json
                 
                 # Reset availability if we received a message
+                was_available = self._attr_available
                 self._attr_available = True
                 
-                # Set up expiration if configured
-                if self._expire_after:
-                    if self._expiration_trigger:
-                        self._expiration_trigger()
-                    self._expiration_trigger = async_track_point_in_time(
-                        self.hass,
-                        self._value_expires,
-                        dt_util.utcnow() + timedelta(seconds=self._expire_after),
-                    )
+                # Push back expiration if configured
+                if self._expiry_slot is not None:
+                    self._expiry.touch(self._expiry_slot)
                 
-                self.async_write_ha_state()
+                if self._should_write(was_available):
+                    # Coming back online is shown at once; values are coalesced
+                    self._throttle.request(immediate=not was_available)
             except Exception as e:
                 _LOGGER.error(f"Error processing MQTT message: {e}")
         
-        self._mqtt_subscription = await mqtt.async_subscribe(
-            self.hass, self._topic, message_received, self._qos
+        self._throttle = WriteThrottle(
+            self.hass.loop, self.async_write_ha_state, self._min_publish_interval
+        )
+        
+        # Expiry is checked in bulk by a manager shared by all sensors
+        if self._expire_after:
+            self._expiry = async_get_expiry_manager(self.hass)
+            self._expiry_slot = self._expiry.register(self._expire_after, self._value_expires)
+        
+        # One MQTT subscription per topic is shared by all sensors on it
+        dispatcher = async_get_dispatcher(self.hass)
+        self._mqtt_subscription = await dispatcher.async_subscribe(
+            self._topic, message_received, self._qos
         )
         
         # Set up availability subscription if configured
         if self._availability_topic:
             
             @callback
-            def availability_message_received(msg):
+            def availability_message_received(msg, value_json):
                 """Handle availability MQTT messages."""
                 if msg.payload == self._payload_available:
                     self._attr_available = True
                 elif msg.payload == self._payload_not_available:
                     self._attr_available = False
-                self.async_write_ha_state()
+                self._throttle.flush()
             
-            await mqtt.async_subscribe(
-                self.hass, self._availability_topic, availability_message_received, self._qos
+            self._availability_subscription = await dispatcher.async_subscribe(
+                self._availability_topic, availability_message_received, self._qos
             )
     
     async def async_will_remove_from_hass(self):
@@ -333,16 +363,31 @@ class RvcMqttSensor(SensorEntity):
             self._mqtt_subscription()
             self._mqtt_subscription = None
         
-        if self._expiration_trigger:
-            self._expiration_trigger()
-            self._expiration_trigger = None
+        if self._availability_subscription:
+            self._availability_subscription()
+            self._availability_subscription = None
+        
+        if self._expiry_slot is not None:
+            self._expiry.unregister(self._expiry_slot)
+            self._expiry_slot = None
+        
+        if self._throttle is not None:
+            self._throttle.cancel()
     
+    def _should_write(self, was_available):
+        """Return True if the new state is worth a state machine write.
+
+        Periodic RV-C status frames mostly repeat the last value, so only
+        changes beyond the deadband, recovered availability and the
+        heartbeat reach the state machine and recorder.
+        """
+        return self._changes.should_write(self._state, force=not was_available)
+
     @callback
-    def _value_expires(self, _):
+    def _value_expires(self):
         """Expire the value and make entity unavailable."""
-        self._expiration_trigger = None
         self._attr_available = False
-        self.async_write_ha_state()
+        self._throttle.flush()
     
     @property
     def native_value(self):
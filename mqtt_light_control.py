@@ -1,19 +1,13 @@
 #!/usr/bin/env python3
 import paho.mqtt.client as mqtt
-import json
 import time
-import logging
-from datetime import datetime
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/mqtt_commands.log'),
-        logging.StreamHandler()
-    ]
-)
+from rvc.encoder import Encoder
+from rvc.logsink import setup_logging
+
+# Commands are logged to logs/mqtt_commands.log as JSON lines by a background
+# thread, so logging stays out of the publish path
+LOG = setup_logging('logs/mqtt_commands.log', name='mqtt_light_control')
 
 # MQTT Broker settings
 BROKER = "100.110.189.122"
@@ -21,6 +15,9 @@ PORT = 9001
 USERNAME = "rc"
 PASSWORD = "rc"
 
+# Builds DC_DIMMER_COMMAND_2 payloads from rvc-spec.yml
+ENCODER = Encoder()
+
 # Light commands
 COMMAND_ON = 1
 COMMAND_OFF = 3
@@ -28,21 +25,14 @@ COMMAND_SET_BRIGHTNESS = 0
 COMMAND_RAMP_UP = 19
 COMMAND_RAMP_DOWN = 20
 
-# RVC specific settings
-DEFAULT_DATA = "2EFF6E13FF00FFFF"
-DEFAULT_DGN = "1FEDB"
-DEFAULT_GROUP = "11111111"
-DEFAULT_INTERLOCK = "00"
-DEFAULT_DELAY = 255
-
 def on_connect(client, userdata, flags, rc):
     if rc == 0:
-        logging.info("Successfully connected to MQTT broker")
+        LOG.info("Successfully connected to MQTT broker")
     else:
-        logging.error(f"Failed to connect, return code: {rc}")
+        LOG.error(f"Failed to connect, return code: {rc}")
 
 def on_publish(client, userdata, mid):
-    logging.info(f"Message {mid} published successfully")
+    LOG.info("Message published", extra={"data": {"mid": mid}})
 
 def on_disconnect(client, userdata, rc):
     if rc != 0:
@@ -66,150 +56,41 @@ def create_mqtt_client():
         print(f"\n✗ Error creating MQTT client: {e}")
         return None
 
-def turn_on_light(client, instance_id):
+def send_light_command(client, instance_id, command, level, action):
     try:
         topic = f"RVC/DC_DIMMER_COMMAND_2/{instance_id}"
-        payload = {
-            "command": 19,
-            "command definition": "ramp up",
-            "data": "2EFF6E13FF00FFFF",
-            "delay/duration": 255,
-            "desired level": 55,
-            "dgn": "1FEDB",
-            "group": "11111111",
+        fields = {
             "instance": instance_id,
+            "command": command,
+            "desired level": level,
             "interlock": "00",
-            "interlock definition": "no interlock active",
-            "name": "DC_DIMMER_COMMAND_2",
-            "timestamp": str(time.time())
         }
-        
-        # Convert to string for MQTT
-        payload_str = json.dumps(payload)
-        
-        # Log the command details
-        log_msg = f"""
-=== MQTT Command Details ===
-Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Action: Turn ON Light (Instance {instance_id})
-Broker: {BROKER}:{PORT}
-Topic: {topic}
-Payload: {json.dumps(payload, indent=2)}
-"""
-        logging.info(log_msg)
-        
-        # Convert to string and send
-        payload_str = json.dumps(payload)
-        result = client.publish(topic, payload_str)
-        result.wait_for_publish()
-        
-        if result.rc == 0:
-            logging.info(f"\n✓ Command successfully published to {topic}")
-        else:
-            logging.error(f"\n✗ Failed to publish command. Error code: {result.rc}")
-            
-    except Exception as e:
-        logging.error(f"\n✗ Error sending command: {e}")
-        
-        # Convert to string
-        payload_str = json.dumps(payload)
-        
-        print("\nSending command...")
-        
-        print(f"\nSending to broker: {BROKER}:{PORT}")
-        print(f"Topic: {topic}")
-        print(f"Payload: {json.dumps(payload, indent=2)}")
-        
+        payload_str = ENCODER.command_json("DC_DIMMER_COMMAND_2", fields)
+        LOG.info(
+            "Publishing command",
+            extra={"data": {"action": action, "topic": topic, "payload": payload_str}},
+        )
+
         result = client.publish(topic, payload_str)
         result.wait_for_publish()
-        
+
         if result.rc == 0:
-            print("\n✓ Command sent successfully!")
-            print(f"Message published to {topic}")
+            LOG.info(f"✓ Command successfully published to {topic}")
         else:
-            print(f"\n✗ Failed to send command. Error code: {result.rc}")
+            LOG.error(f"✗ Failed to publish command. Error code: {result.rc}")
     except Exception as e:
-        print(f"\n✗ Error sending command: {e}")
+        LOG.error(f"✗ Error sending command: {e}")
+
+def turn_on_light(client, instance_id):
+    send_light_command(client, instance_id, COMMAND_RAMP_UP, 55, "Turn ON Light")
 
 def turn_off_light(client, instance_id):
-    try:
-        topic = f"RVC/DC_DIMMER_COMMAND_2/{instance_id}"
-        payload = {
-            "command": 3,
-            "command definition": "off",
-            "data": "2EFF6E03FF00FFFF",
-            "delay/duration": 255,
-            "desired level": 55,
-            "dgn": "1FEDB",
-            "group": "11111111",
-            "instance": instance_id,
-            "interlock": "00",
-            "interlock definition": "no interlock active",
-            "name": "DC_DIMMER_COMMAND_2",
-            "timestamp": str(time.time())
-        }
-        payload_str = json.dumps(payload)
-        print(f"\n=== MQTT Command Details ===")
-        print(f"Topic: {topic}")
-        print(f"Payload: {payload_str}")
-        
-        print(f"\nSending to broker: {BROKER}:{PORT}")
-        print(f"Topic: {topic}")
-        print(f"Payload: {json.dumps(payload, indent=2)}")
-        
-        result = client.publish(topic, payload_str)
-        result.wait_for_publish()
-        
-        if result.rc == 0:
-            print("\n✓ Command sent successfully!")
-            print(f"Message published to {topic}")
-        else:
-            print(f"\n✗ Failed to send command. Error code: {result.rc}")
-    except Exception as e:
-        print(f"\n✗ Error sending command: {e}")
+    send_light_command(client, instance_id, COMMAND_OFF, 55, "Turn OFF Light")
 
 def set_brightness(client, instance_id, brightness):
-    try:
-        topic = f"RVC/DC_DIMMER_COMMAND_2/{instance_id}"
-        payload = {
-            "command": COMMAND_RAMP_UP,
-            "command definition": "ramp up",
-            "data": DEFAULT_DATA,
-            "delay/duration": DEFAULT_DELAY,
-            "desired level": brightness,
-            "dgn": DEFAULT_DGN,
-            "group": DEFAULT_GROUP,
-            "instance": instance_id,
-            "interlock": DEFAULT_INTERLOCK,
-            "interlock definition": "no interlock active",
-            "name": "DC_DIMMER_COMMAND_2",
-            "timestamp": str(time.time())
-        }
-        payload_str = json.dumps(payload)
-        print(f"\n=== MQTT Command Details ===")
-        print(f"Topic: {topic}")
-        print(f"Payload: {payload_str}")
-        
-        print(f"\nSending to broker: {BROKER}:{PORT}")
-        print(f"Topic: {topic}")
-        print(f"Payload: {json.dumps(payload, indent=2)}")
-        
-        result = client.publish(topic, payload_str)
-        result.wait_for_publish()
-        
-        if result.rc == 0:
-            print("\n✓ Command sent successfully!")
-            print(f"Message published to {topic}")
-        else:
-            print(f"\n✗ Failed to send command. Error code: {result.rc}")
-    except Exception as e:
-        print(f"\n✗ Error sending command: {e}")
+    send_light_command(client, instance_id, COMMAND_RAMP_UP, brightness, f"Set brightness to {brightness}%")
 
 def main():
-    # Clear the log file at startup
-    with open('logs/mqtt_commands.log', 'w') as f:
-        f.write('')
-        
     print("\n=== RVC Light Control System ===\n")
     client = create_mqtt_client()
     if not client:
@@ -0,0 +1,19 @@
+"""RV-C frame decoding and encoding compiled from ``rvc-spec.yml``."""
+from .cache import load_cached, load_cached_spec
+from .decoder import Decoder, parse_can_id, topic_for
+from .encoder import Encoder
+from .spec import DEFAULT_SPEC_PATH, DgnPlan, FieldPlan, compile_spec, load_spec
+
+__all__ = [
+    "DEFAULT_SPEC_PATH",
+    "Decoder",
+    "DgnPlan",
+    "Encoder",
+    "FieldPlan",
+    "compile_spec",
+    "load_cached",
+    "load_cached_spec",
+    "load_spec",
+    "parse_can_id",
+    "topic_for",
+]
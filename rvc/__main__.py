@@ -0,0 +1,6 @@
+"""Run the ``rvc`` command line: ``python -m rvc --help``."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,35 @@
+"""Binary cache of compiled spec plans.
+
+Parsing and compiling ``rvc-spec.yml`` takes noticeably long on
+Raspberry Pi-class hosts, so the compiled DGN table is pickled next to the
+spec and reused until the YAML contents change.  The hash-keyed cache
+itself lives in ``homeassistant/custom_components/rvc_common/cache.py``,
+shared with the RVC MQTT integration; this module re-exports it.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from .components import register_components
+from .spec import DEFAULT_SPEC_PATH, DgnPlan, compile_spec, read_spec_bytes
+
+register_components()
+
+from custom_components.rvc_common.cache import CACHE_SUFFIX, load_cached  # noqa: E402
+
+__all__ = ["CACHE_SUFFIX", "CACHE_VERSION", "load_cached", "load_cached_spec"]
+
+# Bump whenever the layout of the compiled plans changes.
+CACHE_VERSION = 1
+
+
+def load_cached_spec(
+    path: str = DEFAULT_SPEC_PATH, cache_path: Optional[str] = None
+) -> Dict[int, DgnPlan]:
+    """Load compiled plans for a spec file, compiling only on a cache miss."""
+    return load_cached(
+        path,
+        lambda raw: compile_spec(read_spec_bytes(raw)),
+        cache_path,
+        version=CACHE_VERSION,
+    )
@@ -0,0 +1,497 @@
+"""Send RV-C commands over one persistent MQTT connection.
+
+Run from the repository root::
+
+    python -m rvc --broker 100.110.189.122 daemon &
+    python -m rvc send light 46 on
+    python -m rvc send light 46 dim 50 ";" thermostat 0 mode=cool cool=75
+    python -m rvc batch scene.txt
+    producer | python -m rvc batch -
+
+``daemon`` connects to the broker once and takes commands, one per line,
+on a Unix socket.  ``send`` and ``batch`` hand their commands to the
+daemon when it is running and otherwise connect directly, so only the
+daemon, or a run without one, needs the broker options.  Either way the
+commands are pipelined: all are published at once and each reply is
+printed when its QoS acknowledgement arrives, in order, so a command
+returns after one broker round trip instead of fixed sleeps.
+
+Commands::
+
+    light INSTANCE on|off|toggle|bright|dim|stop [BRIGHTNESS]
+    dimmer INSTANCE COMMAND [LEVEL]
+    thermostat INSTANCE [mode=cool] [fan_mode=auto] [cool=75] ...
+    publish TOPIC PAYLOAD
+
+``light`` goes through the Node-RED bridge like ``rvc_light.sh``;
+``dimmer`` publishes a DC_DIMMER_COMMAND_2 and ``thermostat`` a
+THERMOSTAT_COMMAND_1.  Blank lines and lines starting with ``#`` are
+ignored.  Publishing needs paho-mqtt, like the other scripts in this
+repository.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import signal
+import socket
+import sys
+import threading
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Sequence, TextIO
+
+from .thermostat import command_payload, command_topic
+
+DEFAULT_BROKER = "localhost"
+DEFAULT_PORT = 1883
+DEFAULT_QOS = 1
+# Seconds to wait for the broker to accept the connection or a message.
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_SOCKET = "/tmp/rvc.sock"
+# Messages published before the oldest one's acknowledgement is awaited.
+MAX_IN_FLIGHT = 100
+
+LIGHT_TOPIC = "node-red/rvc/commands"
+DIMMER_TOPIC_PREFIX = "RVC/DC_DIMMER_COMMAND_2"
+
+# action -> (bridge command, brightness when none is given), as in rvc_light.sh
+LIGHT_ACTIONS = {
+    "on": (2, 100),
+    "off": (3, 0),
+    "toggle": (5, 100),
+    "bright": (19, 100),
+    "dim": (20, 100),
+    "stop": (0, 100),
+}
+THERMOSTAT_OPTIONS = {
+    "mode": str,
+    "fan_mode": str,
+    "schedule_mode": str,
+    "fan_speed": float,
+    "heat": float,
+    "cool": float,
+    "unit": str,
+}
+
+_encoder = None
+
+
+class Message(NamedTuple):
+    """One MQTT publish."""
+
+    topic: str
+    payload: str
+
+
+def _int(text: str, name: str) -> int:
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, not {text!r}") from None
+
+
+def _dimmer_encoder():
+    # Loading the spec takes a moment; light-only runs never need it.
+    global _encoder
+    if _encoder is None:
+        from .encoder import Encoder
+
+        _encoder = Encoder()
+    return _encoder
+
+
+def parse_command(line: str) -> Message:
+    """Turn one command line into the message it publishes."""
+    words = shlex.split(line)
+    if not words:
+        raise ValueError("empty command")
+    kind, args = words[0].lower(), words[1:]
+
+    if kind == "light":
+        if len(args) not in (2, 3):
+            raise ValueError("usage: light INSTANCE ACTION [BRIGHTNESS]")
+        instance = _int(args[0], "instance")
+        action = args[1].lower()
+        if action not in LIGHT_ACTIONS:
+            raise ValueError(f"unknown light action {action!r}")
+        command, brightness = LIGHT_ACTIONS[action]
+        if len(args) == 3 and action not in ("off", "toggle"):
+            brightness = _int(args[2], "brightness")
+            if action == "dim":
+                command = 19  # dim to a level rather than ramp down
+        return Message(LIGHT_TOPIC, f"{instance} {command} {brightness}")
+
+    if kind == "dimmer":
+        if len(args) not in (2, 3):
+            raise ValueError("usage: dimmer INSTANCE COMMAND [LEVEL]")
+        instance = _int(args[0], "instance")
+        command: Any = int(args[1]) if args[1].isdigit() else args[1]
+        fields = {"instance": instance, "command": command, "interlock": "00"}
+        if len(args) == 3:
+            fields["desired level"] = _int(args[2], "level")
+        payload = _dimmer_encoder().command_json("DC_DIMMER_COMMAND_2", fields)
+        return Message(f"{DIMMER_TOPIC_PREFIX}/{instance}", payload)
+
+    if kind == "thermostat":
+        if not args:
+            raise ValueError("usage: thermostat INSTANCE [NAME=VALUE ...]")
+        instance = _int(args[0], "instance")
+        options = {}
+        for arg in args[1:]:
+            name, _, value = arg.partition("=")
+            convert = THERMOSTAT_OPTIONS.get(name)
+            if convert is None or not value:
+                raise ValueError(f"unknown thermostat option {arg!r}")
+            options[name] = convert(value)
+        payload = command_payload(instance, **options)
+        return Message(command_topic(instance), json.dumps(payload, separators=(",", ":")))
+
+    if kind == "publish":
+        if len(args) < 2:
+            raise ValueError("usage: publish TOPIC PAYLOAD")
+        return Message(args[0], " ".join(args[1:]))
+
+    raise ValueError(f"unknown command {kind!r}")
+
+
+def command_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Yield the commands in ``lines``, skipping blanks and comments."""
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+class MqttConnection:
+    """A broker connection that publishes with QoS and waits for the ack."""
+
+    def __init__(
+        self,
+        broker: str = DEFAULT_BROKER,
+        port: int = DEFAULT_PORT,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        transport: str = "tcp",
+        qos: int = DEFAULT_QOS,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        """Initialize; nothing is connected until ``connect``."""
+        self.broker = broker
+        self.port = port
+        self._username = username
+        self._password = password
+        self._transport = transport
+        self._qos = qos
+        self.timeout = timeout
+        self._client = None
+        self._connack = threading.Event()
+        self._connect_rc: Optional[int] = None
+
+    def connect(self) -> None:
+        """Connect and return once the broker has accepted the connection."""
+        import paho.mqtt.client as mqtt
+
+        client = mqtt.Client(transport=self._transport)
+        if self._username and self._password:
+            client.username_pw_set(self._username, self._password)
+        client.max_inflight_messages_set(MAX_IN_FLIGHT)
+        client.on_connect = self._on_connect
+        client.connect(self.broker, self.port, 60)
+        # The network thread also reconnects after a dropped connection.
+        client.loop_start()
+        self._client = client
+        if not self._connack.wait(self.timeout):
+            self.close()
+            raise ConnectionError(f"No answer from {self.broker}:{self.port}")
+        if self._connect_rc:
+            self.close()
+            raise ConnectionError(
+                f"Broker {self.broker}:{self.port} refused the connection: {self._connect_rc}"
+            )
+
+    def _on_connect(self, client, userdata, flags, rc, *args) -> None:
+        self._connect_rc = rc
+        self._connack.set()
+
+    def publish(self, message: Message):
+        """Publish without waiting; returns the handle ``wait`` takes."""
+        if self._client is None:
+            raise ConnectionError("Not connected")
+        info = self._client.publish(message.topic, message.payload, qos=self._qos)
+        if info.rc != 0:
+            raise ConnectionError(f"Publish to {message.topic} failed: {info.rc}")
+        return info
+
+    def acknowledged(self, info) -> bool:
+        """Return True once the broker acknowledged a message."""
+        return info.is_published()
+
+    def wait(self, info) -> None:
+        """Block until the broker acknowledged a message."""
+        info.wait_for_publish(self.timeout)
+        if not info.is_published():
+            raise TimeoutError(f"No acknowledgement within {self.timeout} s")
+
+    def close(self) -> None:
+        """Disconnect."""
+        if self._client is not None:
+            self._client.disconnect()
+            self._client.loop_stop()
+            self._client = None
+
+    def __enter__(self) -> "MqttConnection":
+        self.connect()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _ok(message: Message) -> str:
+    return f"ok {message.topic}"
+
+
+def _error(line: str, e: Exception) -> str:
+    return f"error {line}: {e}"
+
+
+def pipeline(connection, lines: Iterable[str], reply: Callable[[str], None]) -> int:
+    """Publish every command, replying in order as acks arrive; returns the error count.
+
+    Up to MAX_IN_FLIGHT messages are published before the oldest one's
+    acknowledgement is awaited, so a long stream never waits per message;
+    replies for messages already acknowledged are given right away.
+    """
+    in_flight: "deque[tuple]" = deque()
+    errors = 0
+
+    def settle() -> None:
+        nonlocal errors
+        line, message, info, failure = in_flight.popleft()
+        if failure is None:
+            try:
+                connection.wait(info)
+            except Exception as e:
+                failure = e
+        if failure is None:
+            reply(_ok(message))
+        else:
+            errors += 1
+            reply(_error(line, failure))
+
+    for line in command_lines(lines):
+        message = info = failure = None
+        try:
+            message = parse_command(line)
+            info = connection.publish(message)
+        except Exception as e:
+            failure = e
+        in_flight.append((line, message, info, failure))
+        if len(in_flight) >= MAX_IN_FLIGHT:
+            settle()
+        while in_flight and (in_flight[0][3] is not None or connection.acknowledged(in_flight[0][2])):
+            settle()
+    while in_flight:
+        settle()
+    return errors
+
+
+class Daemon:
+    """Take commands on a Unix socket and publish them on one connection.
+
+    Each client connection gets one reply line per command, in order, as
+    soon as that command is acknowledged; commands from one client are
+    published without waiting for earlier replies.
+    """
+
+    def __init__(self, connection, path: str = DEFAULT_SOCKET) -> None:
+        """Initialize around a connected MqttConnection."""
+        self._connection = connection
+        self.path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Listen on the socket, replacing a stale one.
+
+        The socket is created readable and writable by its owner only, so
+        other local users cannot publish through the daemon.
+        """
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        umask = os.umask(0o077)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        finally:
+            os.umask(umask)
+        os.chmod(self.path, 0o600)
+
+    async def serve_forever(self) -> None:
+        """Start and serve until cancelled."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Stop listening and remove the socket."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    async def _execute(self, line: str) -> str:
+        try:
+            message = parse_command(line)
+            info = self._connection.publish(message)
+            await asyncio.get_running_loop().run_in_executor(None, self._connection.wait, info)
+        except Exception as e:
+            return _error(line, e)
+        return _ok(message)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        replies: "asyncio.Queue[Optional[asyncio.Task]]" = asyncio.Queue()
+
+        async def respond() -> None:
+            while True:
+                task = await replies.get()
+                if task is None:
+                    return
+                writer.write((await task + "\n").encode())
+                await writer.drain()
+
+        responder = asyncio.get_running_loop().create_task(respond())
+        try:
+            while True:
+                data = await reader.readline()
+                if not data:
+                    break
+                for line in command_lines([data.decode(errors="replace")]):
+                    replies.put_nowait(asyncio.get_running_loop().create_task(self._execute(line)))
+            replies.put_nowait(None)
+            await responder
+        finally:
+            responder.cancel()
+            writer.close()
+
+
+def send_to_daemon(path: str, lines: Iterable[str], reply: Callable[[str], None]) -> int:
+    """Stream commands to a running daemon; returns the error count.
+
+    Replies are read on a second thread while commands are still being
+    written, so an endless stdin stream is pipelined too.
+    """
+    errors = 0
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+
+        def read_replies() -> None:
+            nonlocal errors
+            with sock.makefile("r") as replies:
+                for text in replies:
+                    text = text.rstrip("\n")
+                    if not text.startswith("ok "):
+                        errors += 1
+                    reply(text)
+
+        reader = threading.Thread(target=read_replies)
+        reader.start()
+        try:
+            for line in command_lines(lines):
+                sock.sendall(f"{line}\n".encode())
+        finally:
+            sock.shutdown(socket.SHUT_WR)
+            reader.join()
+    return errors
+
+
+def split_commands(words: Sequence[str]) -> Iterator[str]:
+    """Split ``send`` arguments into commands at ";" words."""
+    command = []
+    for word in words:
+        if word == ";":
+            if command:
+                yield shlex.join(command)
+            command = []
+        else:
+            command.append(word)
+    if command:
+        yield shlex.join(command)
+
+
+def _print(text: str, stream: TextIO = sys.stdout) -> None:
+    print(text, file=stream, flush=True)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="rvc",
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__[__doc__.index("Commands::"):],
+    )
+    parser.add_argument("--broker", default=DEFAULT_BROKER)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--transport", choices=["tcp", "websockets"], default="tcp")
+    parser.add_argument("--qos", type=int, choices=[1, 2], default=DEFAULT_QOS)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="daemon socket path")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+    subparsers.add_parser("daemon", help="hold the connection and serve the socket")
+    send = subparsers.add_parser("send", help="send commands separated by ';'")
+    send.add_argument("words", nargs="+")
+    batch = subparsers.add_parser("batch", help="send the commands in a file, '-' for stdin")
+    batch.add_argument("file")
+    args = parser.parse_args(argv)
+
+    connection = MqttConnection(
+        args.broker, args.port, args.username, args.password, args.transport, args.qos, args.timeout
+    )
+
+    if args.mode == "daemon":
+        connection.connect()
+        daemon = Daemon(connection, args.socket)
+
+        async def serve() -> None:
+            loop = asyncio.get_running_loop()
+            loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+            await daemon.serve_forever()
+
+        _print(f"Connected to {args.broker}:{args.port}, listening on {args.socket}")
+        try:
+            asyncio.run(serve())
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass
+        finally:
+            connection.close()
+        return 0
+
+    if args.mode == "send":
+        lines: Iterable[str] = split_commands(args.words)
+    elif args.file == "-":
+        lines = sys.stdin
+    else:
+        lines = open(args.file)
+
+    try:
+        try:
+            errors = send_to_daemon(args.socket, lines, _print)
+        except (FileNotFoundError, ConnectionRefusedError):
+            # No daemon, or a stale socket left by one that was killed.
+            with connection:
+                errors = pipeline(connection, lines, _print)
+    finally:
+        if args.mode == "batch" and args.file != "-":
+            lines.close()
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
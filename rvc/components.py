@@ -0,0 +1,43 @@
+"""Import the Home Assistant custom components' standalone modules.
+
+The packages under ``homeassistant/custom_components`` import Home
+Assistant in their ``__init__``, but most of their modules do not.
+``register_components`` installs ``custom_components`` and each component
+as bare packages, without running those ``__init__`` files, so the tests,
+benchmarks and ``rvc.thermostat`` can import the standalone modules directly::
+
+    register_components()
+    from custom_components.rvc_mqtt import descriptors
+
+Packages without a ``manifest.json``, which Home Assistant does not load
+as integrations, are imported normally.
+"""
+import importlib
+import sys
+import types
+from pathlib import Path
+
+COMPONENTS_DIR = Path(__file__).resolve().parent.parent / "homeassistant" / "custom_components"
+PACKAGE = "custom_components"
+
+
+def register_components() -> None:
+    """Register the component packages; calling it again does nothing."""
+    root = sys.modules.get(PACKAGE)
+    if root is not None and list(getattr(root, "__path__", [])) == [str(COMPONENTS_DIR)]:
+        return
+    root = types.ModuleType(PACKAGE)
+    root.__path__ = [str(COMPONENTS_DIR)]
+    sys.modules[PACKAGE] = root
+    for path in sorted(COMPONENTS_DIR.iterdir()):
+        if (path / "manifest.json").is_file():
+            package = types.ModuleType(f"{PACKAGE}.{path.name}")
+            package.__path__ = [str(path)]
+            sys.modules[package.__name__] = package
+            setattr(root, path.name, package)
+
+
+def load_component_module(component: str, module: str) -> types.ModuleType:
+    """Import one module of a custom component without its ``__init__``."""
+    register_components()
+    return importlib.import_module(f"{PACKAGE}.{component}.{module}")
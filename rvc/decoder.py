@@ -0,0 +1,140 @@
+"""Decode raw RV-C CAN frames into bridge-compatible records."""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+
+from .cache import load_cached_spec
+from .spec import (
+    DEFAULT_SPEC_PATH,
+    KIND_ASCII,
+    KIND_BITS,
+    KIND_SCALED,
+    KIND_TABLE,
+    KIND_UINT,
+    NOT_AVAILABLE,
+    DgnPlan,
+    celsius_to_fahrenheit,
+)
+
+TOPIC_PREFIX = "RVC"
+
+
+def parse_can_id(can_id: int) -> Tuple[int, int, int]:
+    """Split a 29-bit RV-C identifier into (priority, dgn, source address)."""
+    return (can_id >> 26) & 0x7, (can_id >> 8) & 0x1FFFF, can_id & 0xFF
+
+
+def topic_for(record: Dict[str, Any], prefix: str = TOPIC_PREFIX) -> str:
+    """Return the MQTT topic the bridge publishes a decoded record on."""
+    if "instance" in record:
+        return f"{prefix}/{record['name']}/{record['instance']}"
+    return f"{prefix}/{record['name']}"
+
+
+def resolve_plan(plans: Dict[int, DgnPlan], dgn: int) -> Optional[DgnPlan]:
+    """Return the plan for a DGN.
+
+    PDU1 DGNs (PF below 0xF0) carry the destination address in their
+    low byte, so fall back to the spec entry registered with ``00``.
+    """
+    plan = plans.get(dgn)
+    if plan is None and (dgn >> 8) & 0xFF < 0xF0:
+        plan = plans.get(dgn & 0x1FF00)
+    return plan
+
+
+class Decoder:
+    """Decode RV-C frames with plans compiled from the spec.
+
+    Decoding is one dictionary lookup for the DGN followed by a fixed
+    shift/mask per field; the YAML is never consulted after construction.
+    """
+
+    def __init__(self, plans: Optional[Dict[int, DgnPlan]] = None) -> None:
+        """Initialize the decoder, loading the bundled spec if needed."""
+        self._plans = plans if plans is not None else load_cached_spec()
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_SPEC_PATH) -> "Decoder":
+        """Create a decoder from a spec file via the compiled plan cache."""
+        return cls(load_cached_spec(path))
+
+    @property
+    def plans(self) -> Dict[int, DgnPlan]:
+        """Return the compiled plans keyed by numeric DGN."""
+        return self._plans
+
+    def plan_for(self, dgn: int) -> Optional[DgnPlan]:
+        """Return the plan for a DGN, resolving PDU1 destinations."""
+        return resolve_plan(self._plans, dgn)
+
+    def decode(
+        self, can_id: int, data: bytes, timestamp: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Decode one frame into a record keyed by spec field names."""
+        dgn = (can_id >> 8) & 0x1FFFF
+        plan = self._plans.get(dgn)
+        if plan is None:
+            plan = resolve_plan(self._plans, dgn)
+        return self.decode_dgn(dgn, plan, data, timestamp)
+
+    def decode_dgn(
+        self,
+        dgn: int,
+        plan: Optional[DgnPlan],
+        data: bytes,
+        timestamp: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Decode a frame payload against an already resolved plan."""
+        if plan is None:
+            record = {"dgn": f"{dgn:05X}", "name": f"UNKNOWN-{dgn:05X}"}
+            record["data"] = data.hex().upper()
+            if timestamp is not None:
+                record["timestamp"] = timestamp
+            return record
+
+        record = {"dgn": plan.dgn_hex, "name": plan.name, "data": data.hex().upper()}
+        if timestamp is not None:
+            record["timestamp"] = timestamp
+        if not plan.fields:
+            record["DECODER PENDING"] = 1
+            return record
+
+        word = int.from_bytes(data, "little")
+        length = len(data)
+        for (
+            name,
+            shift,
+            mask,
+            kind,
+            need,
+            conversion,
+            definitions,
+            fahrenheit,
+        ) in plan.fields:
+            if need > length:
+                continue
+            raw = (word >> shift) & mask
+            if kind == KIND_UINT:
+                value = raw
+            elif kind == KIND_TABLE or kind == KIND_BITS:
+                value = conversion[raw]
+            elif kind == KIND_SCALED:
+                if raw == mask:
+                    value = NOT_AVAILABLE
+                else:
+                    scale, offset, ndigits = conversion
+                    value = round(raw * scale + offset, ndigits)
+            elif kind == KIND_ASCII:
+                value = raw.to_bytes(conversion, "little").decode("latin-1")
+                value = value.rstrip("\x00\xff")
+            else:
+                continue
+
+            record[name] = value
+            if definitions is not None:
+                key, texts = definitions
+                record[key] = texts.get(raw, "undefined")
+            if fahrenheit is not None:
+                record[fahrenheit] = celsius_to_fahrenheit(value)
+        return record
@@ -0,0 +1,218 @@
+"""Buffered JSON-lines logging for the debug and command scripts.
+
+The scripts used to open and append to their log file for every line,
+with multi-line pretty-printed payloads written in the publish path.
+``BufferedLogSink`` is a logging handler whose ``emit`` only puts the
+record on a queue; a background thread formats records as compact
+single-line JSON and writes them in batches, at most once per
+``flush_interval`` while records keep arriving, and rotates the file when
+it grows past ``max_bytes``::
+
+    log = setup_logging("debug_mqtt.log")
+    log.info("Publishing", extra={"data": {"topic": topic, "payload": payload}})
+
+Fields passed as ``data`` become keys of the JSON line.  When the queue
+is full, records are dropped rather than blocking the caller, and the
+number dropped is logged once there is room again.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, BinaryIO, Dict, List, Optional
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+# Seconds records are collected before they are written together.
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_QUEUE_SIZE = 10000
+CONSOLE_FORMAT = "[%(asctime)s] %(message)s"
+
+_STOP = object()
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as one compact JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Return the JSON line, without the newline."""
+        line: Dict[str, Any] = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        data = getattr(record, "data", None)
+        if data:
+            line.update(data)
+        if record.exc_info:
+            line["exception"] = self.formatException(record.exc_info)
+        return json.dumps(line, separators=(",", ":"), default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Format a record as a timestamped line followed by its data, if any."""
+
+    def __init__(self) -> None:
+        """Initialize with the console layout."""
+        super().__init__(CONSOLE_FORMAT, "%Y-%m-%d %H:%M:%S")
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Return the console line."""
+        text = super().format(record)
+        data = getattr(record, "data", None)
+        if data:
+            text += " " + json.dumps(data, separators=(",", ":"), default=str)
+        return text
+
+
+class BufferedLogSink(logging.Handler):
+    """Write records from a background thread in batches, rotating by size."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        """Initialize the sink and start its writer thread."""
+        super().__init__()
+        self.setFormatter(JsonFormatter())
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.batches = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(queue_size)
+        self._file: Optional[BinaryIO] = None
+        self._size = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="rvc-log-sink", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue a record; never blocks."""
+        # Resolve the message now; args may change before the writer runs.
+        record.msg = record.getMessage()
+        record.args = None
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        """Write everything queued, stop the thread and close the file."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+            self._thread.join()
+        super().close()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Any] = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not _STOP and len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if batch[-1] is _STOP:
+                batch.pop()
+                stopping = True
+            self._write(batch)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, records: List[logging.LogRecord]) -> None:
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.format(record) + "\n")
+            except Exception:
+                self.handleError(record)
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            notice = logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Dropped {dropped} records, the log queue was full",
+            })
+            lines.append(self.format(notice) + "\n")
+        if not lines:
+            return
+        data = "".join(lines).encode("utf-8")
+        try:
+            if self._file is None:
+                self._open()
+            elif self._size and self._size + len(data) > self.max_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+            self.batches += 1
+        except OSError as e:
+            print(f"Cannot write {self.path}: {e}", file=sys.stderr)
+
+    def _open(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+            self._file = open(self.path, "ab")
+        else:
+            self._file = open(self.path, "wb")
+        self._size = 0
+
+
+def setup_logging(
+    path: str,
+    name: Optional[str] = None,
+    level: int = logging.INFO,
+    console: bool = True,
+    **sink_options: Any,
+) -> logging.Logger:
+    """Return a logger writing to a BufferedLogSink and, optionally, the console.
+
+    The logger is named after the log file unless ``name`` is given, and
+    the sink is flushed and closed when the interpreter exits.
+    """
+    logger = logging.getLogger(name or os.path.splitext(os.path.basename(path))[0])
+    logger.setLevel(level)
+    logger.propagate = False
+    sink = BufferedLogSink(path, **sink_options)
+    logger.addHandler(sink)
+    atexit.register(sink.close)
+    if console:
+        stream = logging.StreamHandler()
+        stream.setFormatter(ConsoleFormatter())
+        logger.addHandler(stream)
+    return logger
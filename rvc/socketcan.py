@@ -0,0 +1,185 @@
+"""Asyncio reader for raw RV-C frames on a Linux SocketCAN interface.
+
+Frames are read straight off the bus, decoded with the compiled spec and
+handed to subscribers as records, without a CAN-to-MQTT bridge in between::
+
+    reader = CanReader("can0")
+    reader.subscribe(print, "DC_DIMMER_STATUS_3")
+    await reader.run()
+
+The socket is non-blocking and registered with the event loop; each time it
+becomes readable up to ``batch_size`` frames are drained into a
+preallocated buffer, decoded, and dispatched before control returns to the
+loop.  Multi-packet (TP.CM/TP.DT) transfers are reassembled first and
+delivered as a single record.  A virtual interface works the same as
+hardware::
+
+    sudo ip link add dev vcan0 type vcan && sudo ip link set up vcan0
+    cansend vcan0 19FEDA96#2E7C40FCFF0504FF
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import struct
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .decoder import Decoder
+from .transport import TP_CM_PF, TP_DT_PF, Reassembler
+
+_LOGGER = logging.getLogger(__name__)
+
+# struct can_frame from <linux/can.h>: id, dlc, 3 pad bytes, 8 data bytes.
+CAN_FRAME = struct.Struct("=IB3x8s")
+CAN_EFF_FLAG = 0x80000000
+CAN_RTR_FLAG = 0x40000000
+CAN_ERR_FLAG = 0x20000000
+CAN_EFF_MASK = 0x1FFFFFFF
+DEFAULT_BATCH_SIZE = 64
+
+Record = Dict[str, Any]
+Subscriber = Callable[[Record], None]
+
+
+def open_can_socket(interface: str) -> socket.socket:
+    """Open a non-blocking raw CAN socket bound to an interface."""
+    sock = socket.socket(socket.AF_CAN, socket.SOCK_RAW, socket.CAN_RAW)
+    try:
+        sock.bind((interface,))
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def pack_frame(can_id: int, data: bytes) -> bytes:
+    """Pack an extended (29-bit) RV-C frame into a struct can_frame."""
+    return CAN_FRAME.pack(
+        (can_id & CAN_EFF_MASK) | CAN_EFF_FLAG, len(data), data.ljust(8, b"\x00")
+    )
+
+
+class CanReader:
+    """Read, decode and dispatch RV-C frames from a SocketCAN interface."""
+
+    def __init__(
+        self,
+        interface: str = "can0",
+        decoder: Optional[Decoder] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        sock: Optional[socket.socket] = None,
+        transport: Optional[Reassembler] = None,
+    ) -> None:
+        """Initialize the reader; ``sock`` overrides opening ``interface``."""
+        self.interface = interface
+        self._decoder = decoder if decoder is not None else Decoder()
+        self._transport = transport if transport is not None else Reassembler()
+        self._batch_size = batch_size
+        self._sock = sock
+        self._buffer = bytearray(CAN_FRAME.size * batch_size)
+        self._views = [
+            memoryview(self._buffer)[i * CAN_FRAME.size : (i + 1) * CAN_FRAME.size]
+            for i in range(batch_size)
+        ]
+        self._all: List[Subscriber] = []
+        self._by_name: Dict[str, List[Subscriber]] = {}
+        self._stopped: Optional[asyncio.Future] = None
+        self.frames = 0
+        self.dropped = 0
+
+    def subscribe(
+        self, callback: Subscriber, name: Optional[str] = None
+    ) -> Callable[[], None]:
+        """Call ``callback`` with each decoded record, or only those of one DGN.
+
+        Returns a function that removes the subscription.
+        """
+        callbacks = self._all if name is None else self._by_name.setdefault(name, [])
+        callbacks.append(callback)
+
+        def unsubscribe() -> None:
+            callbacks.remove(callback)
+
+        return unsubscribe
+
+    async def run(self) -> None:
+        """Read frames until :meth:`stop` is called or the socket fails."""
+        loop = asyncio.get_running_loop()
+        if self._sock is None:
+            self._sock = open_can_socket(self.interface)
+        sock = self._sock
+        self._stopped = loop.create_future()
+        loop.add_reader(sock.fileno(), self._on_readable)
+        _LOGGER.info(f"Reading RV-C frames from {self.interface}")
+        try:
+            await self._stopped
+        finally:
+            loop.remove_reader(sock.fileno())
+            sock.close()
+            self._sock = None
+            self._stopped = None
+
+    def stop(self) -> None:
+        """Stop a running reader."""
+        if self._stopped is not None and not self._stopped.done():
+            self._stopped.set_result(None)
+
+    async def send(self, can_id: int, data: bytes) -> None:
+        """Transmit one frame on the interface the reader is bound to."""
+        if self._sock is None:
+            raise RuntimeError("CanReader is not running")
+        await asyncio.get_running_loop().sock_sendall(
+            self._sock, pack_frame(can_id, data)
+        )
+
+    def _on_readable(self) -> None:
+        """Drain up to one batch of frames, then decode and dispatch them."""
+        sock = self._sock
+        count = 0
+        try:
+            for _ in range(self._batch_size):
+                if sock.recv_into(self._views[count]) < CAN_FRAME.size:
+                    self.dropped += 1
+                    continue
+                count += 1
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            _LOGGER.error(f"Error reading from {self.interface}: {e}")
+            if self._stopped is not None and not self._stopped.done():
+                self._stopped.set_exception(e)
+            return
+        if count:
+            self._dispatch(count)
+
+    def _dispatch(self, count: int) -> None:
+        timestamp = time.time()
+        now = time.monotonic()
+        decode = self._decoder.decode
+        transport = self._transport
+        for can_id, length, data in CAN_FRAME.iter_unpack(
+            memoryview(self._buffer)[: count * CAN_FRAME.size]
+        ):
+            if not can_id & CAN_EFF_FLAG or can_id & (CAN_RTR_FLAG | CAN_ERR_FLAG):
+                # RV-C only uses 29-bit data frames.
+                self.dropped += 1
+                continue
+            self.frames += 1
+            can_id &= CAN_EFF_MASK
+            data = data[: min(length, 8)]
+            if (can_id >> 16) & 0xFF in (TP_CM_PF, TP_DT_PF):
+                # Multi-packet DGNs are decoded once reassembled.
+                message = transport.feed(can_id, data, now)
+                if message is None:
+                    continue
+                can_id, data = message
+            record = decode(can_id, data, timestamp)
+            callbacks = self._by_name.get(record["name"])
+            for callback in (*callbacks, *self._all) if callbacks else self._all:
+                try:
+                    callback(record)
+                except Exception:
+                    _LOGGER.exception(f"Error in subscriber for {record['name']}")
@@ -0,0 +1,273 @@
+"""Compile ``rvc-spec.yml`` into per-DGN extraction plans.
+
+The YAML describes each parameter as a byte range (little-endian), an
+optional bit span inside that range, a type and an optional unit.  Walking
+that structure for every frame is far too slow for a saturated coach bus, so
+it is compiled once into flat tuples: every field becomes a shift and a mask
+against the frame read as one little-endian integer, plus a precomputed
+conversion (lookup table for 8-bit fields, scale/offset for wider ones).
+
+The spec itself carries no explicit scale or offset; those come from the
+RV-C standard data types keyed by unit and type (e.g. ``uint16`` + ``Deg C``
+is 0.03125 degC per bit with a -273 offset), mirroring the conversions the
+rvc2mqtt bridge applies so decoded records keep the same field names and
+values the MQTT sensors already consume.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import yaml
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SPEC_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rvc-spec.yml"
+)
+
+# Field kinds
+KIND_UINT = 0  # raw unsigned integer
+KIND_BITS = 1  # bit string ("01"), as published by the bridge
+KIND_TABLE = 2  # 8-bit field converted through a 256-entry lookup table
+KIND_SCALED = 3  # wide field: raw * scale + offset, "n/a" when all ones
+KIND_ASCII = 4  # text packed into the byte range
+
+NOT_AVAILABLE = "n/a"
+
+
+class FieldPlan(NamedTuple):
+    """Precomputed extraction for a single spec parameter."""
+
+    name: str
+    shift: int
+    mask: int
+    kind: int
+    # Minimum frame length in bytes needed to extract the field.
+    need: int
+    # KIND_TABLE/KIND_BITS: tuple indexed by the raw value.
+    # KIND_SCALED: (scale, offset, ndigits).
+    conversion: Any
+    # ("<name> definition", {raw value: text}), or None.
+    definitions: Optional[Tuple[str, Dict[int, Any]]]
+    # Name of the companion Fahrenheit key for temperatures, or None.
+    fahrenheit: Optional[str]
+
+
+class DgnPlan(NamedTuple):
+    """All field plans for one DGN."""
+
+    dgn: int
+    dgn_hex: str
+    name: str
+    fields: Tuple[FieldPlan, ...]
+
+
+def _parse_range(value: Any) -> Tuple[int, int]:
+    """Parse ``3`` or ``"2-5"`` into an inclusive (low, high) tuple."""
+    if isinstance(value, int):
+        return value, value
+    low, _, high = str(value).partition("-")
+    return int(low), int(high or low)
+
+
+def celsius_to_fahrenheit(value: Any) -> Any:
+    """Convert a decoded Celsius value, passing "n/a" through."""
+    if value == NOT_AVAILABLE:
+        return NOT_AVAILABLE
+    return round(value * 9 / 5 + 32, 1)
+
+
+def _pct(raw: int) -> Any:
+    if raw == 0xFF:
+        return NOT_AVAILABLE
+    value = raw / 2
+    return int(value) if value.is_integer() else value
+
+
+def _seconds8(raw: int) -> Any:
+    # 241-250 encode whole minutes (5..14) per the RV-C time data type.
+    if 240 < raw < 251:
+        return (raw - 240 + 4) * 60
+    return raw
+
+
+def _na_if_max(func):
+    def convert(raw: int) -> Any:
+        return NOT_AVAILABLE if raw == 0xFF else func(raw)
+
+    return convert
+
+
+# 8-bit conversions, materialised into 256-entry tables at compile time.
+_UINT8_CONVERSIONS = {
+    "pct": _pct,
+    "deg c": _na_if_max(lambda raw: raw - 40),
+    "v": _na_if_max(lambda raw: raw),
+    "sec": _seconds8,
+    "bitmap": lambda raw: format(raw, "08b"),
+}
+
+# (unit, bits) -> (scale, offset, ndigits) for fields wider than a byte.
+_SCALED_CONVERSIONS = {
+    ("deg c", 16): (0.03125, -273, 1),
+    ("v", 16): (0.05, 0, 2),
+    ("a", 16): (0.05, -1600, 2),
+    ("a", 32): (0.001, -2000000, 3),
+    ("hz", 16): (1 / 128, 0, 2),
+    ("sec", 16): (2, 0, None),
+}
+
+
+def _yaml_int(text: str) -> int:
+    """Return the integer YAML 1.1 resolves an unquoted digit string to."""
+    if len(text) > 1 and text[0] == "0":
+        return int(text, 8)
+    return int(text)
+
+
+def _type_kind(param_type: Optional[str], has_bits: bool) -> str:
+    """Classify a spec type as "bits", "ascii" or "uint"."""
+    if param_type == "ascii":
+        return "ascii"
+    if param_type is None:
+        return "bits" if has_bits else "uint"
+    return "bits" if param_type.startswith("bit") else "uint"
+
+
+def _compile_field(param: Dict[str, Any]) -> Optional[FieldPlan]:
+    """Compile one spec parameter, or return None if it cannot be placed."""
+    name = param.get("name")
+    if "byte" not in param:
+        return None
+
+    low_byte, high_byte = _parse_range(param["byte"])
+    shift = low_byte * 8
+    width = (high_byte - low_byte + 1) * 8
+    if "bit" in param:
+        low_bit, high_bit = _parse_range(param["bit"])
+        shift += low_bit
+        width = high_bit - low_bit + 1
+    mask = (1 << width) - 1
+    need = high_byte + 1
+
+    param_type = param.get("type")
+    kind = _type_kind(param_type, "bit" in param)
+    unit = str(param.get("unit", "")).lower()
+    values = param.get("values")
+    fahrenheit = None
+
+    if kind == "ascii":
+        return FieldPlan(
+            name or "text", shift, mask, KIND_ASCII, need, width // 8, None, None
+        )
+
+    if kind == "bits":
+        bitstrings = tuple(format(raw, f"0{width}b") for raw in range(mask + 1))
+        definitions = None
+        if values:
+            # The spec keys bit values by their bit string ("01", "0010"),
+            # which YAML 1.1 reads as decimal or, with a leading zero, octal
+            # integers; resolve each bit string the same way.
+            definitions = (
+                f"{name} definition",
+                {
+                    raw: values.get(_yaml_int(text), "undefined")
+                    for raw, text in enumerate(bitstrings)
+                },
+            )
+        return FieldPlan(
+            name, shift, mask, KIND_BITS, need, bitstrings, definitions, None
+        )
+
+    definitions = (f"{name} definition", dict(values)) if values else None
+    if unit == "deg c":
+        fahrenheit = f"{name} F"
+
+    if width <= 8 and unit in _UINT8_CONVERSIONS:
+        convert = _UINT8_CONVERSIONS[unit]
+        table = tuple(convert(raw) for raw in range(mask + 1))
+        return FieldPlan(
+            name, shift, mask, KIND_TABLE, need, table, definitions, fahrenheit
+        )
+
+    scaled = _SCALED_CONVERSIONS.get((unit, width))
+    if scaled is not None:
+        return FieldPlan(
+            name, shift, mask, KIND_SCALED, need, scaled, definitions, fahrenheit
+        )
+
+    return FieldPlan(name, shift, mask, KIND_UINT, need, None, definitions, None)
+
+
+def _dgn_key(key: Any) -> Optional[int]:
+    """Return the numeric DGN for a spec key, or None for pseudo entries."""
+    try:
+        return int(str(key), 16)
+    except ValueError:
+        return None
+
+
+def compile_spec(spec: Dict[Any, Any]) -> Dict[int, DgnPlan]:
+    """Compile a loaded spec mapping into DGN plans keyed by numeric DGN.
+
+    Aliased entries inherit the alias' parameters followed by their own.
+    Pseudo entries such as ``Z0000`` only serve as alias targets.
+    """
+    plans: Dict[int, DgnPlan] = {}
+    for key, entry in spec.items():
+        if not isinstance(entry, dict):
+            continue
+        dgn = _dgn_key(key)
+        if dgn is None:
+            continue
+
+        params = []
+        alias = entry.get("alias")
+        if alias is not None:
+            target = spec.get(alias) or spec.get(str(alias)) or {}
+            params.extend(target.get("parameters") or [])
+        params.extend(entry.get("parameters") or [])
+
+        fields = []
+        for param in params:
+            field = _compile_field(param)
+            if field is None:
+                _LOGGER.debug("Skipping unplaceable parameter in %s: %s", key, param)
+                continue
+            fields.append(field)
+
+        name = entry.get("name", f"UNKNOWN-{dgn:05X}")
+        plans[dgn] = DgnPlan(dgn, f"{dgn:05X}", name, tuple(fields))
+    return plans
+
+
+class _SpecLoader(yaml.SafeLoader):
+    """Safe loader that keeps value texts like ``off`` and ``on`` as strings."""
+
+
+_SpecLoader.yaml_implicit_resolvers = {
+    first: [
+        (tag, regexp)
+        for tag, regexp in resolvers
+        if tag != "tag:yaml.org,2002:bool"
+    ]
+    for first, resolvers in yaml.SafeLoader.yaml_implicit_resolvers.items()
+}
+
+
+def read_spec_bytes(raw: bytes) -> Dict[Any, Any]:
+    """Parse the raw spec mapping from YAML contents."""
+    return yaml.load(raw, Loader=_SpecLoader) or {}
+
+
+def read_spec(path: str = DEFAULT_SPEC_PATH) -> Dict[Any, Any]:
+    """Read the raw spec mapping from a YAML file."""
+    with open(path, "rb") as file:
+        return read_spec_bytes(file.read())
+
+
+def load_spec(path: str = DEFAULT_SPEC_PATH) -> Dict[int, DgnPlan]:
+    """Load and compile an RV-C spec YAML file."""
+    return compile_spec(read_spec(path))
@@ -0,0 +1,57 @@
+"""THERMOSTAT_COMMAND_1 (1FEF9) setpoint codec for the scripts.
+
+The codec lives in ``homeassistant/custom_components/rvc_common/thermostat.py``
+so the Home Assistant integrations, which cannot import this package, run
+the same code; this module re-exports it.
+"""
+from .components import register_components
+
+register_components()
+
+from custom_components.rvc_common.thermostat import (  # noqa: E402
+    DGN,
+    DGN_HEX,
+    FAN_MODES,
+    MAX_C,
+    MAX_F,
+    MIN_C,
+    MIN_F,
+    NAME,
+    NOT_AVAILABLE,
+    OFFSET,
+    OPERATING_MODES,
+    RESOLUTION,
+    SCHEDULE_MODES,
+    TOPIC_PREFIX,
+    command_payload,
+    command_topic,
+    decode_command,
+    decode_setpoint,
+    encode_command,
+    encode_setpoint,
+    setpoint_fields,
+)
+
+__all__ = [
+    "DGN",
+    "DGN_HEX",
+    "FAN_MODES",
+    "MAX_C",
+    "MAX_F",
+    "MIN_C",
+    "MIN_F",
+    "NAME",
+    "NOT_AVAILABLE",
+    "OFFSET",
+    "OPERATING_MODES",
+    "RESOLUTION",
+    "SCHEDULE_MODES",
+    "TOPIC_PREFIX",
+    "command_payload",
+    "command_topic",
+    "decode_command",
+    "decode_setpoint",
+    "encode_command",
+    "encode_setpoint",
+    "setpoint_fields",
+]
@@ -0,0 +1,106 @@
+"""Build, decode and send THERMOSTAT_COMMAND_1 setpoint commands.
+
+Run from the repository root::
+
+    python -m rvc.thermostat_cli --instance 0 --mode cool --fan-mode auto --cool 75
+    python -m rvc.thermostat_cli --cool 75 --publish --broker 100.110.189.122
+    python -m rvc.thermostat_cli --decode 0001647E257E2500
+
+Without ``--publish`` the JSON command is only printed.  Publishing needs
+an explicit ``--broker`` and paho-mqtt, like the other scripts in this
+repository.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Optional, Sequence
+
+from .thermostat import (
+    FAN_MODES,
+    OPERATING_MODES,
+    SCHEDULE_MODES,
+    command_payload,
+    command_topic,
+    decode_command,
+)
+
+DEFAULT_PORT = 1883
+
+
+def publish(
+    topic: str,
+    payload: Dict[str, Any],
+    broker: str,
+    port: int = DEFAULT_PORT,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+) -> None:
+    """Publish one command with QoS 1 and return once the broker has it."""
+    import paho.mqtt.client as mqtt
+
+    client = mqtt.Client()
+    if username and password:
+        client.username_pw_set(username, password)
+    client.connect(broker, port, 60)
+    client.loop_start()
+    try:
+        client.publish(topic, json.dumps(payload), qos=1).wait_for_publish()
+    finally:
+        client.disconnect()
+        client.loop_stop()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instance", type=int, default=0, help="thermostat zone")
+    parser.add_argument("--mode", choices=OPERATING_MODES)
+    parser.add_argument("--fan-mode", choices=FAN_MODES)
+    parser.add_argument("--schedule-mode", choices=SCHEDULE_MODES)
+    parser.add_argument("--fan-speed", type=float, help="percent")
+    parser.add_argument("--heat", type=float, help="heat setpoint")
+    parser.add_argument("--cool", type=float, help="cool setpoint")
+    parser.add_argument("--unit", choices=["F", "C"], default="F")
+    parser.add_argument("--decode", metavar="DATA", help="decode a hex data field and exit")
+    parser.add_argument("--publish", action="store_true", help="send the command")
+    parser.add_argument("--broker", help="MQTT broker; required with --publish")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    args = parser.parse_args(argv)
+
+    if args.publish and not args.broker:
+        parser.error("--publish requires --broker")
+
+    if args.decode:
+        try:
+            print(json.dumps(decode_command(args.decode), indent=2))
+        except ValueError as e:
+            parser.error(f"cannot decode {args.decode!r}: {e}")
+        return 0
+
+    try:
+        payload = command_payload(
+            args.instance,
+            mode=args.mode,
+            fan_mode=args.fan_mode,
+            schedule_mode=args.schedule_mode,
+            fan_speed=args.fan_speed,
+            heat=args.heat,
+            cool=args.cool,
+            unit=args.unit,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    topic = command_topic(args.instance)
+    print(f"{topic} {json.dumps(payload)}")
+    if args.publish:
+        publish(topic, payload, args.broker, args.port, args.username, args.password)
+        print(f"Published to {args.broker}:{args.port}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Reassembly of RV-C multi-packet messages (J1939 transport protocol).
+
+DGNs longer than 8 bytes are announced on DGN 1ECxx (TP.CM, either a
+broadcast BAM or a point-to-point RTS) and their payload follows in 7-byte
+chunks on DGN 1EBxx (TP.DT).  :class:`Reassembler` follows those sessions
+and returns each complete message as a normal ``(can_id, data)`` pair, so
+it can be decoded like any single frame::
+
+    message = reassembler.feed(can_id, data)
+    if message is not None:
+        record = decoder.decode(*message)
+
+Sessions are keyed by (source, destination) and held in a fixed pool of
+preallocated buffers.  An announcement that finds the pool full is dropped
+rather than allocating, and sessions that stop receiving packets are
+released after ``timeout`` seconds.
+"""
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+TP_CM_PF = 0xEC
+TP_DT_PF = 0xEB
+CM_RTS = 16
+CM_CTS = 17
+CM_EOM_ACK = 19
+CM_BAM = 32
+CM_ABORT = 255
+PACKET_BYTES = 7
+MAX_PACKETS = 255
+MAX_MESSAGE_BYTES = PACKET_BYTES * MAX_PACKETS
+DEFAULT_MAX_SESSIONS = 16
+# J1939-21 T1: the longest a receiver waits for the next data packet.
+DEFAULT_TIMEOUT = 0.75
+
+Message = Tuple[int, bytes]
+
+
+class _Session:
+    """One in-flight transfer; instances are pooled and reused."""
+
+    __slots__ = ("buffer", "key", "can_id", "size", "packets", "next_seq", "deadline")
+
+    def __init__(self, max_size: int) -> None:
+        self.buffer = bytearray(max_size)
+        self.key: Tuple[int, int] = (0, 0)
+        self.can_id = 0
+        self.size = 0
+        self.packets = 0
+        self.next_seq = 1
+        self.deadline = 0.0
+
+
+class Reassembler:
+    """Follow TP.CM/TP.DT sessions and emit complete multi-packet messages."""
+
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        max_size: int = MAX_MESSAGE_BYTES,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        """Initialize the reassembler and preallocate its buffer pool."""
+        self._max_size = min(max_size, MAX_MESSAGE_BYTES)
+        self._timeout = timeout
+        self._free: List[_Session] = [
+            _Session(self._max_size) for _ in range(max_sessions)
+        ]
+        self._active: Dict[Tuple[int, int], _Session] = {}
+        self._next_deadline = float("inf")
+        self.completed = 0
+        self.dropped = 0
+        self.aborted = 0
+        self.expired = 0
+
+    @property
+    def active(self) -> int:
+        """Return the number of sessions in flight."""
+        return len(self._active)
+
+    def feed(
+        self, can_id: int, data: bytes, now: Optional[float] = None
+    ) -> Optional[Message]:
+        """Process one TP.CM or TP.DT frame.
+
+        Returns ``(can_id, payload)`` when the frame completes a message,
+        where ``can_id`` carries the announced DGN, priority and source.
+        """
+        if now is None:
+            now = time.monotonic()
+        if now >= self._next_deadline:
+            self.expire(now)
+
+        pf = (can_id >> 16) & 0xFF
+        key = (can_id & 0xFF, (can_id >> 8) & 0xFF)
+        if pf == TP_CM_PF:
+            self._control(key, can_id, data, now)
+            return None
+        if pf != TP_DT_PF or len(data) < 2:
+            return None
+
+        session = self._active.get(key)
+        if session is None:
+            return None
+        seq = data[0]
+        if seq != session.next_seq:
+            # Lost or repeated packet; the transfer cannot be completed.
+            self.aborted += 1
+            self._release(session)
+            return None
+
+        offset = (seq - 1) * PACKET_BYTES
+        chunk = data[1 : 1 + PACKET_BYTES]
+        session.buffer[offset : offset + len(chunk)] = chunk
+        if seq < session.packets:
+            session.next_seq = seq + 1
+            session.deadline = now + self._timeout
+            self._next_deadline = min(self._next_deadline, session.deadline)
+            return None
+
+        message = (session.can_id, bytes(session.buffer[: session.size]))
+        self.completed += 1
+        self._release(session)
+        return message
+
+    def _control(
+        self, key: Tuple[int, int], can_id: int, data: bytes, now: float
+    ) -> None:
+        """Handle a TP.CM frame: open, or abort, a session."""
+        if not data:
+            return
+        control = data[0]
+        if control == CM_ABORT:
+            # Either side may abort; the transfer runs the other way round.
+            session = self._active.get(key) or self._active.get(key[::-1])
+            if session is not None:
+                self.aborted += 1
+                self._release(session)
+            return
+        if control not in (CM_BAM, CM_RTS) or len(data) < 8:
+            return  # CTS and EOM_ACK only pace the sender
+
+        size = data[1] | data[2] << 8
+        packets = data[3]
+        dgn = data[5] | data[6] << 8 | (data[7] & 0x01) << 16
+        if (
+            size > self._max_size
+            or packets == 0
+            or packets != (size + PACKET_BYTES - 1) // PACKET_BYTES
+        ):
+            self.dropped += 1
+            return
+
+        # A new announcement replaces any unfinished transfer for the key.
+        session = self._active.get(key)
+        if session is not None:
+            self.aborted += 1
+            self._release(session)
+        if not self._free:
+            self.expire(now)
+            if not self._free:
+                self.dropped += 1
+                return
+
+        session = self._free.pop()
+        session.key = key
+        priority = (can_id >> 26) & 0x7
+        session.can_id = priority << 26 | dgn << 8 | key[0]
+        session.size = size
+        session.packets = packets
+        session.next_seq = 1
+        session.deadline = now + self._timeout
+        self._next_deadline = min(self._next_deadline, session.deadline)
+        self._active[key] = session
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Release sessions that timed out; return how many were released."""
+        if now is None:
+            now = time.monotonic()
+        stale = [s for s in self._active.values() if s.deadline <= now]
+        for session in stale:
+            self._release(session)
+        self.expired += len(stale)
+        self._next_deadline = min(
+            (s.deadline for s in self._active.values()), default=float("inf")
+        )
+        return len(stale)
+
+    def _release(self, session: _Session) -> None:
+        del self._active[session.key]
+        self._free.append(session)
@@ -23,42 +23,7 @@ if [ $# -lt 2 ]; then
   exit 1
 fi
 
-INSTANCE="$1"
-ACTION="$2"
-BRIGHTNESS="${3:-100}"
-
-# Convert action to command code
-case "$ACTION" in
-  on)
-    CMD="2"
-    ;;
-  off)
-    CMD="3"
-    BRIGHTNESS="0"
-    ;;
-  toggle)
-    CMD="5"
-    BRIGHTNESS="100"
-    ;;
-  bright)
-    CMD="19"  # ramp up
-    ;;
-  dim)
-    if [ -z "$3" ]; then
-      CMD="20"  # ramp down without specific brightness
-    else
-      CMD="19"  # ramp up/dim to specific brightness
-    fi
-    ;;
-  stop)
-    CMD="0"  # no command (stops ramping)
-    ;;
-  *)
-    echo "Error: Unknown action '$ACTION'"
-    show_usage
-    exit 1
-    ;;
-esac
-
-# Run the Node.js script
-node rvc_node_red_mqtt.js "$INSTANCE" "$CMD" "$BRIGHTNESS"
+# The rvc CLI maps the action to a bridge command and hands it to the rvc
+# daemon's open broker connection; without a daemon it connects itself
+cd "$(dirname "$0")" && exec python3 -m rvc \
+  --broker 100.110.189.122 --username rc --password rc send light "$@"
@@ -0,0 +1,4 @@
+from rvc.components import register_components
+
+# Lets tests import custom_components.<component>.<module> without Home Assistant.
+register_components()
@@ -0,0 +1,62 @@
+import math
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from rvc import Decoder  # noqa: E402
+from rvc.batch import BatchDecoder, parse_candump, read_candump  # noqa: E402
+
+CAN_LOG = os.path.join(os.path.dirname(os.path.dirname(__file__)), "can.txt")
+
+
+def test_read_candump_table_format():
+    frames = read_candump(CAN_LOG)
+    assert frames.data.shape == (92, 8)
+    assert frames.can_id[0] == 0x19FFE096
+    assert np.isnan(frames.timestamp).all()
+
+
+def test_parse_candump_log_format_pads_short_frames():
+    frames = parse_candump(
+        [
+            "(1700000000.500000) can0 19FEDA9F#2E7C40FCFF0504FF",
+            "(1.0) can0 17F4296#01",
+            "junk",
+        ]
+    )
+    assert frames.timestamp.tolist() == [1700000000.5, 1.0]
+    assert frames.length.tolist() == [8, 1]
+    assert frames.data[1].tolist() == [1] + [0xFF] * 7
+
+
+def test_batch_matches_frame_decoder():
+    frames = read_candump(CAN_LOG)
+    table = BatchDecoder().decode(frames)["AIR_CONDITIONER_COMMAND"]
+    decoder = Decoder()
+
+    assert len(table["instance"]) == len(frames.can_id)
+    for row in range(len(frames.can_id)):
+        record = decoder.decode(int(frames.can_id[row]), frames.data[row].tobytes())
+        assert table["instance"][row] == record["instance"]
+        assert table["fan speed"][row] == record["fan speed"]
+        assert math.isnan(table["max fan speed"][row])
+        assert record["max fan speed"] == "n/a"
+
+
+def test_batch_groups_pdu1_destinations_and_scales():
+    frames = parse_candump(
+        [
+            "(1.0) can0 197F4296#01",
+            "(2.0) can0 197F5596#04",
+            "(3.0) can0 19FFF796#0102FFFF342CF00C",
+        ]
+    )
+    tables = BatchDecoder().decode(frames)
+    assert tables["GENERAL_RESET"]["timestamp"].tolist() == [1.0, 2.0]
+    assert tables["GENERAL_RESET"]["clear faults"].tolist() == [0, 1]
+    heater = tables["WATERHEATER_STATUS"]
+    assert heater["water temperature"][0] == pytest.approx(80.625)
+    assert heater["water temperature F"][0] == pytest.approx(177.125)
+    assert math.isnan(heater["set point temperature"][0])
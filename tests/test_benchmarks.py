@@ -0,0 +1,19 @@
+import json
+
+from benchmarks import fixtures, run
+
+
+def test_fixtures_are_reproducible():
+    assert fixtures.spec_frames(50, seed=3) == fixtures.spec_frames(50, seed=3)
+    assert fixtures.spec_frames(50, seed=3) != fixtures.spec_frames(50, seed=4)
+
+
+def test_report_is_machine_readable(tmp_path):
+    output = tmp_path / "bench.json"
+    assert run.main(["--frames", "200", "--repeat", "1", "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert set(report["results"]) == set(run.CASES)
+    for result in report["results"].values():
+        assert result["items"] == 200
+        assert result["fps"] > 0
+        assert result["p50_us"] <= result["p99_us"]
@@ -0,0 +1,29 @@
+import shutil
+
+from rvc.cache import CACHE_SUFFIX, load_cached_spec
+from rvc.spec import DEFAULT_SPEC_PATH, load_spec
+
+
+def test_cached_spec_matches_compiled_spec(tmp_path):
+    spec_path = str(tmp_path / "rvc-spec.yml")
+    shutil.copy(DEFAULT_SPEC_PATH, spec_path)
+
+    first = load_cached_spec(spec_path)
+    assert (tmp_path / ("rvc-spec.yml" + CACHE_SUFFIX)).exists()
+    assert load_cached_spec(spec_path) == first == load_spec(spec_path)
+
+
+def test_cache_invalidated_when_spec_changes(tmp_path):
+    spec_path = tmp_path / "spec.yml"
+    spec_path.write_text("1FFFF:\n  name: FIRST\n")
+    assert load_cached_spec(str(spec_path))[0x1FFFF].name == "FIRST"
+
+    spec_path.write_text("1FFFF:\n  name: SECOND\n")
+    assert load_cached_spec(str(spec_path))[0x1FFFF].name == "SECOND"
+
+
+def test_corrupt_cache_is_rebuilt(tmp_path):
+    spec_path = tmp_path / "spec.yml"
+    spec_path.write_text("1FFFF:\n  name: FIRST\n")
+    (tmp_path / ("spec.yml" + CACHE_SUFFIX)).write_bytes(b"not a pickle")
+    assert load_cached_spec(str(spec_path))[0x1FFFF].name == "FIRST"
@@ -0,0 +1,71 @@
+import os
+
+from custom_components.rvc_common import cache
+
+
+def _counting_build():
+    calls = []
+
+    def build(raw):
+        calls.append(raw)
+        return {"raw": raw}
+
+    return build, calls
+
+
+def test_unchanged_file_is_not_read_again(tmp_path):
+    path = tmp_path / "sensors.yaml"
+    path.write_bytes(b"sensor: []\n")
+    build, calls = _counting_build()
+
+    assert cache.load_cached(str(path), build) == {"raw": b"sensor: []\n"}
+    assert cache.load_cached(str(path), build) == {"raw": b"sensor: []\n"}
+    assert len(calls) == 1
+
+
+def test_touched_file_keeps_cache_and_changed_file_rebuilds(tmp_path):
+    path = tmp_path / "sensors.yaml"
+    path.write_bytes(b"first\n")
+    build, calls = _counting_build()
+    cache.load_cached(str(path), build)
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.load_cached(str(path), build) == {"raw": b"first\n"}
+    assert len(calls) == 1
+
+    path.write_bytes(b"second\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert cache.load_cached(str(path), build) == {"raw": b"second\n"}
+    assert len(calls) == 2
+
+
+def test_corrupt_cache_is_rebuilt(tmp_path):
+    path = tmp_path / "sensors.yaml"
+    path.write_bytes(b"sensor: []\n")
+    (tmp_path / ("sensors.yaml" + cache.CACHE_SUFFIX)).write_bytes(b"not a pickle")
+    build, calls = _counting_build()
+    assert cache.load_cached(str(path), build) == {"raw": b"sensor: []\n"}
+    assert len(calls) == 1
+
+
+def test_same_size_edit_with_same_mtime_rebuilds(tmp_path):
+    path = tmp_path / "sensors.yaml"
+    path.write_bytes(b"deadband: 1\n")
+    build, calls = _counting_build()
+    cache.load_cached(str(path), build)
+
+    stat = path.stat()
+    path.write_bytes(b"deadband: 2\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.load_cached(str(path), build) == {"raw": b"deadband: 2\n"}
+    assert len(calls) == 2
+
+
+def test_version_change_rebuilds(tmp_path):
+    path = tmp_path / "sensors.yaml"
+    path.write_bytes(b"sensor: []\n")
+    build, calls = _counting_build()
+    cache.load_cached(str(path), build, version=1)
+    cache.load_cached(str(path), build, version=2)
+    assert len(calls) == 2
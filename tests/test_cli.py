@@ -0,0 +1,113 @@
+import asyncio
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+from rvc import cli
+
+
+class FakeConnection:
+    """Stands in for MqttConnection; messages to ``unacked`` topics time out."""
+
+    def __init__(self, unacked=()):
+        self.published = []
+        self.unacked = set(unacked)
+
+    def publish(self, message):
+        self.published.append(message)
+        return message
+
+    def acknowledged(self, info):
+        return info.topic not in self.unacked
+
+    def wait(self, info):
+        if info.topic in self.unacked:
+            raise TimeoutError("no acknowledgement")
+
+
+def test_light_commands_match_rvc_light_sh():
+    assert cli.parse_command("light 46 on") == cli.Message(cli.LIGHT_TOPIC, "46 2 100")
+    assert cli.parse_command("light 46 off").payload == "46 3 0"
+    assert cli.parse_command("light 46 dim").payload == "46 20 100"
+    assert cli.parse_command("light 46 dim 50").payload == "46 19 50"
+    assert cli.parse_command("LIGHT 25 Toggle 30").payload == "25 5 100"
+
+
+def test_dimmer_and_thermostat_commands_are_encoded():
+    dimmer = cli.parse_command("dimmer 46 19 55")
+    assert dimmer.topic == "RVC/DC_DIMMER_COMMAND_2/46"
+    assert json.loads(dimmer.payload)["data"] == "2EFF6E13FFFCFFFF"
+    assert json.loads(cli.parse_command("dimmer 46 'ramp up' 55").payload)["data"] == "2EFF6E13FFFCFFFF"
+
+    thermostat = cli.parse_command("thermostat 0 mode=cool cool=75")
+    assert thermostat.topic == "RVC/THERMOSTAT_COMMAND_1/0"
+    assert json.loads(thermostat.payload)["data"] == "00F1FFFFFF1C25FF"
+
+    assert cli.parse_command("publish test/topic hello world") == cli.Message("test/topic", "hello world")
+
+
+@pytest.mark.parametrize(
+    "line", ["light 46", "light 46 blink", "light x on", "thermostat 0 colour=red", "fly 1"]
+)
+def test_invalid_commands_raise_value_error(line):
+    with pytest.raises(ValueError):
+        cli.parse_command(line)
+
+
+def test_split_commands_at_semicolons():
+    words = ["light", "46", "on", ";", "publish", "a/b", "x y"]
+    assert list(cli.split_commands(words)) == ["light 46 on", "publish a/b 'x y'"]
+
+
+def test_pipeline_replies_in_order_and_counts_errors():
+    connection = FakeConnection(unacked={"slow/topic"})
+    replies = []
+    lines = ["# scene", "light 46 on", "", "light 46 blink", "publish slow/topic 1", "light 25 off"]
+    errors = cli.pipeline(connection, lines, replies.append)
+
+    assert errors == 2
+    assert [reply.split()[0] for reply in replies] == ["ok", "error", "error", "ok"]
+    assert "no acknowledgement" in replies[2]
+    # Every valid command was published even though one was never acknowledged.
+    assert [message.payload for message in connection.published] == ["46 2 100", "1", "25 3 0"]
+
+
+def test_daemon_pipelines_socket_commands(tmp_path):
+    connection = FakeConnection(unacked={"slow/topic"})
+    path = str(tmp_path / "rvc.sock")
+    loop = asyncio.new_event_loop()
+    daemon = cli.Daemon(connection, path)
+    loop.run_until_complete(daemon.start())
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    replies = []
+    try:
+        errors = cli.send_to_daemon(
+            path, ["light 46 on", "publish slow/topic 1", "light 25 off"], replies.append
+        )
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        daemon.stop()
+        loop.close()
+
+    assert errors == 1
+    assert replies[0] == f"ok {cli.LIGHT_TOPIC}"
+    assert replies[1].startswith("error publish slow/topic 1")
+    assert replies[2] == f"ok {cli.LIGHT_TOPIC}"
+    assert len(connection.published) == 3
+
+
+def test_daemon_socket_is_owner_only(tmp_path):
+    path = str(tmp_path / "rvc.sock")
+    loop = asyncio.new_event_loop()
+    daemon = cli.Daemon(FakeConnection(), path)
+    try:
+        loop.run_until_complete(daemon.start())
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    finally:
+        daemon.stop()
+        loop.close()
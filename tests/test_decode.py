@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from custom_components.rvc_common import decode
+
+
+@pytest.fixture(autouse=True)
+def counted_loads(monkeypatch):
+    calls = []
+    loads = decode.loads
+    monkeypatch.setattr(decode, "loads", lambda payload: calls.append(payload) or loads(payload))
+    decode._memo.clear()
+    return calls
+
+
+def test_payload_is_parsed_once_per_dispatch(counted_loads):
+    async def scenario():
+        first = decode.decode_payload("RVC/DC_DIMMER_STATUS_3/46", '{"instance": 46}')
+        again = decode.decode_payload("RVC/DC_DIMMER_STATUS_3/46", '{"instance": 46}')
+        assert first == {"instance": 46}
+        assert again is first
+        assert len(counted_loads) == 1
+
+        # A new payload, or the same payload on another topic, is parsed.
+        assert decode.decode_payload("RVC/DC_DIMMER_STATUS_3/46", '{"instance": 47}') == {"instance": 47}
+        decode.decode_payload("RVC/DC_DIMMER_STATUS_3/47", '{"instance": 47}')
+        assert len(counted_loads) == 3
+
+        # The next dispatch gets a value of its own.
+        await asyncio.sleep(0)
+        assert not decode._memo
+        later = decode.decode_payload("RVC/DC_DIMMER_STATUS_3/46", '{"instance": 46}')
+        assert later == first and later is not first
+
+    asyncio.run(scenario())
+
+
+def test_nothing_is_remembered_outside_the_loop(counted_loads):
+    first = decode.decode_payload("RVC/DC_DIMMER_STATUS_3/46", '{"instance": 46}')
+    first["instance"] = 0
+    assert decode.decode_payload("RVC/DC_DIMMER_STATUS_3/46", '{"instance": 46}') == {"instance": 46}
+    assert not decode._memo
+
+
+def test_invalid_json_raises_value_error():
+    with pytest.raises(ValueError):
+        decode.decode_payload("RVC/DC_DIMMER_STATUS_3/46", "not json")
@@ -0,0 +1,59 @@
+from rvc import Decoder, parse_can_id, topic_for
+
+DECODER = Decoder()
+
+
+def can_id(dgn, source=0x96, priority=6):
+    return (priority << 26) | (dgn << 8) | source
+
+
+def test_parse_can_id():
+    assert parse_can_id(0x19FFE096) == (6, 0x1FFE0, 0x96)
+
+
+def test_decode_dimmer_status_matches_bridge_payload():
+    record = DECODER.decode(can_id(0x1FEDA), bytes.fromhex("2E7C40FCFF0504FF"))
+    assert record["name"] == "DC_DIMMER_STATUS_3"
+    assert record["dgn"] == "1FEDA"
+    assert record["data"] == "2E7C40FCFF0504FF"
+    assert record["instance"] == 46
+    assert record["group"] == "01111100"
+    assert record["operating status (brightness)"] == 32
+    assert record["load status"] == "01"
+    assert record["load status definition"] == "operating status is non-zero or flashing"
+    assert record["last command definition"] == "toggle"
+    assert record["overcurrent status"] == "11"
+    assert topic_for(record) == "RVC/DC_DIMMER_STATUS_3/46"
+
+
+def test_decode_scaled_temperature_and_not_available():
+    record = DECODER.decode(can_id(0x1FFF7), bytes.fromhex("0102FFFF342CF00C"))
+    assert record["operating modes definition"] == "electric"
+    assert record["set point temperature"] == "n/a"
+    assert record["water temperature"] == 80.6
+    assert record["water temperature F"] == 177.1
+    assert record["burner status definition"] == "off"
+
+
+def test_decode_octal_looking_bit_values():
+    record = DECODER.decode(can_id(0x1FFE2), bytes.fromhex("0112FFFFFFFFFFFF"))
+    assert record["operating mode"] == "0010"
+    assert record["operating mode definition"] == "heat"
+
+
+def test_decode_alias_inherits_parameters():
+    record = DECODER.decode(can_id(0x1FFFE), bytes.fromhex("170A0203100E0000"))
+    assert record["name"] == "SET_DATE_TIME_COMMAND"
+    assert record["year"] == 23
+    assert record["day of week definition"] == "Tuesday"
+
+
+def test_decode_pdu1_destination_and_short_frame():
+    record = DECODER.decode(can_id(0x17F42), bytes.fromhex("01"))
+    assert record["name"] == "GENERAL_RESET"
+    assert record["reboot definition"] == "Reboot"
+
+
+def test_decode_unknown_dgn():
+    record = DECODER.decode(can_id(0x1AAAA), b"\x00" * 8)
+    assert record["name"] == "UNKNOWN-1AAAA"
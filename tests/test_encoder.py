@@ -0,0 +1,49 @@
+import pytest
+
+from rvc import Decoder, Encoder
+
+ENCODER = Encoder()
+DECODER = Decoder()
+
+
+def test_encode_dimmer_command_fills_unset_fields():
+    data = ENCODER.encode_hex(
+        "DC_DIMMER_COMMAND_2",
+        {"instance": 46, "desired level": 55, "command": 19},
+    )
+    assert data == "2EFF6E13FFFFFFFF"
+
+
+def test_encode_accepts_definition_text_and_bit_strings():
+    data = ENCODER.encode_hex(
+        "DC_DIMMER_COMMAND_2",
+        {"instance": 46, "desired level": 55, "command": "ramp up", "interlock": "00"},
+    )
+    assert data == "2EFF6E13FFFCFFFF"
+
+
+def test_encode_round_trips_through_decoder():
+    can_id, data = ENCODER.frame(
+        "AIR_CONDITIONER_COMMAND",
+        {"instance": 1, "operating mode": 1, "fan speed": 100},
+    )
+    assert data.hex().upper() == "0101FFFFC8FFFFFF"
+    record = DECODER.decode(can_id, data)
+    assert record["name"] == "AIR_CONDITIONER_COMMAND"
+    assert record["instance"] == 1
+    assert record["fan speed"] == 100
+    assert record["air conditioning output level"] == "n/a"
+
+
+def test_command_json_is_compact():
+    payload = ENCODER.command_json("DC_DIMMER_COMMAND_2", {"instance": 46, "command": 3})
+    assert payload == '{"dgn":"1FEDB","data":"2EFFFF03FFFFFFFF","instance":46,"command":3}'
+
+
+def test_encode_rejects_unknown_fields_and_out_of_range_values():
+    with pytest.raises(ValueError):
+        ENCODER.encode("DC_DIMMER_COMMAND_2", {"brightness": 10})
+    with pytest.raises(ValueError):
+        ENCODER.encode("DC_DIMMER_COMMAND_2", {"instance": 300})
+    with pytest.raises(KeyError):
+        ENCODER.encode("NOT_A_DGN", {})
@@ -0,0 +1,51 @@
+import pytest
+
+from custom_components.rvc_common.latency import LatencyTracker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_first_matching_status_confirms():
+    clock = Clock()
+    tracker = LatencyTracker(timeout=5, clock=clock)
+    tracker.start(lambda status: status == (True, 55))
+
+    clock.now += 0.08
+    assert tracker.observe((True, 20)) is None  # still ramping
+    clock.now += 0.04
+    assert tracker.observe((True, 55)) == pytest.approx(120)
+    assert tracker.observe((True, 55)) is None  # already confirmed
+
+    attributes = tracker.attributes()
+    assert attributes["command_confirmations"] == 1
+    assert attributes["command_latency_last_ms"] == 120
+    assert attributes["command_latency_histogram"]["<=250ms"] == 1
+
+
+def test_unconfirmed_command_times_out():
+    clock = Clock()
+    tracker = LatencyTracker(timeout=5, clock=clock)
+    tracker.start(lambda status: status == "off")
+    clock.now += 6
+    assert not tracker.pending
+    assert tracker.observe("off") is None
+    assert tracker.attributes()["command_timeouts"] == 1
+    assert tracker.attributes()["command_confirmations"] == 0
+
+
+def test_newer_command_replaces_pending():
+    clock = Clock()
+    tracker = LatencyTracker(timeout=5, clock=clock)
+    tracker.start(lambda status: status == "on")
+    clock.now += 1
+    tracker.start(lambda status: status == "off")
+    assert tracker.observe("on") is None
+    clock.now += 0.5
+    assert tracker.observe("off") == pytest.approx(500)
+    assert tracker.timeouts == 0
@@ -0,0 +1,61 @@
+import json
+import logging
+
+from rvc.logsink import BufferedLogSink, setup_logging
+
+
+def _logger(name, sink):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.handlers = [sink]
+    return logger
+
+
+def test_records_are_written_as_single_line_json_in_one_batch(tmp_path):
+    path = tmp_path / "logs" / "debug.log"
+    sink = BufferedLogSink(str(path), flush_interval=10)
+    log = _logger("test_logsink_batch", sink)
+    for instance in range(50):
+        log.info("Publishing %s", instance, extra={"data": {"topic": f"RVC/X/{instance}", "payload": {"a": 1}}})
+    sink.close()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 50
+    first = json.loads(lines[0])
+    assert first["message"] == "Publishing 0"
+    assert first["level"] == "INFO"
+    assert first["topic"] == "RVC/X/0"
+    assert first["payload"] == {"a": 1}
+    # The writer waited for the batch instead of writing per record.
+    assert sink.batches == 1
+
+
+def test_file_rotates_by_size(tmp_path):
+    path = tmp_path / "rotate.log"
+    sink = BufferedLogSink(str(path), max_bytes=300, backup_count=2, flush_interval=0, batch_size=1)
+    log = _logger("test_logsink_rotate", sink)
+    for index in range(30):
+        log.info(f"record {index:02d}")
+    sink.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["rotate.log", "rotate.log.1", "rotate.log.2"]
+    for file in tmp_path.iterdir():
+        assert file.stat().st_size <= 300
+    last = json.loads(path.read_text().splitlines()[-1])
+    assert last["message"] == "record 29"
+
+
+def test_setup_logging_names_the_logger_after_the_file(tmp_path, capsys):
+    log = setup_logging(str(tmp_path / "toggle_light.log"), flush_interval=0)
+    log.info("Command acknowledged", extra={"data": {"topic": "RVC/DC_DIMMER_COMMAND_2/46"}})
+    sink = log.handlers[0]
+    try:
+        assert log.name == "toggle_light"
+        assert capsys.readouterr().err.strip().endswith(
+            'Command acknowledged {"topic":"RVC/DC_DIMMER_COMMAND_2/46"}'
+        )
+    finally:
+        sink.close()
+        log.handlers.clear()
+    assert json.loads((tmp_path / "toggle_light.log").read_text())["topic"] == "RVC/DC_DIMMER_COMMAND_2/46"
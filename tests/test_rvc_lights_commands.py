@@ -0,0 +1,139 @@
+import asyncio
+
+from custom_components.rvc_lights import commands
+
+Command = commands.Command
+
+
+def test_pack_commands_matches_bridge_format():
+    assert commands.pack_commands([Command(46, 3, 0)]) == "46 3 0"
+    assert commands.pack_commands(
+        [Command(46, 2, 55), Command(commands.ALL_INSTANCES, 3, 0, group=0x7E)]
+    ) == "46 2 55;255 3 0 126"
+
+
+def test_commands_in_one_window_share_a_publish():
+    async def scenario():
+        published = []
+
+        async def publish(payload):
+            published.append(payload)
+
+        batcher = commands.CommandBatcher(asyncio.get_running_loop(), publish, window=0.01)
+        await asyncio.gather(
+            *(batcher.async_send(Command(instance, 3, 0)) for instance in (25, 26, 27))
+        )
+        await batcher.async_send(Command(46, 2, 55))
+        return published
+
+    assert asyncio.run(scenario()) == ["25 3 0;26 3 0;27 3 0", "46 2 55"]
+
+
+def test_full_batch_publishes_without_waiting():
+    async def scenario():
+        published = []
+
+        async def publish(payload):
+            published.append(payload)
+
+        batcher = commands.CommandBatcher(
+            asyncio.get_running_loop(), publish, window=10, max_batch=2
+        )
+        await batcher.async_send_many([Command(1, 3, 0), Command(2, 3, 0)])
+        return published
+
+    assert asyncio.run(asyncio.wait_for(scenario(), 1)) == ["1 3 0;2 3 0"]
+
+
+def test_publish_failure_reaches_every_sender():
+    async def scenario():
+        async def publish(payload):
+            raise ConnectionError("broker down")
+
+        batcher = commands.CommandBatcher(asyncio.get_running_loop(), publish, window=0)
+        results = await asyncio.gather(
+            batcher.async_send(Command(1, 3, 0)),
+            batcher.async_send(Command(2, 3, 0)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, ConnectionError) for result in results)
+
+    asyncio.run(scenario())
+
+
+def test_fan_out_is_bounded_and_collects_failures():
+    async def scenario():
+        running = 0
+        peak = 0
+
+        async def send(instance):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if instance % 10 == 0:
+                raise ConnectionError(f"no route to {instance}")
+
+        failures = await commands.async_fan_out(range(1, 31), send, limit=8)
+        return peak, failures
+
+    peak, failures = asyncio.run(scenario())
+    assert peak == 8
+    assert sorted(failures) == [10, 20, 30]
+    assert isinstance(failures[10], ConnectionError)
+
+
+def _recording_queue(window):
+    sent = []
+
+    async def send(command):
+        sent.append((command.command, command.level))
+        await asyncio.sleep(0.01)
+
+    return commands.LightCommandQueue(asyncio.get_running_loop(), send, window), sent
+
+
+def test_slider_drag_sends_first_and_final_level():
+    async def scenario():
+        queue, sent = _recording_queue(0.05)
+        drag = []
+        for level in range(10, 101, 10):
+            drag.append(asyncio.ensure_future(queue.async_send(Command(46, 2, level), coalesce=True)))
+            await asyncio.sleep(0.002)
+        await asyncio.gather(*drag)
+        return sent
+
+    assert asyncio.run(scenario()) == [(2, 10), (2, 100)]
+
+
+def test_off_is_never_reordered_around_brightness():
+    async def scenario():
+        queue, sent = _recording_queue(0.05)
+        await asyncio.gather(
+            queue.async_send(Command(46, 2, 20), coalesce=True),
+            queue.async_send(Command(46, 2, 40), coalesce=True),
+            queue.async_send(Command(46, 3, 0)),
+            queue.async_send(Command(46, 2, 60), coalesce=True),
+            queue.async_send(Command(46, 2, 80), coalesce=True),
+        )
+        return sent
+
+    # Levels queued before the off collapse among themselves, never across it.
+    assert asyncio.run(scenario()) == [(2, 40), (3, 0), (2, 80)]
+
+
+def test_cancel_releases_waiting_callers():
+    async def scenario():
+        queue, sent = _recording_queue(10)
+        first = asyncio.ensure_future(queue.async_send(Command(46, 2, 20), coalesce=True))
+        second = asyncio.ensure_future(queue.async_send(Command(46, 3, 0)))
+        await asyncio.sleep(0.05)
+        queue.cancel()
+        results = await asyncio.gather(first, second, return_exceptions=True)
+        return sent, results
+
+    sent, results = asyncio.run(scenario())
+    assert sent == [(2, 20)]
+    assert results[0] is None
+    assert isinstance(results[1], asyncio.CancelledError)
@@ -0,0 +1,52 @@
+import asyncio
+
+from custom_components.rvc_lights import confirm
+
+
+def test_matching_status_confirms_and_disarms():
+    async def scenario():
+        timeouts = []
+        pending = confirm.PendingCommand(
+            asyncio.get_running_loop(), 0.05, lambda: timeouts.append(True)
+        )
+        pending.begin(lambda status: status == (True, 55))
+        assert pending.active
+        assert not pending.confirm((True, 20))  # stale level
+        assert pending.confirm((True, 55))
+        assert not pending.active
+        await asyncio.sleep(0.1)
+        return timeouts
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_unconfirmed_command_times_out_once():
+    async def scenario():
+        timeouts = []
+        pending = confirm.PendingCommand(
+            asyncio.get_running_loop(), 0.02, lambda: timeouts.append(True)
+        )
+        pending.begin(lambda status: not status[0])
+        await asyncio.sleep(0.1)
+        assert not pending.active
+        assert not pending.confirm((False, 0))
+        return timeouts
+
+    assert asyncio.run(scenario()) == [True]
+
+
+def test_newer_command_restarts_the_deadline():
+    async def scenario():
+        timeouts = []
+        pending = confirm.PendingCommand(
+            asyncio.get_running_loop(), 0.05, lambda: timeouts.append(True)
+        )
+        pending.begin(lambda status: status[0])
+        await asyncio.sleep(0.03)
+        pending.begin(lambda status: not status[0])
+        await asyncio.sleep(0.03)
+        assert timeouts == []
+        assert not pending.confirm((True, 100))  # the first command's target
+        assert pending.confirm((False, 0))
+
+    asyncio.run(scenario())
@@ -0,0 +1,43 @@
+from custom_components.rvc_lights import index as index_module
+
+
+def test_resolve_by_entity_id_and_unique_id():
+    index = index_module.InstanceIndex()
+    index.add("light.sink", "rvc_light_46", 46)
+    index.add("light.dinette", "rvc_light_45", 45)
+
+    instances, missing = index.resolve(
+        ["light.sink", "rvc_light_45", "light.sink", "light.unknown"]
+    )
+    assert instances == [46, 45]
+    assert missing == ["light.unknown"]
+
+
+def test_removed_lights_are_forgotten():
+    index = index_module.InstanceIndex()
+    remove = index.add("light.sink", "rvc_light_46", 46)
+    remove()
+    assert index.get("light.sink") is None
+    assert index.get("rvc_light_46") is None
+
+
+def test_shared_index_lives_in_hass_data():
+    class Hass:
+        data = {}
+
+    first = index_module.async_get_instance_index(Hass)
+    assert index_module.async_get_instance_index(Hass) is first
+
+
+def test_sender_is_kept_per_instance_until_removed():
+    index = index_module.InstanceIndex()
+
+    async def send(command):
+        pass
+
+    remove = index.add("light.sink", "rvc_light_46", 46, send)
+    index.add("light.dinette", "rvc_light_45", 45)
+    assert index.sender(46) is send
+    assert index.sender(45) is None
+    remove()
+    assert index.sender(46) is None
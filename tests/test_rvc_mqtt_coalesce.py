@@ -0,0 +1,76 @@
+import asyncio
+
+from custom_components.rvc_mqtt import coalesce
+
+
+def test_burst_of_changes_sends_one_command_with_final_state():
+    async def scenario():
+        state = {}
+        sent = []
+
+        async def send():
+            sent.append(dict(state))
+
+        commands = coalesce.CommandCoalescer(asyncio.get_running_loop(), send, 0.05)
+        for key, value in (("mode", "cool"), ("fan", "high"), ("temperature", 21)):
+            state[key] = value
+            commands.request()
+        assert sent == [] and commands.pending
+        await asyncio.sleep(0.1)
+        assert sent == [{"mode": "cool", "fan": "high", "temperature": 21}]
+        assert not commands.pending
+
+    asyncio.run(scenario())
+
+
+def test_changes_during_a_send_get_their_own_command():
+    async def scenario():
+        state = {"temperature": 20}
+        sent = []
+        release = asyncio.Event()
+
+        async def send():
+            sent.append(state["temperature"])
+            if len(sent) == 1:
+                await release.wait()
+
+        commands = coalesce.CommandCoalescer(asyncio.get_running_loop(), send, 0.02)
+        commands.request()
+        await asyncio.sleep(0.05)
+        assert sent == [20]
+        for temperature in (21, 22, 23):
+            state["temperature"] = temperature
+            commands.request()
+        release.set()
+        await asyncio.sleep(0.1)
+        assert sent == [20, 23]
+
+    asyncio.run(scenario())
+
+
+def test_failures_are_logged_and_cancel_drops_changes():
+    async def scenario():
+        calls = []
+
+        async def send():
+            calls.append(1)
+            raise OSError("broker gone")
+
+        loop = asyncio.get_running_loop()
+        failing = coalesce.CommandCoalescer(loop, send, 0.01)
+        failing.request()
+        await asyncio.sleep(0.05)
+        assert calls == [1]
+        # A failed send does not block later commands.
+        failing.request()
+        await asyncio.sleep(0.05)
+        assert calls == [1, 1]
+
+        removed = coalesce.CommandCoalescer(loop, send, 0.01)
+        removed.request()
+        removed.cancel()
+        await asyncio.sleep(0.05)
+        assert calls == [1, 1]
+        assert not removed.pending
+
+    asyncio.run(scenario())
@@ -0,0 +1,35 @@
+from custom_components.rvc_mqtt.deadband import ChangeFilter, Deadband
+
+
+def test_deadband_limits_numeric_changes():
+    assert not Deadband(absolute=0.1).exceeded(12.6, 12.65)
+    assert Deadband(absolute=0.1).exceeded(12.6, 12.75)
+    assert not Deadband(percent=10).exceeded("10.0", "10.5")
+    assert Deadband(percent=10).exceeded("10.0", "12.0")
+    # Rendered values compare as numbers; text changes whenever it differs.
+    assert not Deadband().exceeded("12", "12.0")
+    assert Deadband().exceeded("on", "off")
+
+
+def test_writes_changes_beyond_deadband():
+    changes = ChangeFilter(Deadband(absolute=0.1), heartbeat=300)
+    assert changes.should_write(12.6, now=0)
+    assert not changes.should_write(12.65, now=1)
+    # Measured against the last written value, so slow drift still passes.
+    assert changes.should_write(12.75, now=2)
+    assert not changes.should_write(12.75, now=3)
+
+
+def test_heartbeat_and_force_write_unchanged_values():
+    changes = ChangeFilter(heartbeat=60)
+    assert changes.should_write(12.6, now=0)
+    assert not changes.should_write(12.6, now=30)
+    assert changes.should_write(12.6, force=True, now=31)
+    assert not changes.should_write(12.6, now=90)
+    assert changes.should_write(12.6, now=91)
+
+
+def test_zero_heartbeat_writes_every_message():
+    changes = ChangeFilter(heartbeat=0)
+    assert changes.should_write(1, now=0)
+    assert changes.should_write(1, now=0)
@@ -0,0 +1,50 @@
+import pickle
+
+import pytest
+
+from benchmarks import fixtures
+
+pytest.importorskip("voluptuous")
+from custom_components.rvc_mqtt import descriptors  # noqa: E402
+
+
+def test_sensor_files_validate_with_defaults_and_templates():
+    configured = fixtures.load_sensors()
+    built = [
+        descriptors.build_descriptors((fixtures.COMPONENTS_DIR / "rvc_mqtt" / name).read_bytes())
+        for name in fixtures.SENSOR_FILES
+    ]
+    sensors = [sensor for result in built for sensor in result["sensor"]]
+    assert len(sensors) == len(configured)
+
+    sensor = sensors[0]
+    assert sensor["heartbeat"] == descriptors.DEFAULT_HEARTBEAT
+    assert "json_attributes_topic" not in sensor
+    templates = {}
+    for result in built:
+        templates.update(result["templates"])
+    assert templates[sensor["value_template"]] is not None
+    # The cache stores the descriptors as a pickle.
+    assert pickle.loads(pickle.dumps(built)) == built
+
+
+def test_invalid_entries_are_dropped_alone():
+    raw = b"""
+sensor:
+  - platform: mqtt
+    name: Good
+    unique_id: good
+    state_topic: RVC/DC_SOURCE_STATUS_1/1
+  - platform: mqtt
+    name: Bad
+    unique_id: bad
+    state_topic: RVC/DC_SOURCE_STATUS_1/1
+    qos: 5
+climate:
+  - topic: RVC/AIR_CONDITIONER_COMMAND/1
+    instance: "1"
+"""
+    result = descriptors.build_descriptors(raw)
+    assert [sensor["name"] for sensor in result["sensor"]] == ["Good"]
+    assert result["climate"][0]["instance"] == 1
+    assert result["templates"] == {}
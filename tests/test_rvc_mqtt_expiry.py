@@ -0,0 +1,40 @@
+import asyncio
+
+from custom_components.rvc_mqtt import expiry
+
+
+def test_stale_slots_expire_once_on_tick():
+    async def scenario():
+        manager = expiry.ExpiryManager(asyncio.get_running_loop(), tick=0.02)
+        expired = []
+        quiet = manager.register(0.1, lambda: expired.append("quiet"))
+        busy = manager.register(0.1, lambda: expired.append("busy"))
+        never = manager.register(0.1, lambda: expired.append("never"))
+
+        manager.touch(quiet)
+        for _ in range(30):
+            manager.touch(busy)
+            await asyncio.sleep(0.01)
+        assert expired == ["quiet"]
+
+        # Touching again re-arms the slot.
+        manager.touch(quiet)
+        await asyncio.sleep(0.25)
+        assert expired.count("quiet") == 2
+        assert "never" not in expired
+
+        for slot in (quiet, busy, never):
+            manager.unregister(slot)
+        assert manager._timer is None
+
+    asyncio.run(scenario())
+
+
+def test_slots_are_reused():
+    async def scenario():
+        manager = expiry.ExpiryManager(asyncio.get_running_loop())
+        first = manager.register(10, lambda: None)
+        manager.unregister(first)
+        assert manager.register(10, lambda: None) == first
+
+    asyncio.run(scenario())
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from benchmarks import fixtures
+from custom_components.rvc_mqtt import extractors
+
+SIMPLE = """
+  {% if value_json is defined and value_json is mapping and 'dc voltage' in value_json %}
+    {{ value_json['dc voltage'] }}
+  {% else %}
+    unknown
+  {% endif %}
+"""
+SUMMARY = """
+  {% if value_json is defined %}
+    Voltage: {{ value_json['dc voltage'] }} V | Instance: {{ value_json['instance'] }}
+  {% else %}
+    No data
+  {% endif %}
+"""
+PAYLOADS = [
+    None,
+    [1, 2],
+    "text",
+    12.5,
+    {"instance": 1},
+    {"instance": 1, "dc voltage": 12.65},
+    {"instance": 2, "dc voltage": "n/a", "ambient temp": None, "load status": True},
+]
+
+
+def test_single_field_template():
+    extract = extractors.compile_value_template(SIMPLE)
+    assert extract({"dc voltage": 12.65}) == "12.65"
+    assert extract({"instance": 1}) == "unknown"
+    assert extract(None) == "unknown"
+    assert extract([1]) == "unknown"
+
+
+def test_summary_template():
+    extract = extractors.compile_value_template(SUMMARY)
+    assert extract({"dc voltage": 12.6, "instance": 1}) == "Voltage: 12.6 V | Instance: 1"
+    assert extract({"instance": 1}) == "Voltage:  V | Instance: 1"
+    assert extract(None) == "No data"
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "{{ value_json['dc voltage'] | float / 24 * 100 }}",
+        "{% if value_json is defined and 'x' in value_json %}{{ value_json['x'] }}{% else %}0{% endif %}",
+        "{% if value_json is defined %}{{ value_json['x'] if 'x' in value_json else 'n' }}{% else %}0{% endif %}",
+        "{% if value_json is defined and value_json is mapping %}{{ value_json['x'] }}{% else %}{{ value_json | tojson }}{% endif %}",
+        None,
+    ],
+)
+def test_other_templates_are_not_compiled(source):
+    assert extractors.compile_value_template(source) is None
+
+
+def test_matches_jinja_for_configured_sensors():
+    sandbox = pytest.importorskip("jinja2.sandbox")
+    environment = sandbox.ImmutableSandboxedEnvironment()
+    compiled = 0
+    for sensor in fixtures.load_sensors():
+        extract = extractors.compile_value_template(sensor.value_template)
+        if extract is None:
+            continue
+        compiled += 1
+        template = environment.from_string(sensor.value_template)
+        payloads = PAYLOADS + [{sensor.field: 42.5}] if sensor.field else PAYLOADS
+        for value_json in payloads:
+            variables = {} if value_json is None else {"value_json": value_json}
+            expected = template.render(value=json.dumps(value_json), **variables).strip()
+            assert extract(value_json) == expected, (sensor.value_template, value_json)
+    assert compiled > 0
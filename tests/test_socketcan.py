@@ -0,0 +1,67 @@
+import asyncio
+import socket
+
+import pytest
+
+from rvc.socketcan import CAN_FRAME, CanReader, open_can_socket, pack_frame
+
+DIMMER_STATUS = (0x19FEDA96, bytes.fromhex("2E7C40FCFF0504FF"))
+WATER_HEATER = (0x19FFF796, bytes.fromhex("0102FFFF342CF00C"))
+
+
+async def _collect(reader, send, count, name=None):
+    records = []
+    done = asyncio.get_running_loop().create_future()
+
+    def on_record(record):
+        records.append(record)
+        if len(records) == count:
+            done.set_result(None)
+
+    reader.subscribe(on_record, name)
+    task = asyncio.create_task(reader.run())
+    await asyncio.sleep(0)
+    send()
+    await asyncio.wait_for(done, 2)
+    reader.stop()
+    await task
+    return records
+
+
+def test_reader_decodes_and_filters_by_name():
+    ours, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    ours.setblocking(False)
+    reader = CanReader("test", sock=ours, batch_size=4)
+
+    def send():
+        for frame in (DIMMER_STATUS, WATER_HEATER) * 3:
+            theirs.send(pack_frame(*frame))
+        # 11-bit frames are not RV-C and are dropped.
+        theirs.send(CAN_FRAME.pack(0x123, 8, bytes(8)))
+
+    records = asyncio.run(_collect(reader, send, 3, "DC_DIMMER_STATUS_3"))
+    theirs.close()
+    assert [record["instance"] for record in records] == [46, 46, 46]
+    assert records[0]["load status definition"] == "operating status is non-zero or flashing"
+    assert reader.frames == 6
+    assert reader.dropped == 1
+
+
+def _vcan0():
+    try:
+        return open_can_socket("vcan0")
+    except (AttributeError, OSError):
+        pytest.skip("vcan0 is not available")
+
+
+def test_reader_on_vcan0():
+    sender = _vcan0()
+    reader = CanReader("vcan0")
+
+    def send():
+        sender.send(pack_frame(*WATER_HEATER))
+
+    records = asyncio.run(_collect(reader, send, 1))
+    sender.close()
+    assert records[0]["name"] == "WATERHEATER_STATUS"
+    assert records[0]["water temperature F"] == 177.1
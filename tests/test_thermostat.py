@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from rvc import Decoder, thermostat
+from rvc.thermostat_cli import main
+
+
+def test_every_tenth_round_trips():
+    for tenths in range(400, 1001):
+        assert thermostat.decode_setpoint(thermostat.encode_setpoint(tenths / 10)) == tenths / 10
+    for tenths in range(40, 381):
+        raw = thermostat.encode_setpoint(tenths / 10, "°C")
+        assert thermostat.decode_setpoint(raw, "C") == tenths / 10
+
+
+def test_encode_command_packs_the_data_field():
+    data = thermostat.encode_command(
+        0, mode="cool", fan_mode="auto", schedule_mode="disabled", fan_speed=50, heat=80.4, cool=80.4
+    )
+    assert data.hex().upper() == "0001647C257C25FF"
+    # Unset fields stay "not available" so the thermostat keeps them.
+    assert thermostat.encode_command(0, cool=75).hex().upper() == "00FFFFFFFF1C25FF"
+
+
+def test_celsius_decoding_matches_the_spec_decoder():
+    decoder = Decoder()
+    data = thermostat.encode_command(2, mode="heat", heat=68, cool=78)
+    record = decoder.decode(0x19FEF99F, data)
+    decoded = thermostat.decode_command(data)
+    assert decoded["instance"] == record["instance"] == 2
+    assert decoded["operating mode definition"] == record["operating mode definition"] == "heat"
+    assert decoded["setpoint temp heat"] == record["setpoint temp heat"]
+    assert decoded["setpoint temp cool"] == record["setpoint temp cool"]
+    assert (decoded["setpoint temp heat F"], decoded["setpoint temp cool F"]) == (68.0, 78.0)
+
+
+def test_payload_lists_only_the_fields_it_sets():
+    payload = thermostat.command_payload(0, cool=22.5, unit="C")
+    assert payload == {
+        "name": "THERMOSTAT_COMMAND_1",
+        "dgn": "1FEF9",
+        "data": "00FFFFFFFFF024FF",
+        "instance": 0,
+        "setpoint temp cool": 22.5,
+        "setpoint temp cool F": 72.5,
+    }
+    assert thermostat.command_topic(0) == "RVC/THERMOSTAT_COMMAND_1/0"
+
+
+def test_invalid_values_raise_value_error():
+    with pytest.raises(ValueError):
+        thermostat.encode_setpoint(120)
+    with pytest.raises(ValueError):
+        thermostat.encode_setpoint(20, "K")
+    with pytest.raises(ValueError):
+        thermostat.encode_command(0, mode="dry")
+    with pytest.raises(ValueError):
+        thermostat.decode_command("0001")
+
+
+def test_cli_prints_and_decodes(capsys):
+    assert main(["--instance", "0", "--mode", "cool", "--cool", "75"]) == 0
+    topic, payload = capsys.readouterr().out.strip().split(" ", 1)
+    assert topic == "RVC/THERMOSTAT_COMMAND_1/0"
+    assert json.loads(payload)["data"] == "00F1FFFFFF1C25FF"
+
+    assert main(["--decode", "0001647E257E2500"]) == 0
+    decoded = json.loads(capsys.readouterr().out)
+    assert decoded["setpoint temp cool"] == 26.9
+    assert decoded["fan speed"] == 50
+
+
+def test_cli_publish_requires_a_broker(capsys):
+    with pytest.raises(SystemExit):
+        main(["--cool", "75", "--publish"])
+    assert "--broker" in capsys.readouterr().err
+
+
+def test_only_the_active_mode_setpoint_is_sent():
+    assert thermostat.setpoint_fields("heat", 68) == {"heat": 68}
+    assert thermostat.setpoint_fields("cool", 75) == {"cool": 75}
+    assert thermostat.setpoint_fields("auto", 75) == {"cool": 75}
+    data = thermostat.encode_command(0, mode="auto", **thermostat.setpoint_fields("auto", 75))
+    assert data.hex().upper() == "00F3FFFFFF1C25FF"
@@ -0,0 +1,56 @@
+import asyncio
+
+from custom_components.rvc_common.throttle import WriteThrottle
+
+
+def test_bursts_coalesce_into_one_trailing_write():
+    async def scenario():
+        writes = []
+        state = {"value": 0}
+        limiter = WriteThrottle(
+            asyncio.get_running_loop(), lambda: writes.append(state["value"]), 0.1
+        )
+        for value in range(1, 21):
+            state["value"] = value
+            limiter.request()
+        # The first request writes at once, the rest wait for the interval.
+        assert writes == [1]
+        await asyncio.sleep(0.2)
+        assert writes == [1, 20]
+
+    asyncio.run(scenario())
+
+
+def test_immediate_requests_skip_the_wait():
+    async def scenario():
+        writes = []
+        limiter = WriteThrottle(
+            asyncio.get_running_loop(), lambda: writes.append(len(writes)), 10
+        )
+        limiter.request()
+        limiter.request()
+        limiter.request(immediate=True)
+        assert writes == [0, 1]
+        # The immediate write replaced the scheduled one.
+        assert limiter._pending is None
+
+    asyncio.run(scenario())
+
+
+def test_zero_interval_and_cancel():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        writes = []
+        unthrottled = WriteThrottle(loop, lambda: writes.append("now"), 0)
+        for _ in range(3):
+            unthrottled.request()
+        assert writes == ["now"] * 3
+
+        removed = WriteThrottle(loop, lambda: writes.append("late"), 0.05)
+        removed.request()
+        removed.request()
+        removed.cancel()
+        await asyncio.sleep(0.1)
+        assert writes.count("late") == 1
+
+    asyncio.run(scenario())
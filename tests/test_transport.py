@@ -0,0 +1,57 @@
+from rvc import Decoder
+from rvc.transport import Reassembler
+
+SOURCE = 0x80
+BAM_ID = (6 << 26) | (0x1ECFF << 8) | SOURCE
+DT_ID = (6 << 26) | (0x1EBFF << 8) | SOURCE
+PAYLOAD = bytes(range(1, 11))  # 10 bytes -> 2 packets
+
+
+def _bam(size=len(PAYLOAD), packets=2, dgn=0x1FECA):
+    return bytes([32, size & 0xFF, size >> 8, packets, 0xFF]) + dgn.to_bytes(3, "little")
+
+
+def _dt(seq):
+    chunk = PAYLOAD[(seq - 1) * 7 : seq * 7]
+    return bytes([seq]) + chunk.ljust(7, b"\xff")
+
+
+def test_bam_is_reassembled_and_decodable():
+    reassembler = Reassembler()
+    assert reassembler.feed(BAM_ID, _bam(), now=0) is None
+    assert reassembler.feed(DT_ID, _dt(1), now=0.05) is None
+    can_id, data = reassembler.feed(DT_ID, _dt(2), now=0.1)
+    assert data == PAYLOAD
+    assert reassembler.active == 0
+
+    record = Decoder().decode(can_id, data)
+    assert record["name"] == "DM_RV"
+    assert record["data"] == PAYLOAD.hex().upper()
+
+
+def test_out_of_order_packet_aborts_session():
+    reassembler = Reassembler()
+    reassembler.feed(BAM_ID, _bam(), now=0)
+    assert reassembler.feed(DT_ID, _dt(2), now=0.05) is None
+    assert reassembler.active == 0
+    assert reassembler.aborted == 1
+
+
+def test_pool_is_bounded_and_stale_sessions_expire():
+    reassembler = Reassembler(max_sessions=2, timeout=0.75)
+    for source in range(3):
+        reassembler.feed((BAM_ID & ~0xFF) | source, _bam(), now=0)
+    assert reassembler.active == 2
+    assert reassembler.dropped == 1
+
+    # The pool frees up once the idle sessions time out.
+    reassembler.feed((BAM_ID & ~0xFF) | 3, _bam(), now=1.0)
+    assert reassembler.active == 1
+    assert reassembler.expired == 2
+
+
+def test_inconsistent_announcement_is_ignored():
+    reassembler = Reassembler()
+    reassembler.feed(BAM_ID, _bam(packets=5), now=0)
+    assert reassembler.active == 0
+    assert reassembler.dropped == 1
@@ -4,6 +4,8 @@ import paho.mqtt.client as mqtt
 import json
 import time
 
+from rvc.thermostat import FAN_MODES, OPERATING_MODES, command_payload, setpoint_fields
+
 # MQTT Configuration
 broker_ip = "100.110.189.122"
 port = 1883
@@ -31,15 +33,6 @@ def on_message(client, userdata, msg):
             status = json.loads(msg.payload)
             print(f"Current Status: {status}")
             
-            # Analyze setpoint values for debugging
-            if "setpoint temp cool" in status and "setpoint temp cool F" in status:
-                cool_temp = status["setpoint temp cool"]
-                cool_temp_f = status["setpoint temp cool F"]
-                ratio = None
-                if cool_temp_f != 0:
-                    ratio = cool_temp / cool_temp_f
-                print(f"DEBUG: Cool setpoint ratio = {ratio} (setpoint: {cool_temp}, F: {cool_temp_f})")
-            
             # Update status display
             update_status_display(status)
     except Exception as e:
@@ -60,101 +53,34 @@ def update_status_display(status):
         status_text.insert(tk.END, json.dumps(status, indent=2))
         status_text.config(state="disabled")
 
-# Function to calculate cool setpoint value based on observed values
-def calculate_cool_setpoint(temp_f):
-    # Based on the debug ratio observed from actual thermostat data
-    # Ratio = 0.3398058252427184 (28/82.4)
-    # The setpoint appears to be the Celsius equivalent of the Fahrenheit value
-    return round((temp_f - 32) * 5/9, 1)  # Convert F to C
+# Function to send a thermostat command; rvc.thermostat builds the data field
+def publish_command(temp_f, op_mode, fan_mode):
+    payload = command_payload(
+        0,
+        mode=op_mode,
+        fan_mode=fan_mode,
+        schedule_mode="disabled",
+        **setpoint_fields(op_mode, temp_f),
+    )
+    client.publish(command_topic, json.dumps(payload))
+    print(f"Command sent: {payload}")
 
-# Function to send thermostat command with exact format
+# Function to send the settings chosen in the UI
 def send_command():
-    # Get temperature from slider (Fahrenheit)
     temp_f = temp_scale.get()
-    
-    # Calculate the corresponding setpoint value
-    setpoint_cool = calculate_cool_setpoint(temp_f)
-    
-    # Get selected modes
     op_mode = mode_var.get()
     fan_mode = fan_var.get()
-    
-    # Operating mode codes
-    op_mode_codes = {
-        "off": "0000",
-        "cool": "0001",
-        "heat": "0010",
-        "auto": "0011",
-        "undefined": "1111"
-    }
-    
-    # Fan mode codes
-    fan_mode_codes = {
-        "auto": "00",
-        "low": "01",
-        "medium": "10",
-        "high": "11",
-        "undefined": "11"
-    }
-    
-    # Create payload based on exact format provided by user
-    payload = {
-        "data": "00FFFFFFFFFAFFFF",
-        "dgn": "1FEF9",
-        "fan mode": fan_mode_codes.get(fan_mode, "11"),
-        "fan mode definition": fan_mode if fan_mode != "undefined" else "undefined",
-        "fan speed": "n/a",
-        "instance": 0,
-        "name": "THERMOSTAT_COMMAND_1",
-        "operating mode": op_mode_codes.get(op_mode, "1111"),
-        "operating mode definition": op_mode if op_mode != "undefined" else "undefined",
-        "schedule mode": "11",
-        "schedule mode definition": "undefined",
-        "setpoint temp cool": setpoint_cool,
-        "setpoint temp cool F": temp_f,
-        "setpoint temp heat": "n/a",
-        "setpoint temp heat F": 32,
-        "timestamp": str(time.time())
-    }
-    
-    # Publish to MQTT
-    client.publish(command_topic, json.dumps(payload))
+    publish_command(temp_f, op_mode, fan_mode)
     status_label.config(text=f"Sent: {op_mode} mode at {temp_f}°F with {fan_mode} fan")
-    print(f"Command sent: {payload}")
 
 # Function to send exact command for cool at 82°F with auto fan
 def set_cooling_82_auto():
-    # 82°F with the calculated setpoint based on the formula
-    setpoint_cool = calculate_cool_setpoint(82.0)
-    
-    payload = {
-        "data": "00FFFFFFFFFAFFFF",
-        "dgn": "1FEF9",
-        "fan mode": "00",  # Auto
-        "fan mode definition": "auto",
-        "fan speed": "n/a",
-        "instance": 0,
-        "name": "THERMOSTAT_COMMAND_1",
-        "operating mode": "0001",  # Cool
-        "operating mode definition": "cool",
-        "schedule mode": "11",
-        "schedule mode definition": "undefined",
-        "setpoint temp cool": setpoint_cool,
-        "setpoint temp cool F": 82.0,  # 82°F as specified
-        "setpoint temp heat": "n/a",
-        "setpoint temp heat F": 32,
-        "timestamp": str(time.time())
-    }
-    
     # Update UI to match
     temp_scale.set(82)
     mode_var.set("cool")
     fan_var.set("auto")
-    
-    # Publish to MQTT
-    client.publish(command_topic, json.dumps(payload))
+    publish_command(82.0, "cool", "auto")
     status_label.config(text="Sent: cool mode at 82°F with auto fan")
-    print(f"Command sent: {payload}")
 
 # GUI Setup
 root = tk.Tk()
@@ -183,7 +109,7 @@ mode_frame.pack(fill="x", expand="yes", padx=10, pady=10)
 ttk.Label(mode_frame, text="Operating Mode").grid(row=0, column=0, padx=5, pady=5, sticky="w")
 mode_var = tk.StringVar(value="cool")  # Default to cool mode
 mode_dropdown = ttk.Combobox(mode_frame, textvariable=mode_var, 
-                            values=["off", "cool", "heat", "auto", "undefined"], 
+                            values=list(OPERATING_MODES), 
                             state="readonly")
 mode_dropdown.grid(row=0, column=1, padx=5, pady=5, sticky="w")
 
@@ -191,7 +117,7 @@ mode_dropdown.grid(row=0, column=1, padx=5, pady=5, sticky="w")
 ttk.Label(mode_frame, text="Fan Mode").grid(row=1, column=0, padx=5, pady=5, sticky="w")
 fan_var = tk.StringVar(value="auto")  # Default to auto fan
 fan_dropdown = ttk.Combobox(mode_frame, textvariable=fan_var, 
-                           values=["auto", "low", "medium", "high", "undefined"], 
+                           values=list(FAN_MODES), 
                            state="readonly")
 fan_dropdown.grid(row=1, column=1, padx=5, pady=5, sticky="w")
 
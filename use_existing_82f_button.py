@@ -1,68 +1,21 @@
-import paho.mqtt.client as mqtt
-import json
-import time
+"""Do what the panel's 82°F button does: cool at 82°F with auto fan.
+
+The data field is built by rvc.thermostat; see ``python -m rvc.thermostat_cli --help``.
+"""
+import sys
+
+from rvc.thermostat_cli import main
 
 # MQTT Configuration
 broker_ip = "100.110.189.122"
 port = 1883
 username = "rc"
 password = "rc"
-command_topic = "RVC/THERMOSTAT_COMMAND_1/0"  # Topic for front thermostat
-
-# Function to calculate cool setpoint value
-def calculate_cool_setpoint(temp_f):
-    return round((temp_f - 32) * 5/9, 1)  # Convert F to C
-
-# Create MQTT client
-client = mqtt.Client(client_id=f"thermostat-set-82f-{int(time.time())}")
-if username and password:
-    client.username_pw_set(username, password)
-
-def on_connect(client, userdata, flags, rc):
-    if rc == 0:
-        print("Connected to MQTT broker")
-        # After connection, send the command
-        set_cooling_82_auto()
-    else:
-        print(f"Connection failed with code {rc}")
-
-def set_cooling_82_auto():
-    # 82°F with the calculated setpoint based on the formula
-    setpoint_cool = calculate_cool_setpoint(82.0)
-    
-    payload = {
-        "data": "00FFFFFFFFFAFFFF",
-        "dgn": "1FEF9",
-        "fan mode": "00",  # Auto
-        "fan mode definition": "auto",
-        "fan speed": "n/a",
-        "instance": 0,
-        "name": "THERMOSTAT_COMMAND_1",
-        "operating mode": "0001",  # Cool
-        "operating mode definition": "cool",
-        "schedule mode": "00",      # Using "00" for disabled
-        "schedule mode definition": "disabled",
-        "setpoint temp cool": setpoint_cool,
-        "setpoint temp cool F": 82.0,  # 82°F as specified
-        "setpoint temp heat": setpoint_cool,
-        "setpoint temp heat F": 82.0,
-        "timestamp": str(time.time())
-    }
-    
-    # Publish to MQTT
-    print(f"Sending command: {json.dumps(payload, indent=2)}")
-    client.publish(command_topic, json.dumps(payload))
-    print(f"Command sent: cool mode at 82°F with auto fan")
-    
-    # Wait briefly to ensure message is sent
-    time.sleep(1)
-    client.disconnect()
-    print("Disconnected from MQTT broker")
-
-# Set callback and connect
-client.on_connect = on_connect
-client.connect(broker_ip, port, 60)
+instance = 0  # Front thermostat
 
-# Start the loop
-print("Connecting to MQTT broker...")
-client.loop_forever()
+sys.exit(main([
+    "--instance", str(instance), "--mode", "cool", "--fan-mode", "auto",
+    "--schedule-mode", "disabled", "--cool", "82",
+    "--publish", "--broker", broker_ip, "--port", str(port),
+    "--username", username, "--password", password,
+]))